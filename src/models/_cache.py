@@ -0,0 +1,78 @@
+"""Opt-in on-disk memoization of batch projections and whole simulation runs.
+
+Set SIM_CACHE_DIR to a directory to reuse the results of repeated batch projections
+and seeded simulation runs across processes (e.g. reruns of a parameter sweep over the
+same scenarios). When it is unset nothing is read or written.
+
+Entries are keyed on the model and simulation source code as well, so editing the models
+never serves results computed by the old code; old entries are simply no longer read
+(delete the directory to reclaim the space).
+"""
+import functools
+import hashlib
+import os
+from pathlib import Path
+import numpy as np
+
+# Sources whose code determines the cached results, relative to the src package
+_CODE_SOURCES = ('models/*.py', 'utils/*.py', 'simulation.py')
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version():
+    """Digest of the _CODE_SOURCES, computed once per process."""
+    src_dir = Path(__file__).resolve().parent.parent
+    h = hashlib.blake2b(digest_size=20)
+    for path in sorted(p for pattern in _CODE_SOURCES for p in src_dir.glob(pattern)):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _update_hash(h, value):
+    """Feed `value` into hash `h`; arrays by dtype, shape and raw bytes, anything else by repr."""
+    if isinstance(value, (np.ndarray, list, tuple, int, float)):
+        arr = np.ascontiguousarray(value)
+        h.update(repr((arr.dtype.str, arr.shape)).encode())
+        h.update(arr.tobytes())
+    else:
+        h.update(repr(value).encode())
+
+
+def disk_memoize(name):
+    """Cache a model method returning a dict of arrays under SIM_CACHE_DIR/<name>/.
+
+    The key covers the model and simulation source code, the model's `_cache_key()`
+    (its parameters and current state) and all call arguments, so a changed config,
+    starting state or model code is never served a stale result. A `_cache_key()` of
+    None marks a call whose result must not be reused.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache_dir = os.environ.get('SIM_CACHE_DIR')
+            cache_key = self._cache_key() if cache_dir else None
+            if cache_key is None:
+                return method(self, *args, **kwargs)
+
+            h = hashlib.blake2b(digest_size=20)
+            h.update(repr((_code_version(), method.__qualname__, cache_key)).encode())
+            for arg in args:
+                _update_hash(h, arg)
+            for key in sorted(kwargs):
+                h.update(key.encode())
+                _update_hash(h, kwargs[key])
+            path = Path(cache_dir) / name / f"{h.hexdigest()}.npz"
+            if path.exists():
+                with np.load(path) as data:
+                    return {key: data[key] for key in data.files}
+
+            result = method(self, *args, **kwargs)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **result)
+            os.replace(tmp_path, path) # Atomic, so concurrent runs never see a partial file
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,33 @@
+"""Optional numba support for the compiled kernels.
+
+Without numba installed, `njit` leaves the decorated function as plain Python and
+`prange` is `range`, so the kernels run unchanged (just slower).
+"""
+import hashlib
+from pathlib import Path
+
+# Modules whose kernels go into the ahead-of-time bd_kernels build (see _kernels_build)
+KERNEL_SOURCES = ('_kernels.py', '_debt_kernels.py')
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable with or without arguments."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    def prange(*args):
+        """Stand-in for numba.prange."""
+        return range(*args)
+
+
+def kernel_source_hash():
+    """Hash of the KERNEL_SOURCES, as a non-negative int64 embedded in the bd_kernels build."""
+    h = hashlib.blake2b(digest_size=7)
+    for name in KERNEL_SOURCES:
+        h.update((Path(__file__).parent / name).read_bytes())
+    return int.from_bytes(h.digest(), 'little')
@@ -0,0 +1,32 @@
+"""Compiled kernels for the public debt recursion used by DebtManagementModel."""
+from ._compat import njit
+
+# Column layout of the debt service rows written by _debt_recursion
+INTEREST_DOM, INTEREST_EXT, PRINCIPAL_DOM, PRINCIPAL_EXT = 0, 1, 2, 3
+
+@njit(cache=True, fastmath=True)
+def _debt_recursion(dom0, ext0, r_dom, r_ext, rep_dom, rep_ext, deficit_arr,
+                    out_dom, out_ext, out_service):
+    """Run the debt stock recursion over every year in `deficit_arr`.
+
+    Each year pays interest and principal on the opening stock and finances the
+    deficit in proportion to the opening domestic/external split (50/50 when there
+    is no debt yet). Closing stocks are written to `out_dom`/`out_ext` and the
+    year's service to the matching row of `out_service` (see column constants).
+    """
+    dom = dom0
+    ext = ext0
+    for t in range(deficit_arr.shape[0]):
+        principal_dom = dom * rep_dom
+        principal_ext = ext * rep_ext
+        out_service[t, INTEREST_DOM] = dom * r_dom
+        out_service[t, INTEREST_EXT] = ext * r_ext
+        out_service[t, PRINCIPAL_DOM] = principal_dom
+        out_service[t, PRINCIPAL_EXT] = principal_ext
+
+        total = dom + ext
+        domestic_share = dom / total if total > 0 else 0.5
+        dom = dom + deficit_arr[t] * domestic_share - principal_dom
+        ext = ext + deficit_arr[t] * (1.0 - domestic_share) - principal_ext
+        out_dom[t] = dom
+        out_ext[t] = ext
@@ -0,0 +1,457 @@
+"""Compiled per-year kernels for the model classes and the Monte Carlo driver built on them."""
+from typing import NamedTuple
+import numpy as np
+from ._compat import njit, prange
+from ._debt_kernels import _debt_recursion, INTEREST_DOM, INTEREST_EXT, PRINCIPAL_DOM, PRINCIPAL_EXT
+
+# Layout of the external sector state vector used by _external_step
+EXT_EXP, EXT_IMP, EXT_REM, EXT_FDI, EXT_CAB, EXT_FIN, EXT_BOP, EXT_RES = range(8)
+
+# Exogenous macro paths fed to run_monte_carlo: paths[s, t, PATH_*]
+PATH_GDP, PATH_GDP_GROWTH, PATH_GOVERNANCE, PATH_PFM, PATH_SUPERVISION, PATH_DEFICIT = range(6)
+N_PATHS = 6
+
+# Shock draws fed to run_monte_carlo: shocks[s, t, SHOCK_*] (see ShockSchedule.UNIFORM_SHOCKS)
+SHOCK_GLOBAL, SHOCK_AID = 0, 1
+
+# Metrics written by run_monte_carlo: out[s, t, k]
+MC_OUTPUTS = ('exports', 'imports', 'remittances', 'fdi', 'current_account_balance',
+              'overall_bop', 'fx_reserves', 'reserves_months_imports',
+              'npl_ratio', 'capital_adequacy_ratio', 'stability_index',
+              'grant_aid', 'dfi_net_lending',
+              'debt_domestic', 'debt_external', 'debt_total_service')
+N_MC_OUTPUTS = len(MC_OUTPUTS)
+
+# Layout of the policy pipeline state vector used by _policy_year_step; the governance
+# areas come first, in GovernanceModel's PFM/NBR/CB/AC/ACC order
+(POL_PFM, POL_NBR, POL_CB, POL_AC, POL_ACC, POL_RATE, POL_COORD, POL_CAPACITY, POL_OWN_REV,
+ POL_SN_DEBT, POL_ADMIN, POL_COMPLIANCE) = range(12)
+N_POL_STATE = 12
+
+# Exogenous macro paths fed to the policy pipeline: paths[..., t, PPATH_*]
+PPATH_GDP, PPATH_GDP_GROWTH, PPATH_INFLATION, PPATH_DEFICIT = range(4)
+N_POLICY_PATHS = 4
+
+# Metrics written by the policy pipeline: out[..., t, k]
+POLICY_OUTPUTS = ('governance_index', 'policy_rate', 'projected_inflation', 'final_revenue',
+                  'total_transfers', 'total_subnational_own_revenue', 'total_subnational_spending',
+                  'aggregate_subnational_debt', 'coordination_score')
+N_POLICY_OUTPUTS = len(POLICY_OUTPUTS)
+
+
+class MonteCarloParams(NamedTuple):
+    """Config-derived constants for the sector kernels (see monte_carlo.build_params)."""
+    # External sector
+    initial_export_gdp: float
+    initial_import_gdp: float
+    initial_remittance_gdp: float
+    initial_fdi_gdp: float
+    initial_reserves_months_import: float
+    export_sens: float
+    import_sens: float
+    remittance_sens: float
+    fdi_sens: float
+    # Financial sector
+    npl0: float
+    car0: float
+    npl_gdp_sens: float
+    npl_sup_sens: float
+    required_car: float
+    # Development finance
+    initial_grant_aid_gdp: float
+    initial_dfi_net_lending_gdp: float
+    grant_global_sens: float
+    dfi_governance_sens: float
+    absorption_sens: float
+    # Debt
+    debt_dom0: float
+    debt_ext0: float
+    r_dom: float
+    r_ext: float
+    rep_dom: float
+    rep_ext: float
+
+
+class PolicyParams(NamedTuple):
+    """Config-derived constants for the policy pipeline (see policy_pipeline.build_policy_params)."""
+    # Governance, arrays in the POL_PFM..POL_ACC layout
+    gov_rates: np.ndarray
+    gov_caps: np.ndarray
+    gov_weights: np.ndarray
+    # Monetary policy
+    target_mid: float
+    gap_weight: float
+    transmission_lag: float
+    neutral_rate: float
+    # Revenue
+    per_gdp_coef: float
+    trade_tax_rate: float
+    formal_sector_share: float
+    # Fiscal federalism
+    transfer_ratio: float
+    capacity_growth: float
+    spending_efficiency: float
+    debt_limit_gdp: float
+    # Policy coordination
+    threshold_inflation: float
+    threshold_deficit: float
+    conflict_impact: float
+    institutional_impact: float
+
+
+@njit(cache=True)
+def _economic_step(prev_gdp, base_inflation, base_real_growth, growth_noise):
+    """One year of the macro update: returns (gdp, gdp_growth, real_gdp_growth, inflation).
+
+    Real growth is the base rate scaled by (1 + noise), inflation is bounded to 1-15% and
+    nominal GDP compounds both; nominal growth is 0 without a positive previous GDP.
+    """
+    real_growth = base_real_growth * (1 + growth_noise)
+    inflation = max(0.01, min(0.15, base_inflation))
+    gdp = prev_gdp * (1 + real_growth) * (1 + inflation)
+    gdp_growth = (gdp / prev_gdp - 1) if prev_gdp > 0 else 0.0
+    return gdp, gdp_growth, real_growth, inflation
+
+
+@njit(cache=True)
+def _external_step(state, gdp_growth, gov, global_factor, export_sens, import_sens,
+                   remittance_sens, fdi_sens):
+    """Advance the external sector state vector one year in place; return reserves in months of imports."""
+    state[EXT_EXP] = max(0.0, state[EXT_EXP] * (1 + gdp_growth * 0.5 + (global_factor - 1) * export_sens))
+    state[EXT_IMP] = max(0.0, state[EXT_IMP] * (1 + gdp_growth * import_sens))
+    state[EXT_REM] = max(0.0, state[EXT_REM] * (1 + (global_factor - 1) * remittance_sens))
+    state[EXT_FDI] = max(0.0, state[EXT_FDI] * (1 + gdp_growth + fdi_sens * (gov - 0.5)))
+    state[EXT_CAB] = state[EXT_EXP] - state[EXT_IMP] + state[EXT_REM]
+    state[EXT_FIN] = state[EXT_FDI]
+    state[EXT_BOP] = state[EXT_CAB] + state[EXT_FIN]
+    state[EXT_RES] = max(0.0, state[EXT_RES] + state[EXT_BOP])
+    return state[EXT_RES] / (state[EXT_IMP] / 12.0) if state[EXT_IMP] > 0 else 0.0
+
+
+@njit(cache=True)
+def _financial_step(npl, car, gdp_growth, supervision, npl_gdp_sens, npl_sup_sens, required_car):
+    """One year of the financial sector: returns (npl_ratio, capital_adequacy_ratio, stability_index).
+
+    NPLs move against baseline growth (4%) and supervision (0.6) and are floored at 1%;
+    CAR erodes (x0.98) when NPLs exceed 15% and improves (x1.01) otherwise, bounded to
+    5-25%; the index weighs the NPL score (0 at 20% NPLs) and the CAR buffer score
+    (1 at a 5pp buffer over the requirement) 60/40.
+    """
+    npl = max(0.01, npl + (npl_gdp_sens * (gdp_growth - 0.04) + npl_sup_sens * (supervision - 0.6)))
+    car = car * (1.01 + (npl > 0.15) * (0.98 - 1.01)) # Branchless factor select
+    car = max(0.05, min(0.25, car))
+    npl_score = max(0.0, 1 - (npl / 0.20))
+    car_score = max(0.0, min(1.0, (car - required_car) / 0.05))
+    return npl, car, 0.6 * npl_score + 0.4 * car_score
+
+
+@njit(cache=True)
+def _dev_finance_step(grant_aid, dfi_net_lending, gdp_growth, gov, pfm, global_aid_factor,
+                      grant_global_sens, dfi_governance_sens, absorption_sens):
+    """One year of development finance flows: returns (grant_aid, dfi_net_lending)."""
+    grant_growth = ((1 + gdp_growth * 0.2)
+                    * (1 + (global_aid_factor - 1) * grant_global_sens)
+                    * (1 + (pfm - 0.5) * absorption_sens))
+    dfi_growth = (1 + gdp_growth * 0.5) * (1 + (gov - 0.5) * dfi_governance_sens)
+    return max(0.0, grant_aid * grant_growth), max(0.0, dfi_net_lending * dfi_growth)
+
+
+@njit(cache=True)
+def _governance_step(levels, rates, caps, weights):
+    """One year of governance: each area in `levels` improves at its rate, up to its cap.
+
+    Updates `levels` in place and returns the governance index, the weighted average of
+    the areas on a 0-100 scale.
+    """
+    index = 0.0
+    for i in range(levels.shape[0]):
+        levels[i] = min(caps[i], levels[i] + rates[i])
+        index += levels[i] * weights[i]
+    return index * 100
+
+
+@njit(cache=True)
+def _monetary_step(policy_rate, inflation, target_mid, gap_weight, transmission_lag, neutral_rate):
+    """One year of monetary policy: returns (policy_rate, projected_inflation).
+
+    The rate follows a Taylor-like rule on the gap to the target midpoint (bounded to
+    1-15%); next period's inflation eases with the rate relative to the neutral rate, with
+    0.8/0.2 persistence, bounded to 0-20%.
+    """
+    policy_rate = policy_rate + gap_weight * (inflation - target_mid)
+    policy_rate = max(0.01, min(0.15, policy_rate))
+    projected = inflation - (transmission_lag * (policy_rate - neutral_rate))
+    projected = 0.8 * projected + 0.2 * inflation
+    return policy_rate, max(0.0, min(0.20, projected))
+
+
+@njit(cache=True)
+def _coordination_step(score, inflation, deficit, gdp, governance_index, threshold_inflation,
+                       threshold_deficit, conflict_impact, institutional_impact):
+    """One year of policy coordination: returns (score, conflict, framework_strength).
+
+    Conflict (high inflation together with a high deficit/GDP) costs `conflict_impact`;
+    governance above 50 adds up to `institutional_impact`; the score is bounded to 0.1-0.9.
+    """
+    deficit_gdp = deficit / gdp if gdp > 0 else 0.0
+    conflict = inflation > threshold_inflation and deficit_gdp > threshold_deficit
+    framework_strength = governance_index / 100
+    change = 0.0
+    if conflict:
+        change += conflict_impact
+    if framework_strength > 0.5:
+        change += institutional_impact * (framework_strength - 0.5) * 2
+    score = max(0.1, min(0.9, score + change))
+    return score, conflict, framework_strength
+
+
+@njit(cache=True)
+def _fiscal_federalism_step(capacity_index, own_revenue, debt, central_revenue, gdp,
+                            nominal_gdp_growth, transfer_ratio, capacity_growth,
+                            spending_efficiency, debt_limit_gdp):
+    """One year of subnational finances.
+
+    Returns (capacity_index, transfers, own_revenue, spending, debt): transfers are a share
+    of central revenue, own revenue grows with nominal GDP plus capacity, 95% of resources
+    are spent at the given efficiency, and any deficit is borrowed up to the debt ceiling.
+    """
+    capacity_index = capacity_index * (1 + capacity_growth)
+    transfers = central_revenue * transfer_ratio
+    own_revenue = max(0.0, own_revenue * (1 + nominal_gdp_growth + capacity_growth))
+    resources = transfers + own_revenue
+    spending = max(0.0, resources * 0.95 * spending_efficiency)
+    new_borrowing = max(0.0, spending - resources)
+    allowed_borrowing = max(0.0, debt_limit_gdp * gdp - debt)
+    debt = max(0.0, debt + min(new_borrowing, allowed_borrowing))
+    return capacity_index, transfers, own_revenue, spending, debt
+
+
+@njit(cache=True)
+def _revenue_step(gdp, imports, gdp_growth, nbr_level, per_gdp_coef, trade_tax_rate,
+                  formal_sector_share, admin_efficiency, compliance_rate):
+    """One year of revenue collection.
+
+    Returns (potential, final_revenue, admin_efficiency, compliance_rate): potential from
+    simplified tax bases (`per_gdp_coef` per unit of GDP for the domestic taxes, imports
+    for trade), reduced in one product by informality, administrative capacity and
+    compliance; efficiency and compliance then improve for the next year.
+    """
+    potential = gdp * per_gdp_coef + imports * trade_tax_rate
+    final_revenue = potential * formal_sector_share * admin_efficiency * compliance_rate
+    if nbr_level > admin_efficiency:
+        admin_efficiency = min(1.0, admin_efficiency * 1.01)
+    if gdp_growth > 0.05:
+        compliance_rate = min(0.95, compliance_rate * 1.005)
+    return potential, final_revenue, admin_efficiency, compliance_rate
+
+
+@njit(cache=True)
+def _soe_step(performance, debt, gdp, gdp_growth, governance_index, initial_debt_gdp,
+              growth_sens, governance_sens, debt_drag, payout_ratio, transfer_threshold,
+              transfer_scale):
+    """One year of the SOE sector: returns (performance_index, debt, dividends, transfers).
+
+    Performance moves with growth, governance (relative to 0.5) and debt/GDP above its
+    initial level, bounded to 0.1-0.9. A crude profit proxy (performance above 0.5 times
+    10% of debt) pays dividends above 0.55 performance; below the threshold transfers
+    scale with the gap. Debt absorbs losses and transfers net of dividends, floored at 0.
+    """
+    change = (growth_sens * gdp_growth) + (governance_sens * (governance_index / 100 - 0.5))
+    debt_gdp = debt / gdp if gdp > 0 else 0.0
+    change += debt_drag * (debt_gdp - initial_debt_gdp)
+    performance = max(0.1, min(0.9, performance + change))
+    profit = (performance - 0.5) * debt * 0.1
+    dividends = 0.0
+    transfers = 0.0
+    if performance > 0.55:
+        dividends = profit * payout_ratio
+    elif performance < transfer_threshold:
+        transfers = (transfer_threshold - performance) * transfer_scale * debt
+    debt = max(0.0, debt + (-profit + transfers - dividends))
+    return performance, debt, dividends, transfers
+
+
+@njit(cache=True)
+def _supervision_step(effectiveness, cb_capacity, npl_ratio, cb_weight, stability_weight,
+                      reform_impact):
+    """One year of supervision: returns (effectiveness, stability_proxy).
+
+    Effectiveness moves 10% of the way towards a target weighing central bank capacity,
+    NPL-based stability (1 at 0% NPLs, 0 at 25%+) and the reform boost, bounded to 0.2-0.95.
+    """
+    stability = max(0.0, 1 - (npl_ratio / 0.25))
+    target = (cb_weight * cb_capacity) + (stability_weight * stability) + reform_impact
+    effectiveness = effectiveness * 0.9 + target * 0.1
+    return max(0.2, min(0.95, effectiveness)), stability
+
+
+@njit(cache=True)
+def _policy_year_step(state, gdp, gdp_growth, inflation, deficit, params, out):
+    """One year of the governance, monetary, revenue, fiscal federalism and coordination models.
+
+    Runs the five steps in the simulation driver's order in a single compiled frame,
+    advancing the POL_* state vector in place and writing the year's POLICY_OUTPUTS
+    into `out`.
+    """
+    nominal_gdp_growth = (1 + gdp_growth) * (1 + inflation) - 1
+    governance_index = _governance_step(state[:POL_RATE], params.gov_rates, params.gov_caps,
+                                        params.gov_weights)
+    policy_rate, projected_inflation = _monetary_step(
+        state[POL_RATE], inflation, params.target_mid, params.gap_weight,
+        params.transmission_lag, params.neutral_rate)
+    _, final_revenue, admin_efficiency, compliance_rate = _revenue_step(
+        gdp, gdp * 0.2, gdp_growth, state[POL_NBR], params.per_gdp_coef, params.trade_tax_rate,
+        params.formal_sector_share, state[POL_ADMIN], state[POL_COMPLIANCE])
+    capacity_index, transfers, own_revenue, spending, debt = _fiscal_federalism_step(
+        state[POL_CAPACITY], state[POL_OWN_REV], state[POL_SN_DEBT], final_revenue, gdp,
+        nominal_gdp_growth, params.transfer_ratio, params.capacity_growth,
+        params.spending_efficiency, params.debt_limit_gdp)
+    score, _, _ = _coordination_step(
+        state[POL_COORD], inflation, deficit, gdp, governance_index, params.threshold_inflation,
+        params.threshold_deficit, params.conflict_impact, params.institutional_impact)
+
+    state[POL_RATE] = policy_rate
+    state[POL_ADMIN] = admin_efficiency
+    state[POL_COMPLIANCE] = compliance_rate
+    state[POL_CAPACITY] = capacity_index
+    state[POL_OWN_REV] = own_revenue
+    state[POL_SN_DEBT] = debt
+    state[POL_COORD] = score
+
+    out[0] = governance_index
+    out[1] = policy_rate
+    out[2] = projected_inflation
+    out[3] = final_revenue
+    out[4] = transfers
+    out[5] = own_revenue
+    out[6] = spending
+    out[7] = debt
+    out[8] = score
+
+
+@njit(cache=True)
+def run_policy_path(n_years, paths, state, params, out):
+    """Run the policy pipeline along one macro path.
+
+    Args:
+        n_years: Number of years.
+        paths: (n_years, N_POLICY_PATHS) exogenous macro paths, see PPATH_* columns.
+        state: POL_* state vector at the start of the first year, advanced in place.
+        params: PolicyParams.
+        out: Preallocated (n_years, N_POLICY_OUTPUTS) array, columns as POLICY_OUTPUTS.
+    """
+    for t in range(n_years):
+        _policy_year_step(state, paths[t, PPATH_GDP], paths[t, PPATH_GDP_GROWTH],
+                          paths[t, PPATH_INFLATION], paths[t, PPATH_DEFICIT], params, out[t])
+
+
+@njit(cache=True, parallel=True)
+def run_policy_monte_carlo(n_sims, n_years, paths, states, params, out):
+    """Run independent policy pipeline trajectories in parallel.
+
+    Args:
+        n_sims, n_years: Batch dimensions.
+        paths: (n_sims, n_years, N_POLICY_PATHS) exogenous macro paths, see PPATH_* columns.
+        states: (n_sims, N_POL_STATE) starting POL_* state of each run, advanced in place.
+        params: PolicyParams.
+        out: Preallocated (n_sims, n_years, N_POLICY_OUTPUTS) array, columns as POLICY_OUTPUTS.
+    """
+    for s in prange(n_sims):
+        run_policy_path(n_years, paths[s], states[s], params, out[s])
+
+
+@njit(cache=True, parallel=True)
+def run_monte_carlo(n_sims, n_years, shocks, paths, params, out):
+    """Run independent sector trajectories in parallel.
+
+    Args:
+        n_sims, n_years: Batch dimensions.
+        shocks: (n_sims, n_years, n_shocks) shock draws, see SHOCK_* columns.
+        paths: (n_sims, n_years, N_PATHS) exogenous macro paths, see PATH_* columns.
+            Governance is on the 0-100 scale used by GovernanceModel.
+        params: MonteCarloParams.
+        out: Preallocated (n_sims, n_years, N_MC_OUTPUTS) array, columns as MC_OUTPUTS.
+            The reserves_months_imports column is left for the caller to derive.
+    """
+    for s in prange(n_sims):
+        # Initial conditions follow the models' own _initialize_state from first-year GDP
+        gdp0 = paths[s, 0, PATH_GDP]
+        ext = np.zeros(8)
+        ext[EXT_EXP] = params.initial_export_gdp * gdp0
+        ext[EXT_IMP] = params.initial_import_gdp * gdp0
+        ext[EXT_REM] = params.initial_remittance_gdp * gdp0
+        ext[EXT_FDI] = params.initial_fdi_gdp * gdp0
+        ext[EXT_RES] = ext[EXT_IMP] * (params.initial_reserves_months_import / 12.0)
+        npl = params.npl0
+        car = params.car0
+        grant = params.initial_grant_aid_gdp * gdp0
+        dfi = params.initial_dfi_net_lending_gdp * gdp0
+
+        # The debt recursion only depends on the deficit path, so it runs for the whole horizon at once
+        debt_dom = np.empty(n_years)
+        debt_ext = np.empty(n_years)
+        service = np.empty((n_years, 4))
+        _debt_recursion(params.debt_dom0, params.debt_ext0, params.r_dom, params.r_ext,
+                        params.rep_dom, params.rep_ext, paths[s, :, PATH_DEFICIT],
+                        debt_dom, debt_ext, service)
+
+        for t in range(n_years):
+            gdp_growth = paths[s, t, PATH_GDP_GROWTH]
+            gov = paths[s, t, PATH_GOVERNANCE] / 100
+            # Reserves in months of imports are filled in afterwards in one pass (see simulate_monte_carlo)
+            _external_step(ext, gdp_growth, gov, shocks[s, t, SHOCK_GLOBAL],
+                           params.export_sens, params.import_sens,
+                           params.remittance_sens, params.fdi_sens)
+            npl, car, stability = _financial_step(npl, car, gdp_growth, paths[s, t, PATH_SUPERVISION],
+                                                  params.npl_gdp_sens, params.npl_sup_sens,
+                                                  params.required_car)
+            grant, dfi = _dev_finance_step(grant, dfi, gdp_growth, gov, paths[s, t, PATH_PFM],
+                                           shocks[s, t, SHOCK_AID], params.grant_global_sens,
+                                           params.dfi_governance_sens, params.absorption_sens)
+
+            row = out[s, t]
+            row[0] = ext[EXT_EXP]
+            row[1] = ext[EXT_IMP]
+            row[2] = ext[EXT_REM]
+            row[3] = ext[EXT_FDI]
+            row[4] = ext[EXT_CAB]
+            row[5] = ext[EXT_BOP]
+            row[6] = ext[EXT_RES]
+            row[8] = npl
+            row[9] = car
+            row[10] = stability
+            row[11] = grant
+            row[12] = dfi
+            row[13] = debt_dom[t]
+            row[14] = debt_ext[t]
+            row[15] = (service[t, INTEREST_DOM] + service[t, INTEREST_EXT]
+                       + service[t, PRINCIPAL_DOM] + service[t, PRINCIPAL_EXT])
+
+
+@njit(cache=True, parallel=True)
+def run_soe_batch(performance, debt, gdp_growth, governance_index, gdp, initial_debt_gdp,
+                  growth_sens, governance_sens, debt_drag, payout_ratio, transfer_threshold,
+                  transfer_scale, performance_out, debt_out, dividends_out, transfers_out):
+    """Run independent SOE trajectories in parallel, one _soe_step per scenario and year.
+
+    Args:
+        performance, debt: (n_scenarios,) starting performance index and debt of each run.
+        gdp_growth, governance_index, gdp: (n_scenarios, n_years) exogenous paths, governance
+            on the 0-100 scale.
+        initial_debt_gdp, ..., transfer_scale: SOEModel parameters, as in _soe_step.
+        performance_out, debt_out, dividends_out, transfers_out: Preallocated
+            (n_scenarios, n_years) arrays receiving each year's results.
+    """
+    n_scenarios, n_years = gdp.shape
+    for s in prange(n_scenarios):
+        perf = performance[s]
+        stock = debt[s]
+        for t in range(n_years):
+            perf, stock, dividends, transfers = _soe_step(
+                perf, stock, gdp[s, t], gdp_growth[s, t], governance_index[s, t], initial_debt_gdp,
+                growth_sens, governance_sens, debt_drag, payout_ratio, transfer_threshold,
+                transfer_scale)
+            performance_out[s, t] = perf
+            debt_out[s, t] = stock
+            dividends_out[s, t] = dividends
+            transfers_out[s, t] = transfers
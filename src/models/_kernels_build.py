@@ -0,0 +1,53 @@
+"""Ahead-of-time build of the per-year model kernels into the `bd_kernels` extension.
+
+The model classes otherwise JIT-compile their step kernels on first use in every fresh
+process (or load them from numba's cache). Building them once removes that cold-start
+cost for short CLI runs:
+
+    python -m src.models._kernels_build
+
+writes bd_kernels.<platform>.so next to this file; _steps picks it up on the next import.
+The build records a hash of the kernel sources, and _steps ignores it (falling back to
+the JIT kernels) once they change, so rebuild after changing any of the kernels below.
+"""
+from pathlib import Path
+from numba.pycc import CC
+from ._compat import kernel_source_hash
+from ._debt_kernels import _debt_recursion
+from ._kernels import (_dev_finance_step, _economic_step, _external_step, _financial_step,
+                       _governance_step, _monetary_step, _coordination_step, _fiscal_federalism_step,
+                       _revenue_step, _soe_step, _supervision_step)
+
+cc = CC('bd_kernels')
+cc.output_dir = str(Path(__file__).parent)
+
+KERNELS_VERSION = kernel_source_hash()
+
+
+def kernels_version():
+    """Hash of the kernel sources this extension was built from (see _compat.kernel_source_hash)."""
+    return KERNELS_VERSION
+
+
+cc.export('kernels_version', 'i8()')(kernels_version)
+
+# Same signatures as the JIT kernels, exported from their pure-Python bodies
+cc.export('debt_recursion', 'void(f8, f8, f8, f8, f8, f8, f8[:], f8[:], f8[:], f8[:, :])')(
+    _debt_recursion.py_func)
+cc.export('dev_finance_step', 'UniTuple(f8, 2)(' + ', '.join(['f8'] * 9) + ')')(_dev_finance_step.py_func)
+cc.export('economic_step', 'UniTuple(f8, 4)(f8, f8, f8, f8)')(_economic_step.py_func)
+cc.export('external_step', 'f8(f8[:], f8, f8, f8, f8, f8, f8, f8)')(_external_step.py_func)
+cc.export('financial_step', 'UniTuple(f8, 3)(f8, f8, f8, f8, f8, f8, f8)')(_financial_step.py_func)
+cc.export('governance_step', 'f8(f8[:], f8[:], f8[:], f8[:])')(_governance_step.py_func)
+cc.export('monetary_step', 'UniTuple(f8, 2)(f8, f8, f8, f8, f8, f8)')(_monetary_step.py_func)
+cc.export('coordination_step', 'Tuple((f8, b1, f8))(f8, f8, f8, f8, f8, f8, f8, f8, f8)')(
+    _coordination_step.py_func)
+cc.export('fiscal_federalism_step', 'UniTuple(f8, 5)(' + ', '.join(['f8'] * 10) + ')')(
+    _fiscal_federalism_step.py_func)
+cc.export('revenue_step', 'UniTuple(f8, 4)(' + ', '.join(['f8'] * 9) + ')')(_revenue_step.py_func)
+cc.export('soe_step', 'UniTuple(f8, 4)(' + ', '.join(['f8'] * 12) + ')')(_soe_step.py_func)
+cc.export('supervision_step', 'UniTuple(f8, 2)(f8, f8, f8, f8, f8, f8)')(_supervision_step.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built {cc.name} in {cc.output_dir}")
@@ -0,0 +1,38 @@
+"""Per-year step kernels used by the model classes.
+
+Uses the ahead-of-time compiled `bd_kernels` extension when it has been built (see
+_kernels_build) from the current kernel sources, so no JIT compilation happens at
+startup; otherwise falls back to the JIT-compiled kernels. The Monte Carlo driver always
+calls the JIT versions directly.
+"""
+import logging
+from ._compat import kernel_source_hash
+
+logger = logging.getLogger(__name__)
+
+try:
+    from . import bd_kernels
+    # Builds made before the version was recorded have no kernels_version and count as stale
+    if getattr(bd_kernels, 'kernels_version', lambda: None)() != kernel_source_hash():
+        logger.warning("Ignoring %s: it was built from other kernel sources. Rebuild it with "
+                       "`python -m src.models._kernels_build`.", bd_kernels.__file__)
+        raise ImportError("stale bd_kernels build")
+    from .bd_kernels import (debt_recursion as _debt_recursion,
+                             dev_finance_step as _dev_finance_step,
+                             economic_step as _economic_step,
+                             external_step as _external_step,
+                             financial_step as _financial_step,
+                             governance_step as _governance_step,
+                             monetary_step as _monetary_step,
+                             coordination_step as _coordination_step,
+                             fiscal_federalism_step as _fiscal_federalism_step,
+                             revenue_step as _revenue_step,
+                             soe_step as _soe_step,
+                             supervision_step as _supervision_step)
+    HAS_AOT_KERNELS = True
+except ImportError:
+    from ._debt_kernels import _debt_recursion
+    from ._kernels import (_dev_finance_step, _economic_step, _external_step, _financial_step,
+                           _governance_step, _monetary_step, _coordination_step, _fiscal_federalism_step,
+                           _revenue_step, _soe_step, _supervision_step)
+    HAS_AOT_KERNELS = False
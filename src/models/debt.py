@@ -1,7 +1,22 @@
+import logging
 import numpy as np # For potential financial calculations
+from ._debt_kernels import INTEREST_DOM, INTEREST_EXT, PRINCIPAL_DOM, PRINCIPAL_EXT
+from ._steps import _debt_recursion
+try:
+    import numexpr as ne # Optional: fuses the batch DSA ratios into single passes
+except ImportError:
+    ne = None
+
+logger = logging.getLogger(__name__)
+
+# Column layout of the domestic/external debt arrays
+DOM, EXT = 0, 1
 
 class DebtManagementModel:
     """Model public debt sustainability and management"""
+    __slots__ = ('config', 'debt_stock', 'avg_interest_rate_domestic', 'avg_interest_rate_external',
+                 'dsa_thresholds', '_dsa_debt_to_gdp', '_stock', '_rates', '_repay', '_deficit_buf',
+                 '_dom_buf', '_ext_buf', '_service_buf', '_service_out', '_dsa_out')
     def __init__(self, config):
         """Initialize debt parameters based on config."""
         self.config = config
@@ -15,95 +30,168 @@ class DebtManagementModel:
         self.avg_interest_rate_domestic = config.get('avg_interest_rate_domestic', 0.08)
         self.avg_interest_rate_external = config.get('avg_interest_rate_external', 0.03)
         self.dsa_thresholds = config.get('dsa_thresholds', {'debt_to_gdp': 0.70})
-        print("DebtManagementModel Initialized with stock:", self.debt_stock)
+        self._dsa_debt_to_gdp = float(self.dsa_thresholds.get('debt_to_gdp', 0.70))
+        # Domestic/external stock and parameters held as arrays so each step is a couple of ufuncs
+        self._stock = np.array([self.debt_stock['domestic'], self.debt_stock['external']], dtype=float)
+        self._rates = np.array([self.avg_interest_rate_domestic, self.avg_interest_rate_external])
+        self._repay = np.array([0.05, 0.03]) # Example: 5% domestic / 3% external repaid annually
+        # One-year buffers so the per-year path reuses the compiled recursion kernel
+        self._deficit_buf = np.zeros(1)
+        self._dom_buf = np.zeros(1)
+        self._ext_buf = np.zeros(1)
+        self._service_buf = np.zeros((1, 4))
+        # Output dicts are built once and updated in place each year; callers read them before the next year
+        self._service_out = dict.fromkeys(('interest_domestic', 'interest_external', 'total_interest',
+                                           'principal_domestic', 'principal_external', 'total_principal',
+                                           'total_service'), 0.0)
+        self._dsa_out = {'debt_to_gdp': 0.0, 'debt_service_to_revenue': 0.0, 'breached_threshold': False}
+        logger.info("DebtManagementModel Initialized with stock: %s", self.debt_stock)
+
+    def _run_recursion(self, deficit, out_dom, out_ext, out_service):
+        """Run the compiled debt recursion from the current stock over `deficit`."""
+        _debt_recursion(self._stock[DOM], self._stock[EXT],
+                        self._rates[DOM], self._rates[EXT],
+                        self._repay[DOM], self._repay[EXT],
+                        deficit, out_dom, out_ext, out_service)
 
     def _calculate_debt_service(self, year, state):
-        """Calculate interest and principal payments for the year."""
+        """Calculate interest and principal payments for the year from the kernel output."""
         # TODO: Model complex debt portfolio (maturities, interest rates, currency risk)
         # Simple calculation based on average rates and previous year's stock
-        interest_domestic = self.debt_stock['domestic'] * self.avg_interest_rate_domestic
-        interest_external = self.debt_stock['external'] * self.avg_interest_rate_external
-        total_interest = interest_domestic + interest_external
-
-        # Placeholder for principal repayment - assume a fixed fraction for simplicity
-        principal_repayment_domestic = self.debt_stock['domestic'] * 0.05 # Example: 5% repaid annually
-        principal_repayment_external = self.debt_stock['external'] * 0.03 # Example: 3% repaid annually
-        total_principal_paid = principal_repayment_domestic + principal_repayment_external
-
-        debt_service = {
-            'interest_domestic': interest_domestic,
-            'interest_external': interest_external,
-            'total_interest': total_interest,
-            'principal_domestic': principal_repayment_domestic,
-            'principal_external': principal_repayment_external,
-            'total_principal': total_principal_paid,
-            'total_service': total_interest + total_principal_paid
-        }
-        print(f"Year {year}: Calculated Debt Service (Total): {debt_service['total_service']:.2f}")
+        service = self._service_buf[0]
+        total_interest = service[INTEREST_DOM] + service[INTEREST_EXT]
+        total_principal_paid = service[PRINCIPAL_DOM] + service[PRINCIPAL_EXT]
+
+        debt_service = self._service_out
+        debt_service['interest_domestic'] = service[INTEREST_DOM]
+        debt_service['interest_external'] = service[INTEREST_EXT]
+        debt_service['total_interest'] = total_interest
+        debt_service['principal_domestic'] = service[PRINCIPAL_DOM]
+        debt_service['principal_external'] = service[PRINCIPAL_EXT]
+        debt_service['total_principal'] = total_principal_paid
+        debt_service['total_service'] = total_interest + total_principal_paid
+        logger.debug("Year %d: Calculated Debt Service (Total): %.2f", year, debt_service['total_service'])
         return debt_service
 
-    def _update_debt_stock(self, year, state, debt_service, deficit_financing):
-        """Update the debt stock based on new borrowing and repayments."""
+    def _update_debt_stock(self, year, state):
+        """Update the debt stock to the closing stock computed by the kernel."""
         # TODO: Model financing mix (domestic vs external), market conditions, concessionality
-        # Simple assumption: deficit financed proportionally to existing debt structure (or configurable)
-        total_current_debt = self.debt_stock['total']
-        if total_current_debt <= 0: # Avoid division by zero if starting with no debt
-            domestic_share = 0.5
-        else:
-            domestic_share = self.debt_stock['domestic'] / total_current_debt
-        
-        new_borrowing_domestic = deficit_financing * domestic_share
-        new_borrowing_external = deficit_financing * (1 - domestic_share)
-
-        # Update stocks
-        self.debt_stock['domestic'] += new_borrowing_domestic - debt_service['principal_domestic']
-        self.debt_stock['external'] += new_borrowing_external - debt_service['principal_external']
+        # Simple assumption: deficit financed proportionally to existing debt structure (see kernel)
+        self._stock[DOM] = self._dom_buf[0]
+        self._stock[EXT] = self._ext_buf[0]
+        self._sync_debt_stock()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Year %d: Updated Debt Stock (Total): %.2f (Dom: %.2f, Ext: %.2f)", year,
+                         self.debt_stock['total'], self.debt_stock['domestic'], self.debt_stock['external'])
+
+    def _sync_debt_stock(self):
+        """Mirror the internal stock array into the public `debt_stock` dict."""
+        self.debt_stock['domestic'] = float(self._stock[DOM])
+        self.debt_stock['external'] = float(self._stock[EXT])
         self.debt_stock['total'] = self.debt_stock['domestic'] + self.debt_stock['external']
 
-        print(f"Year {year}: Updated Debt Stock (Total): {self.debt_stock['total']:.2f} (Dom: {self.debt_stock['domestic']:.2f}, Ext: {self.debt_stock['external']:.2f})")
-
-    def _perform_dsa(self, year, state):
+    def _perform_dsa(self, year, state, debt_service):
         """Perform basic Debt Sustainability Analysis."""
         # TODO: Implement comprehensive DSA framework (stress tests, thresholds for various indicators)
-        gdp = state.get('economic_state', {}).get('gdp', 1) # Use 1 to avoid division by zero if GDP not available
-        if gdp <= 0: gdp = 1
+        gdp = state.gdp if state.gdp > 0 else 1 # Use 1 to avoid division by zero if GDP not available
 
         debt_to_gdp = self.debt_stock['total'] / gdp
-        total_revenue = state.get('total_revenue', 1) # Use 1 to avoid division by zero
-        if total_revenue <= 0: total_revenue = 1
+        total_revenue = state.total_revenue if state.total_revenue > 0 else 1 # Use 1 to avoid division by zero
 
-        debt_service = state.get('debt_service', {})
         debt_service_to_revenue = debt_service.get('total_service', 0) / total_revenue
 
-        sustainability_metrics = {
-            'debt_to_gdp': debt_to_gdp,
-            'debt_service_to_revenue': debt_service_to_revenue,
-            'breached_threshold': debt_to_gdp > self.dsa_thresholds.get('debt_to_gdp', 0.70)
-        }
-        print(f"Year {year}: DSA - Debt/GDP: {debt_to_gdp:.2%}, Service/Revenue: {debt_service_to_revenue:.2%}, Breached Threshold: {sustainability_metrics['breached_threshold']}")
+        sustainability_metrics = self._dsa_out
+        sustainability_metrics['debt_to_gdp'] = debt_to_gdp
+        sustainability_metrics['debt_service_to_revenue'] = debt_service_to_revenue
+        sustainability_metrics['breached_threshold'] = debt_to_gdp > self._dsa_debt_to_gdp
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Year %d: DSA - Debt/GDP: %.2f%%, Service/Revenue: %.2f%%, Breached Threshold: %s", year,
+                         debt_to_gdp * 100, debt_service_to_revenue * 100, sustainability_metrics['breached_threshold'])
         return sustainability_metrics
 
 
     def simulate_debt_dynamics(self, year, state, deficit_financing):
-        """Project debt levels, composition, and sustainability for a given year."""
-        print(f"--- Simulating Debt Dynamics for Year {year} ---")
+        """Project debt levels, composition, and sustainability for a given year.
+
+        The returned dicts are owned by the model and overwritten on the next call.
+        """
+        logger.debug("--- Simulating Debt Dynamics for Year %d ---", year)
+
+        # Run one year of the debt recursion on the current stock
+        self._deficit_buf[0] = deficit_financing
+        self._run_recursion(self._deficit_buf, self._dom_buf, self._ext_buf, self._service_buf)
 
         # 1. Calculate Debt Service based on previous year's stock
         # Assumes state passed contains previous year's debt stock implicitly via self.debt_stock
         debt_service = self._calculate_debt_service(year, state)
 
         # 2. Update Debt Stock based on financing needs and repayments
-        self._update_debt_stock(year, state, debt_service, deficit_financing)
+        self._update_debt_stock(year, state)
 
         # 3. Perform Basic DSA using updated stock and current economic/fiscal state
-        # We need the *current* state (GDP, revenue) for DSA ratios
-        # Pass the *updated* debt stock within the state for DSA calculation
-        state_for_dsa = state.copy() # Avoid modifying the main loop's state directly here
-        state_for_dsa['debt_stock'] = self.debt_stock # Use the just-updated stock
-        state_for_dsa['debt_service'] = debt_service # Use the just-calculated service
-        sustainability_metrics = self._perform_dsa(year, state_for_dsa)
-
-        print(f"--- Year {year} Debt Simulation Complete ---")
+        # The DSA only reads the state, so the updated stock and service are passed directly
+        sustainability_metrics = self._perform_dsa(year, state, debt_service)
+
+        logger.debug("--- Year %d Debt Simulation Complete ---", year)
         # Return the updated debt stock (dict) and the sustainability metrics (dict)
         # Also return the calculated debt service for this year, as it's needed for fiscal calculations
         return self.debt_stock, sustainability_metrics, debt_service
+
+    def simulate_debt_dynamics_batch(self, deficit_financing_array, gdp_array, revenue_array):
+        """Project debt stock, service and DSA ratios over a whole horizon in one pass.
+
+        Applies the same rules as `simulate_debt_dynamics` year after year, starting from
+        the model's current stock, without advancing the model's own state.
+
+        Args:
+            deficit_financing_array: Deficit to be financed in each year, shape (N,).
+            gdp_array: Nominal GDP in each year, shape (N,).
+            revenue_array: Total revenue in each year, shape (N,).
+
+        Returns:
+            Dict of arrays: 'stock' (N+1, 2) with row 0 the opening stock and columns
+            domestic/external, 'interest' and 'principal' (N, 2), and 'total_service',
+            'debt_to_gdp', 'debt_service_to_revenue', 'breached_threshold' (N,).
+        """
+        deficit = np.asarray(deficit_financing_array, dtype=float)
+        n_years = deficit.shape[0]
+        stock = np.empty((n_years + 1, 2))
+        service = np.empty((n_years, 4))
+        stock[0] = self._stock
+
+        # The stock recursion is serial in time, so it runs in the compiled kernel
+        out_dom = np.empty(n_years)
+        out_ext = np.empty(n_years)
+        self._run_recursion(deficit, out_dom, out_ext, service)
+        stock[1:, DOM] = out_dom
+        stock[1:, EXT] = out_ext
+        interest = service[:, [INTEREST_DOM, INTEREST_EXT]]
+        principal = service[:, [PRINCIPAL_DOM, PRINCIPAL_EXT]]
+
+        # DSA ratios have no time dependency and are computed over the whole horizon at once,
+        # with the same divide-by-zero guards as _perform_dsa
+        gdp = np.asarray(gdp_array, dtype=float)
+        revenue = np.asarray(revenue_array, dtype=float)
+        total_debt = stock[1:].sum(axis=1)
+        total_service = service.sum(axis=1)
+        if ne is not None:
+            env = {'debt': total_debt, 'gdp': gdp, 'service': total_service,
+                   'revenue': revenue, 'thr': self._dsa_debt_to_gdp}
+            debt_to_gdp = ne.evaluate("debt / where(gdp > 0, gdp, 1.0)", local_dict=env)
+            service_to_revenue = ne.evaluate("service / where(revenue > 0, revenue, 1.0)", local_dict=env)
+            breached = ne.evaluate("debt / where(gdp > 0, gdp, 1.0) > thr", local_dict=env)
+        else:
+            debt_to_gdp = total_debt / np.where(gdp > 0, gdp, 1)
+            service_to_revenue = total_service / np.where(revenue > 0, revenue, 1)
+            breached = debt_to_gdp > self._dsa_debt_to_gdp
+
+        return {
+            'stock': stock,
+            'interest': interest,
+            'principal': principal,
+            'total_service': total_service,
+            'debt_to_gdp': debt_to_gdp,
+            'debt_service_to_revenue': service_to_revenue,
+            'breached_threshold': breached
+        }
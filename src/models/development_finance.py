@@ -1,10 +1,28 @@
+import logging
 import random
+import numpy as np
+from ._steps import _dev_finance_step
+
+logger = logging.getLogger(__name__)
+
+# Layout of the development finance flow array
+GRANT, DFI = 0, 1
 
 class DevelopmentFinanceModel:
     """Model flows from development partners (aid, DFI lending)"""
-    def __init__(self, config):
-        """Initialize development finance parameters based on config."""
+    __slots__ = ('config', 'shocks', 'initial_grant_aid_gdp', 'initial_dfi_net_lending_gdp',
+                 'grant_global_factor_sensitivity', 'dfi_lending_governance_sensitivity',
+                 'absorption_capacity_sensitivity', 'flows', 'initialized', '_out')
+    def __init__(self, config, shocks=None):
+        """Initialize development finance parameters based on config.
+
+        Args:
+            config: Development finance section of the simulation config.
+            shocks: Optional ShockSchedule supplying the yearly 'global_aid_factor'. Drawn
+                on the fly when not given (e.g. when the model is used standalone).
+        """
         self.config = config
+        self.shocks = shocks
         # Base levels (as % of GDP)
         self.initial_grant_aid_gdp = config.get('initial_grant_aid_gdp', 0.008)
         self.initial_dfi_net_lending_gdp = config.get('initial_dfi_net_lending_gdp', 0.015)
@@ -13,70 +31,83 @@ class DevelopmentFinanceModel:
         self.dfi_lending_governance_sensitivity = config.get('dfi_lending_governance_sens', 0.3) # Better governance attracts more/better DFI lending
         self.absorption_capacity_sensitivity = config.get('absorption_capacity_sens', 0.4) # Link to PFM/governance for effective use
         
-        # Internal State
-        self.grant_aid = 0
-        self.dfi_net_lending = 0
+        # Internal State: grant aid and DFI net lending (GRANT/DFI layout), updated in place each year
+        self.flows = np.zeros(2)
         # Could track cumulative DFI debt contribution if needed separately
         self.initialized = False
+        # Output dict built once and updated in place each year
+        self._out = {'grant_aid': 0.0, 'dfi_net_lending': 0.0}
+
+        logger.info("DevelopmentFinanceModel Initialized (Grant/GDP: %.1f%%, DFI Lend/GDP: %.1f%%)",
+                    self.initial_grant_aid_gdp * 100, self.initial_dfi_net_lending_gdp * 100)
 
-        print(f"DevelopmentFinanceModel Initialized (Grant/GDP: {self.initial_grant_aid_gdp:.1%}, DFI Lend/GDP: {self.initial_dfi_net_lending_gdp:.1%})")
+    @property
+    def grant_aid(self):
+        """Grant aid for the current year."""
+        return float(self.flows[GRANT])
+
+    @property
+    def dfi_net_lending(self):
+        """DFI net lending for the current year."""
+        return float(self.flows[DFI])
 
     def _initialize_state(self, initial_gdp):
         """Set initial flows based on initial GDP."""
-        self.grant_aid = self.initial_grant_aid_gdp * initial_gdp
-        self.dfi_net_lending = self.initial_dfi_net_lending_gdp * initial_gdp
+        self.flows[GRANT] = self.initial_grant_aid_gdp * initial_gdp
+        self.flows[DFI] = self.initial_dfi_net_lending_gdp * initial_gdp
         self.initialized = True
-        print(f"Development Finance Initialized: Grants={self.grant_aid:.1f}, DFI Net Lending={self.dfi_net_lending:.1f}")
+        logger.info("Development Finance Initialized: Grants=%.1f, DFI Net Lending=%.1f", self.grant_aid, self.dfi_net_lending)
 
     def _simulate_flows(self, year, state):
         """Simulate grant aid and DFI net lending for the year."""
         # TODO: Model specific DFI projects, concessionality, aid effectiveness impact
-        gdp = state.get('economic_state', {}).get('gdp', 1)
-        gdp_growth = state.get('economic_state', {}).get('gdp_growth', 0.05)
-        governance_score = state.get('governance_state', {}).get('governance_index', 50) / 100 # Normalized 0-1
-        pfm_level = state.get('governance_state', {}).get('pfm_reform_level', 0.4) # Proxy for absorption capacity
+        gdp_growth = state.gdp_growth
+        governance_score = state.governance_index / 100 # Normalized 0-1
+        pfm_level = state.pfm_reform_level # Proxy for absorption capacity
 
         # Simulate global aid environment factor (e.g., fluctuating donor budgets)
-        global_aid_factor = random.uniform(0.90, 1.10)
+        if self.shocks is not None:
+            global_aid_factor = self.shocks.get('global_aid_factor', year)
+        else:
+            global_aid_factor = random.uniform(0.90, 1.10)
         
-        # Project Grants: Baseline growth + global factor + absorption capacity influence
-        grant_growth_factor = (1 + gdp_growth * 0.2) # Base growth slightly linked to GDP
-        grant_growth_factor *= (1 + (global_aid_factor - 1) * self.grant_global_factor_sensitivity)
-        grant_growth_factor *= (1 + (pfm_level - 0.5) * self.absorption_capacity_sensitivity) # Better PFM helps absorb grants
-        self.grant_aid *= grant_growth_factor
-        self.grant_aid = max(0, self.grant_aid)
-
-        # Project DFI Net Lending: Baseline growth + governance influence
-        dfi_growth_factor = (1 + gdp_growth * 0.5) # Base growth linked to GDP/demand
-        dfi_growth_factor *= (1 + (governance_score - 0.5) * self.dfi_lending_governance_sensitivity) # Better governance attracts DFI
-        self.dfi_net_lending *= dfi_growth_factor
-        self.dfi_net_lending = max(0, self.dfi_net_lending) # Net lending can be zero, but not negative here for simplicity
+        # Grants grow with GDP, the global aid factor and absorption capacity (better PFM helps absorb grants);
+        # DFI net lending with GDP/demand and governance (better governance attracts DFI). Neither goes negative.
+        self.flows[GRANT], self.flows[DFI] = _dev_finance_step(
+            self.flows[GRANT], self.flows[DFI], gdp_growth, governance_score, pfm_level, global_aid_factor,
+            self.grant_global_factor_sensitivity, self.dfi_lending_governance_sensitivity,
+            self.absorption_capacity_sensitivity)
 
-        print(f"Year {year}: Gov: {governance_score:.2f}, PFM: {pfm_level:.2f}, GlobalAidFactor: {global_aid_factor:.2f}")
-        print(f"Year {year}: Projected Grants: {self.grant_aid:.1f}, DFI Net Lending: {self.dfi_net_lending:.1f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Year %d: Gov: %.2f, PFM: %.2f, GlobalAidFactor: %.2f", year, governance_score, pfm_level,
+                         global_aid_factor)
+            logger.debug("Year %d: Projected Grants: %.1f, DFI Net Lending: %.1f", year, self.grant_aid,
+                         self.dfi_net_lending)
 
 
     def simulate_development_finance(self, year, state):
-        """Project development finance flows and their potential impact for a given year."""
-        print(f"--- Simulating Development Finance for Year {year} ---")
+        """Project development finance flows and their potential impact for a given year.
+
+        The returned dict is owned by the model and overwritten on the next call.
+        """
+        logger.debug("--- Simulating Development Finance for Year %d ---", year)
 
         if not self.initialized:
-            initial_gdp = state.get('economic_state', {}).get('gdp', 0)
+            initial_gdp = state.gdp
             if initial_gdp > 0:
                 self._initialize_state(initial_gdp)
             else:
-                print("Warning: Cannot initialize Development Finance, GDP not available.")
+                logger.warning("Cannot initialize Development Finance, GDP not available.")
                 return {}, 0, 0 # Return empty state, zero flows
 
         # 1. Simulate Grant and DFI flows
         self._simulate_flows(year, state)
 
-        print(f"--- Year {year} Development Finance Simulation Complete ---")
+        logger.debug("--- Year %d Development Finance Simulation Complete ---", year)
 
         # Return the calculated flows
-        dev_finance_outputs = {
-            'grant_aid': self.grant_aid,
-            'dfi_net_lending': self.dfi_net_lending
-            # Add concessionality metric later if needed
-        }
+        dev_finance_outputs = self._out
+        dev_finance_outputs['grant_aid'] = self.grant_aid
+        dev_finance_outputs['dfi_net_lending'] = self.dfi_net_lending
+        # Add concessionality metric later if needed
         return dev_finance_outputs
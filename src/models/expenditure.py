@@ -1,34 +1,53 @@
 # src/models/expenditure.py
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
 class ExpenditureModel:
     """Model public spending patterns and efficiency"""
+    __slots__ = ('config', 'categories', 'category_weights')
     def __init__(self, config):
         """Initialize expenditure parameters based on config."""
         self.config = config
-        print("ExpenditureModel Initialized")
+        # Spending categories and the share of actual spending going to each
+        self.categories = tuple(config.get('expenditure_categories', ('development', 'non_development')))
+        self.category_weights = np.asarray(config.get('expenditure_weights', [0.6, 0.4]), dtype=float)
+        # The weights split the whole of actual spending, so they must cover every category and sum to 1
+        if len(self.category_weights) != len(self.categories):
+            raise ValueError(f"expenditure_weights has {len(self.category_weights)} entries for "
+                             f"{len(self.categories)} expenditure_categories")
+        if not np.isclose(self.category_weights.sum(), 1.0):
+            raise ValueError(f"expenditure_weights must sum to 1, got {self.category_weights.sum():g}")
+        logger.info("ExpenditureModel Initialized")
 
     def simulate_expenditure(self, year, budget_allocation, implementation_capacity,
                        accountability_mechanisms, political_economy):
-        """Calculate spending patterns, efficiency, and outcomes for a given year."""
+        """Calculate spending patterns, efficiency, and outcomes for a given year.
+
+        The inputs may also be arrays of scenarios, in which case every output is an
+        array over the same scenarios.
+        """
         # Detailed implementation needed based on task list
-        print(f"--- Simulating Expenditure for Year {year} ---")
-        print(f"Budget Allocation (Proxy): {budget_allocation:.2f}, Capacity: {implementation_capacity:.2f}, Accountability: {accountability_mechanisms:.2f}, PoliticalEcon (Proxy): {political_economy:.2f}")
+        logger.debug("--- Simulating Expenditure for Year %d ---", year)
+        # %s rather than %.2f, since the inputs may be arrays of scenarios
+        logger.debug("Budget Allocation (Proxy): %s, Capacity: %s, Accountability: %s, PoliticalEcon (Proxy): %s",
+                     budget_allocation, implementation_capacity, accountability_mechanisms, political_economy)
 
         # Placeholder calculation
         # Example: Actual spending is a fraction of budget based on capacity/efficiency
         efficiency_factor = (implementation_capacity + accountability_mechanisms) / 2
         actual_spending_total = budget_allocation * efficiency_factor * 1 # Use model's base factor
         
-        # Placeholder: Distribute spending across categories (needs config)
-        actual_spending_details = {
-            'development': actual_spending_total * 0.6, # Example split
-            'non_development': actual_spending_total * 0.4
-        }
+        # Distribute spending across categories: one row of category amounts per scenario
+        spending = np.multiply.outer(actual_spending_total, self.category_weights)
+        actual_spending_details = dict(zip(self.categories, np.moveaxis(spending, -1, 0)))
 
         # Calculate overall efficiency score (could be more complex)
         efficiency_score = efficiency_factor * 1
 
-        print(f"Year {year}: Actual Spending: {actual_spending_total:.2f}, Efficiency Score: {efficiency_score:.2f}")
-        print(f"--- Year {year} Expenditure Simulation Complete ---")
+        logger.debug("Year %d: Actual Spending: %s, Efficiency Score: %s", year, actual_spending_total, efficiency_score)
+        logger.debug("--- Year %d Expenditure Simulation Complete ---", year)
 
         # Return results as a dictionary
         return {
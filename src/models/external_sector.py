@@ -1,10 +1,28 @@
+import logging
 import random
+import numpy as np
+from ._kernels import EXT_EXP, EXT_IMP, EXT_REM, EXT_FDI, EXT_CAB, EXT_FIN, EXT_BOP, EXT_RES
+from ._steps import _external_step
+
+logger = logging.getLogger(__name__)
 
 class ExternalSectorModel:
     """Model external sector dynamics including trade, remittances, FDI, and reserves"""
-    def __init__(self, config):
-        """Initialize external sector parameters based on config."""
+    __slots__ = ('config', 'shocks', 'initial_export_gdp', 'initial_import_gdp',
+                 'initial_remittance_gdp', 'initial_fdi_gdp', 'initial_reserves_months_import',
+                 'export_global_growth_sensitivity', 'import_domestic_growth_sensitivity',
+                 'remittance_global_growth_sensitivity', 'fdi_governance_sensitivity',
+                 'global_growth_factor', '_state', 'flows', '_out', 'initialized')
+    def __init__(self, config, shocks=None):
+        """Initialize external sector parameters based on config.
+
+        Args:
+            config: External sector section of the simulation config.
+            shocks: Optional ShockSchedule supplying the yearly 'global_factor'. Drawn
+                on the fly when not given (e.g. when the model is used standalone).
+        """
         self.config = config
+        self.shocks = shocks
         # Initial Ratios (as % of GDP)
         self.initial_export_gdp = config.get('initial_export_gdp', 0.15)
         self.initial_import_gdp = config.get('initial_import_gdp', 0.22)
@@ -20,114 +38,130 @@ class ExternalSectorModel:
         # Global economic condition proxy (simple multiplier)
         self.global_growth_factor = config.get('global_growth_factor', 1.02) # Base 2% global growth impact
 
-        # Internal State
-        self.exports = 0
-        self.imports = 0
-        self.remittances = 0
-        self.fdi = 0
-        self.current_account_balance = 0
-        self.financial_account_balance = 0 # Simplified: includes FDI and other flows
-        self.overall_bop = 0
-        self.fx_reserves = 0
+        # Internal State: flows, balances and reserves in the kernel's state vector (EXT_* layout)
+        self._state = np.zeros(8)
+        self.flows = self._state[EXT_EXP:EXT_FDI + 1] # View: exports, imports, remittances, FDI
+        # Output dict built once and updated in place each year
+        self._out = dict.fromkeys(('exports', 'imports', 'remittances', 'fdi', 'current_account_balance',
+                                   'overall_bop', 'fx_reserves', 'reserves_months_imports'), 0.0)
         self.initialized = False
 
-        print(f"ExternalSectorModel Initialized (Exp/GDP: {self.initial_export_gdp:.1%}, Imp/GDP: {self.initial_import_gdp:.1%}, Res: {self.initial_reserves_months_import:.1f}m)")
+        logger.info("ExternalSectorModel Initialized (Exp/GDP: %.1f%%, Imp/GDP: %.1f%%, Res: %.1fm)",
+                    self.initial_export_gdp * 100, self.initial_import_gdp * 100, self.initial_reserves_months_import)
+
+    @property
+    def exports(self):
+        """Exports for the current year."""
+        return float(self._state[EXT_EXP])
+
+    @property
+    def imports(self):
+        """Imports for the current year."""
+        return float(self._state[EXT_IMP])
+
+    @property
+    def remittances(self):
+        """Remittance inflows for the current year."""
+        return float(self._state[EXT_REM])
+
+    @property
+    def fdi(self):
+        """FDI inflows for the current year."""
+        return float(self._state[EXT_FDI])
+
+    @property
+    def current_account_balance(self):
+        """Current account balance (trade balance + remittances)."""
+        return float(self._state[EXT_CAB])
+
+    @property
+    def financial_account_balance(self):
+        """Financial account balance (simplified: includes FDI and other flows)."""
+        return float(self._state[EXT_FIN])
+
+    @property
+    def overall_bop(self):
+        """Overall balance of payments."""
+        return float(self._state[EXT_BOP])
+
+    @property
+    def fx_reserves(self):
+        """Stock of FX reserves."""
+        return float(self._state[EXT_RES])
 
     def _initialize_state(self, initial_gdp):
         """Set initial flows and reserves based on initial GDP."""
-        self.exports = self.initial_export_gdp * initial_gdp
-        self.imports = self.initial_import_gdp * initial_gdp
-        self.remittances = self.initial_remittance_gdp * initial_gdp
-        self.fdi = self.initial_fdi_gdp * initial_gdp
+        self.flows[:] = np.array([self.initial_export_gdp, self.initial_import_gdp,
+                                  self.initial_remittance_gdp, self.initial_fdi_gdp]) * initial_gdp
         # Initial reserves based on initial import level
-        self.fx_reserves = self.imports * (self.initial_reserves_months_import / 12.0)
+        self._state[EXT_RES] = self.imports * (self.initial_reserves_months_import / 12.0)
         self.initialized = True
-        print(f"External Sector Initialized: Exp={self.exports:.1f}, Imp={self.imports:.1f}, Rem={self.remittances:.1f}, FDI={self.fdi:.1f}, Res={self.fx_reserves:.1f}")
+        logger.info("External Sector Initialized: Exp=%.1f, Imp=%.1f, Rem=%.1f, FDI=%.1f, Res=%.1f",
+                    self.exports, self.imports, self.remittances, self.fdi, self.fx_reserves)
+
+    def _advance_year(self, year, state):
+        """Project flows, the Balance of Payments and FX reserves in one compiled step.
 
-    def _project_flows(self, year, state):
-        """Project exports, imports, remittances, and FDI."""
+        Returns:
+            FX reserves in months of imports.
+        """
         # TODO: Model exchange rate impacts, competitiveness, trade policy, specific shocks
-        gdp = state.get('economic_state', {}).get('gdp', 1)
-        gdp_growth = state.get('economic_state', {}).get('gdp_growth', 0.05)
-        governance_score = state.get('governance_state', {}).get('governance_index', 50) / 100 # Normalized 0-1
-        
-        # Simple growth projections based on sensitivities
-        # Assume flows grow relative to previous year's base adjusted by sensitivities
-        global_factor = random.uniform(0.98, 1.05) # Simulate fluctuating global conditions slightly
-        
-        self.exports *= (1 + gdp_growth * 0.5 + (global_factor - 1) * self.export_global_growth_sensitivity)
-        self.imports *= (1 + gdp_growth * self.import_domestic_growth_sensitivity)
-        self.remittances *= (1 + (global_factor - 1) * self.remittance_global_growth_sensitivity)
-        # FDI sensitive to governance improvements
-        self.fdi *= (1 + gdp_growth + self.fdi_governance_sensitivity * (governance_score - 0.5))
-        
-        # Ensure non-negative flows
-        self.exports = max(0, self.exports)
-        self.imports = max(0, self.imports)
-        self.remittances = max(0, self.remittances)
-        self.fdi = max(0, self.fdi)
-        
-        print(f"Year {year}: Projected Flows - Exp: {self.exports:.1f}, Imp: {self.imports:.1f}, Rem: {self.remittances:.1f}, FDI: {self.fdi:.1f}")
-
-    def _calculate_bop(self, year, state):
-        """Calculate Current Account Balance (CAB) and Overall Balance of Payments (BoP)."""
         # TODO: Model services trade, income balance, capital flows (portfolio, loans)
-        # Simplified CAB = Trade Balance + Remittances
-        trade_balance = self.exports - self.imports
-        self.current_account_balance = trade_balance + self.remittances
-
-        # Simplified Financial Account = FDI (assuming other flows net to zero or are captured implicitly)
-        self.financial_account_balance = self.fdi
-        
-        # Simplified Overall BoP = CAB + Financial Account Balance (+ errors/omissions assumed zero)
-        self.overall_bop = self.current_account_balance + self.financial_account_balance
-
-        print(f"Year {year}: BoP Calculation - CAB: {self.current_account_balance:.1f}, FinAcc: {self.financial_account_balance:.1f}, Overall BoP: {self.overall_bop:.1f}")
-
-    def _update_reserves(self, year):
-        """Update FX reserves based on the overall BoP."""
         # TODO: Model valuation changes, reserve management costs/income
-        self.fx_reserves += self.overall_bop
-        # Reserves cannot go below zero (or some minimum threshold)
-        self.fx_reserves = max(0, self.fx_reserves)
-        
-        # Calculate reserves in months of imports for reporting
-        months_of_imports = (self.fx_reserves / (self.imports / 12.0)) if self.imports > 0 else 0
-        print(f"Year {year}: Updated FX Reserves: {self.fx_reserves:.1f} ({months_of_imports:.1f} months of imports)")
+        gdp_growth = state.gdp_growth
+        governance_score = state.governance_index / 100 # Normalized 0-1
+
+        # Simulate fluctuating global conditions slightly
+        if self.shocks is not None:
+            global_factor = self.shocks.get('global_factor', year)
+        else:
+            global_factor = random.uniform(0.98, 1.05)
+
+        # Flows grow with sensitivities and are floored at zero; CAB = trade balance + remittances,
+        # financial account = FDI, BoP = CAB + financial account, reserves += BoP (floored at zero)
+        months_of_imports = _external_step(self._state, gdp_growth, governance_score, global_factor,
+                                           self.export_global_growth_sensitivity,
+                                           self.import_domestic_growth_sensitivity,
+                                           self.remittance_global_growth_sensitivity,
+                                           self.fdi_governance_sensitivity)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Year %d: Projected Flows - Exp: %.1f, Imp: %.1f, Rem: %.1f, FDI: %.1f", year,
+                         self.exports, self.imports, self.remittances, self.fdi)
+            logger.debug("Year %d: BoP Calculation - CAB: %.1f, FinAcc: %.1f, Overall BoP: %.1f", year,
+                         self.current_account_balance, self.financial_account_balance, self.overall_bop)
+            logger.debug("Year %d: Updated FX Reserves: %.1f (%.1f months of imports)", year,
+                         self.fx_reserves, months_of_imports)
         return months_of_imports
 
     def simulate_external_sector(self, year, state):
-        """Project external flows, BoP, and reserves for a given year."""
-        print(f"--- Simulating External Sector for Year {year} ---")
+        """Project external flows, BoP, and reserves for a given year.
+
+        The returned dict is owned by the model and overwritten on the next call.
+        """
+        logger.debug("--- Simulating External Sector for Year %d ---", year)
 
         if not self.initialized:
-            initial_gdp = state.get('economic_state', {}).get('gdp', 0)
+            initial_gdp = state.gdp
             if initial_gdp > 0:
                 self._initialize_state(initial_gdp)
             else:
-                print("Warning: Cannot initialize External Sector, GDP not available in state.")
+                logger.warning("Cannot initialize External Sector, GDP not available in state.")
                 return {}, 0 # Return empty dict and zero reserves
 
-        # 1. Project flows for the year
-        self._project_flows(year, state)
-
-        # 2. Calculate Balance of Payments components
-        self._calculate_bop(year, state)
-
-        # 3. Update FX Reserves based on BoP
-        months_of_imports = self._update_reserves(year)
+        # 1.-3. Project flows, calculate Balance of Payments and update FX Reserves
+        months_of_imports = self._advance_year(year, state)
 
-        print(f"--- Year {year} External Sector Simulation Complete ---")
+        logger.debug("--- Year %d External Sector Simulation Complete ---", year)
 
         # Return key external sector indicators
-        external_sector_outputs = {
-            'exports': self.exports,
-            'imports': self.imports,
-            'remittances': self.remittances,
-            'fdi': self.fdi,
-            'current_account_balance': self.current_account_balance,
-            'overall_bop': self.overall_bop,
-            'fx_reserves': self.fx_reserves,
-            'reserves_months_imports': months_of_imports
-        }
+        external_sector_outputs = self._out
+        external_sector_outputs['exports'] = self.exports
+        external_sector_outputs['imports'] = self.imports
+        external_sector_outputs['remittances'] = self.remittances
+        external_sector_outputs['fdi'] = self.fdi
+        external_sector_outputs['current_account_balance'] = self.current_account_balance
+        external_sector_outputs['overall_bop'] = self.overall_bop
+        external_sector_outputs['fx_reserves'] = self.fx_reserves
+        external_sector_outputs['reserves_months_imports'] = months_of_imports
         return external_sector_outputs
@@ -1,5 +1,16 @@
+import logging
+import numpy as np
+from ._steps import _fiscal_federalism_step
+
+logger = logging.getLogger(__name__)
+
 class FiscalFederalismModel:
     """Model fiscal relations between central and subnational governments"""
+    __slots__ = ('config', 'transfer_ratio_central_revenue', 'initial_subnational_revenue_gdp',
+                 'subnational_revenue_capacity_growth', 'subnational_spending_efficiency',
+                 'subnational_debt_limit_gdp', 'subnational_revenue_capacity_index',
+                 'total_transfers', 'total_subnational_own_revenue', 'total_subnational_spending',
+                 'aggregate_subnational_debt', 'initialized', '_out')
     def __init__(self, config):
         """Initialize fiscal federalism parameters based on config."""
         self.config = config
@@ -19,8 +30,12 @@ class FiscalFederalismModel:
         self.total_subnational_spending = 0
         self.aggregate_subnational_debt = 0
         self.initialized = False
+        # Output dict built once and updated in place each year
+        self._out = dict.fromkeys(('total_transfers', 'total_subnational_own_revenue',
+                                   'total_subnational_spending', 'aggregate_subnational_debt'), 0.0)
 
-        print(f"FiscalFederalismModel Initialized (Transfer Ratio: {self.transfer_ratio_central_revenue:.1%}, Debt Limit: {self.subnational_debt_limit_gdp:.1%})")
+        logger.info("FiscalFederalismModel Initialized (Transfer Ratio: %.1f%%, Debt Limit: %.1f%%)",
+                    self.transfer_ratio_central_revenue * 100, self.subnational_debt_limit_gdp * 100)
 
     def _initialize_state(self, initial_gdp):
         """Set initial subnational revenue and debt based on GDP."""
@@ -28,97 +43,128 @@ class FiscalFederalismModel:
         # Assume initial debt is a fraction of the limit
         self.aggregate_subnational_debt = (self.subnational_debt_limit_gdp * initial_gdp) * 0.5 
         self.initialized = True
-        print(f"Fiscal Federalism Initialized: OwnRev={self.total_subnational_own_revenue:.1f}, Debt={self.aggregate_subnational_debt:.1f}")
+        logger.info("Fiscal Federalism Initialized: OwnRev=%.1f, Debt=%.1f", self.total_subnational_own_revenue, self.aggregate_subnational_debt)
+
+    def simulate_fiscal_federalism(self, year, state):
+        """Project intergovernmental fiscal dynamics for a given year.
 
-    def _calculate_central_transfers(self, year, state):
-        """Calculate total transfers based on central government revenue."""
+        The returned dict is owned by the model and overwritten on the next call.
+        """
         # TODO: Model different types of transfers (conditional, unconditional), allocation formulas
-        central_revenue = state.get('revenue_state', {}).get('final_revenue', 0)
-        self.total_transfers = central_revenue * self.transfer_ratio_central_revenue
-        print(f"Year {year}: Calculated Central Transfers: {self.total_transfers:.1f}")
-
-    def _simulate_subnational_revenue(self, year, state):
-        """Simulate aggregate subnational own-source revenue generation."""
-        # TODO: Link to local economic activity, property values, specific local taxes
-        # Simple model: capacity grows over time
-        self.subnational_revenue_capacity_index *= (1 + self.subnational_revenue_capacity_growth)
-        # Base revenue grows with nominal GDP, adjusted by capacity improvement
-        gdp = state.get('economic_state', {}).get('gdp', 1)
-        if not self.initialized: # Use initial ratio if not initialized
-             base_rev = gdp * self.initial_subnational_revenue_gdp
-        else:
-            # Assume previous revenue grows roughly with GDP + capacity factor
-             gdp_growth = state.get('economic_state', {}).get('gdp_growth', 0.05)
-             inflation = state.get('inflation', 0.06) # Use overall inflation as proxy
-             nominal_gdp_growth = (1+gdp_growth)*(1+inflation) - 1
-             base_rev = self.total_subnational_own_revenue * (1 + nominal_gdp_growth + self.subnational_revenue_capacity_growth)
-
-        self.total_subnational_own_revenue = base_rev # Simplified update
-        self.total_subnational_own_revenue = max(0, self.total_subnational_own_revenue)
-        print(f"Year {year}: Subnational Capacity Index: {self.subnational_revenue_capacity_index:.3f}, Own Revenue: {self.total_subnational_own_revenue:.1f}")
-
-    def _simulate_subnational_spending(self, year, state):
-        """Simulate aggregate subnational spending based on available resources."""
+        # TODO: Link own revenue to local economic activity, property values, specific local taxes
         # TODO: Differentiate spending types (dev vs recurrent), link to service delivery outcomes
-        available_resources = self.total_transfers + self.total_subnational_own_revenue
-        # Simple: Assume they spend most of their available resources, adjusted by efficiency
-        potential_spending = available_resources * 0.95 # Assume they try to spend 95%
-        self.total_subnational_spending = potential_spending * self.subnational_spending_efficiency
-        self.total_subnational_spending = max(0, self.total_subnational_spending)
-        print(f"Year {year}: Available Resources: {available_resources:.1f}, Subnational Spending: {self.total_subnational_spending:.1f}")
-
-    def _update_subnational_debt(self, year, state):
-        """Update aggregate subnational debt based on subnational fiscal balance."""
         # TODO: Model interest on subnational debt, central govt guarantees/bailouts
-        subnational_deficit = self.total_subnational_spending - (self.total_transfers + self.total_subnational_own_revenue)
-        
-        # Calculate potential new borrowing
-        new_borrowing = max(0, subnational_deficit) # Only borrow if deficit exists
-        
-        # Check against debt limit
-        gdp = state.get('economic_state', {}).get('gdp', 1)
-        debt_limit_amount = self.subnational_debt_limit_gdp * gdp
-        allowed_borrowing = max(0, debt_limit_amount - self.aggregate_subnational_debt)
-        
-        actual_borrowing = min(new_borrowing, allowed_borrowing)
-        
-        # Update debt stock (simple increase by actual borrowing, ignores repayments for now)
-        self.aggregate_subnational_debt += actual_borrowing
-        self.aggregate_subnational_debt = max(0, self.aggregate_subnational_debt)
-        print(f"Year {year}: Subnational Deficit: {subnational_deficit:.1f}, Actual Borrowing: {actual_borrowing:.1f}, Aggregate Debt: {self.aggregate_subnational_debt:.1f}")
-
-
-    def simulate_fiscal_federalism(self, year, state):
-        """Project intergovernmental fiscal dynamics for a given year."""
-        print(f"--- Simulating Fiscal Federalism for Year {year} ---")
+        logger.debug("--- Simulating Fiscal Federalism for Year %d ---", year)
 
         if not self.initialized:
-            initial_gdp = state.get('economic_state', {}).get('gdp', 0)
+            initial_gdp = state.gdp
             if initial_gdp > 0:
                 self._initialize_state(initial_gdp)
             else:
-                print("Warning: Cannot initialize Fiscal Federalism, GDP not available.")
+                logger.warning("Cannot initialize Fiscal Federalism, GDP not available.")
                 return {}, 0 # Return empty state and zero debt
 
-        # 1. Calculate Central Transfers
-        self._calculate_central_transfers(year, state)
-
-        # 2. Simulate Subnational Own Revenue
-        self._simulate_subnational_revenue(year, state)
+        # 1. Calculate Central Transfers (share of central revenue)
+        # 2. Simulate Subnational Own Revenue (grows with nominal GDP plus capacity improvement)
+        # 3. Simulate Subnational Spending (95% of available resources, adjusted by efficiency)
+        # 4. Update Subnational Debt (borrow any deficit, up to the debt ceiling)
+        previous_debt = self.aggregate_subnational_debt
+        (self.subnational_revenue_capacity_index, self.total_transfers, self.total_subnational_own_revenue,
+         self.total_subnational_spending, self.aggregate_subnational_debt) = _fiscal_federalism_step(
+            self.subnational_revenue_capacity_index, self.total_subnational_own_revenue, previous_debt,
+            state.final_revenue, state.gdp, state.nominal_gdp_growth,
+            self.transfer_ratio_central_revenue, self.subnational_revenue_capacity_growth,
+            self.subnational_spending_efficiency, self.subnational_debt_limit_gdp)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            available_resources = self.total_transfers + self.total_subnational_own_revenue
+            logger.debug("Year %d: Calculated Central Transfers: %.1f", year, self.total_transfers)
+            logger.debug("Year %d: Subnational Capacity Index: %.3f, Own Revenue: %.1f", year,
+                         self.subnational_revenue_capacity_index, self.total_subnational_own_revenue)
+            logger.debug("Year %d: Available Resources: %.1f, Subnational Spending: %.1f", year,
+                         available_resources, self.total_subnational_spending)
+            logger.debug("Year %d: Subnational Deficit: %.1f, Actual Borrowing: %.1f, Aggregate Debt: %.1f", year,
+                         self.total_subnational_spending - available_resources,
+                         self.aggregate_subnational_debt - previous_debt, self.aggregate_subnational_debt)
+
+        logger.debug("--- Year %d Fiscal Federalism Simulation Complete ---", year)
 
-        # 3. Simulate Subnational Spending
-        self._simulate_subnational_spending(year, state)
-
-        # 4. Update Subnational Debt
-        self._update_subnational_debt(year, state)
+        # Return key indicators
+        fiscal_federalism_outputs = self._out
+        fiscal_federalism_outputs['total_transfers'] = self.total_transfers
+        fiscal_federalism_outputs['total_subnational_own_revenue'] = self.total_subnational_own_revenue
+        fiscal_federalism_outputs['total_subnational_spending'] = self.total_subnational_spending
+        fiscal_federalism_outputs['aggregate_subnational_debt'] = self.aggregate_subnational_debt
+        return fiscal_federalism_outputs
 
-        print(f"--- Year {year} Fiscal Federalism Simulation Complete ---")
+    def simulate_fiscal_federalism_batch(self, gdp_array, gdp_growth_array, inflation_array,
+                                         central_revenue_array, dtype=np.float64):
+        """Project intergovernmental fiscal dynamics over a whole horizon in one pass.
+
+        Applies the same rules as `simulate_fiscal_federalism` year after year, starting
+        from the model's current state (initialized from the first year's GDP if needed),
+        without advancing the model's own state. Several scenarios can be projected at
+        once by passing 2-D inputs; their state is carried as one array per quantity with
+        one entry per scenario.
+
+        Args:
+            gdp_array: Nominal GDP in each year, shape (N,) or (n_scenarios, N).
+            gdp_growth_array: GDP growth in each year, same shape as `gdp_array`.
+            inflation_array: Inflation in each year, same shape as `gdp_array`.
+            central_revenue_array: Central government revenue in each year, same shape as
+                `gdp_array`.
+            dtype: Floating-point type of the computation and the results. np.float32
+                halves memory traffic for large sweeps at about 1e-6 relative precision.
+
+        Returns:
+            Dict of arrays shaped like `gdp_array`: 'total_transfers',
+            'total_subnational_own_revenue', 'total_subnational_spending',
+            'aggregate_subnational_debt' and 'subnational_revenue_capacity_index'.
+        """
+        gdp = np.asarray(gdp_array, dtype=dtype)
+        gdp_growth = np.asarray(gdp_growth_array, dtype=dtype)
+        inflation = np.asarray(inflation_array, dtype=dtype)
+        n_years = gdp.shape[-1]
+        if self.initialized:
+            own_revenue0 = np.full(gdp.shape[:-1], self.total_subnational_own_revenue, dtype=dtype)
+            debt0 = np.full(gdp.shape[:-1], self.aggregate_subnational_debt, dtype=dtype)
+        else:
+            own_revenue0 = self.initial_subnational_revenue_gdp * gdp[..., 0]
+            debt0 = (self.subnational_debt_limit_gdp * gdp[..., 0]) * 0.5
+
+        # Running products start from the opening level so they round exactly like the yearly updates
+        capacity_growth = np.full(n_years + 1, 1 + self.subnational_revenue_capacity_growth, dtype=dtype)
+        capacity_growth[0] = self.subnational_revenue_capacity_index
+        capacity_index = np.broadcast_to(np.multiply.accumulate(capacity_growth)[1:], gdp.shape).copy()
+        nominal_gdp_growth = (1 + gdp_growth) * (1 + inflation) - 1
+        revenue_growth = np.empty(gdp.shape[:-1] + (n_years + 1,), dtype=dtype)
+        revenue_growth[..., 0] = own_revenue0
+        revenue_growth[..., 1:] = 1 + nominal_gdp_growth + self.subnational_revenue_capacity_growth
+        own_revenue = np.maximum(np.multiply.accumulate(revenue_growth, axis=-1)[..., 1:], 0)
+
+        transfers = np.asarray(central_revenue_array, dtype=dtype) * self.transfer_ratio_central_revenue
+        resources = transfers + own_revenue
+        spending = np.maximum(resources * 0.95 * self.subnational_spending_efficiency, 0)
+        new_borrowing = np.maximum(spending - resources, 0) # Only borrow if deficit exists
+        debt_limit_amount = self.subnational_debt_limit_gdp * gdp
 
-        # Return key indicators
-        fiscal_federalism_outputs = {
-            'total_transfers': self.total_transfers,
-            'total_subnational_own_revenue': self.total_subnational_own_revenue,
-            'total_subnational_spending': self.total_subnational_spending,
-            'aggregate_subnational_debt': self.aggregate_subnational_debt
+        # The debt ceiling depends on last year's stock, so this part stays serial over years
+        # (vectorized across scenarios)
+        debt = np.empty_like(gdp)
+        stock = np.array(debt0, dtype=dtype)
+        allowed_borrowing = np.empty_like(stock)
+        for t in range(n_years):
+            np.subtract(debt_limit_amount[..., t], stock, out=allowed_borrowing)
+            np.maximum(allowed_borrowing, 0, out=allowed_borrowing)
+            np.minimum(new_borrowing[..., t], allowed_borrowing, out=allowed_borrowing)
+            stock += allowed_borrowing
+            np.maximum(stock, 0, out=stock)
+            debt[..., t] = stock
+
+        return {
+            'total_transfers': transfers,
+            'total_subnational_own_revenue': own_revenue,
+            'total_subnational_spending': spending,
+            'aggregate_subnational_debt': debt,
+            'subnational_revenue_capacity_index': capacity_index
         }
-        return fiscal_federalism_outputs
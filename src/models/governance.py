@@ -1,22 +1,46 @@
+import logging
+import numpy as np
+from ._steps import _governance_step
+
+logger = logging.getLogger(__name__)
+
+# Layout of the governance area arrays (levels, improvement rates, index weights)
+PFM, NBR, CB, AC, ACC = range(5)
+
 class GovernanceModel:
     """Model governance quality and institutional capability"""
-    def __init__(self, config):
-        """Initialize governance parameters based on config."""
+    __slots__ = ('config', 'levels', 'improvement_rates', '_caps', 'weights', '_weights', 'governance_index',
+                 '_n_years', '_start_year', '_level_schedule', '_index_schedule', '_out')
+    def __init__(self, config, n_years=None):
+        """Initialize governance parameters based on config.
+
+        Args:
+            config: Governance section of the simulation config.
+            n_years: Optional simulation horizon. When given, the level and index paths for
+                that many years are computed on the first update and later updates become
+                lookups. The rates, caps and weights are read-only from then on.
+        """
         self.config = config
-        # Initial levels (scale 0-1, higher is better)
-        self.pfm_reform_level = config.get('initial_pfm_level', 0.4)
-        self.nbr_capacity_level = config.get('initial_nbr_level', 0.5)
-        self.central_bank_capacity = config.get('initial_cb_level', 0.6)
-        self.anti_corruption_effectiveness = config.get('initial_ac_level', 0.3)
-        self.accountability_score = config.get('initial_accountability_score', 0.4)
+        # Initial levels (scale 0-1, higher is better), PFM/NBR/CB/AC/ACC layout, updated in place each year
+        self.levels = np.array([
+            config.get('initial_pfm_level', 0.4),
+            config.get('initial_nbr_level', 0.5),
+            config.get('initial_cb_level', 0.6),
+            config.get('initial_ac_level', 0.3),
+            config.get('initial_accountability_score', 0.4)
+        ], dtype=float)
         # Add SOE, Subnational later if needed explicitly here
 
-        # Factors influencing change (simple annual improvement rates)
-        self.pfm_improvement_rate = config.get('pfm_improvement_rate', 0.015)
-        self.nbr_improvement_rate = config.get('nbr_improvement_rate', 0.01)
-        self.cb_improvement_rate = config.get('cb_improvement_rate', 0.005)
-        self.ac_improvement_rate = config.get('ac_improvement_rate', 0.008)
-        self.accountability_improvement_rate = config.get('accountability_improvement_rate', 0.012)
+        # Factors influencing change (simple annual improvement rates), same layout
+        self.improvement_rates = np.array([
+            config.get('pfm_improvement_rate', 0.015),
+            config.get('nbr_improvement_rate', 0.01),
+            config.get('cb_improvement_rate', 0.005),
+            config.get('ac_improvement_rate', 0.008),
+            config.get('accountability_improvement_rate', 0.012)
+        ], dtype=float)
+        # Ceiling on every area's level, same layout
+        self._caps = np.full(len(self.levels), config.get('max_level', 0.95))
 
         # Overall Index Weights
         self.weights = config.get('governance_weights', {
@@ -27,55 +51,104 @@ class GovernanceModel:
             'accountability': 0.20
         })
 
+        # Weights in the level layout, for the index dot product in _governance_step
+        self._weights = np.array([self.weights[k] for k in ('pfm', 'nbr', 'cb', 'ac', 'accountability')], dtype=float)
+
         self.governance_index = 0 # Will be calculated
-        print(f"GovernanceModel Initialized (PFM: {self.pfm_reform_level:.2f}, NBR: {self.nbr_capacity_level:.2f}, AC: {self.anti_corruption_effectiveness:.2f})")
+        # Per-year levels and index, built on the first update; row t belongs to start_year + t
+        self._n_years = n_years
+        self._start_year = None
+        self._level_schedule = self._index_schedule = None
+        # Output dict built once and updated in place each year
+        self._out = dict.fromkeys(('governance_index', 'pfm_reform_level', 'nbr_modernization_level',
+                                   'central_bank_capacity', 'anti_corruption_effectiveness',
+                                   'accountability_score'), 0.0)
+        logger.info("GovernanceModel Initialized (PFM: %.2f, NBR: %.2f, AC: %.2f)",
+                    self.pfm_reform_level, self.nbr_capacity_level, self.anti_corruption_effectiveness)
 
-    def _update_governance_areas(self, year, state):
-        """Simulate the gradual evolution of different governance aspects."""
-        # TODO: Model impact of specific reforms, political economy factors, external support
-        # Simple linear improvement trend for now, capped at 0.95
-        self.pfm_reform_level = min(0.95, self.pfm_reform_level + self.pfm_improvement_rate)
-        self.nbr_capacity_level = min(0.95, self.nbr_capacity_level + self.nbr_improvement_rate)
-        self.central_bank_capacity = min(0.95, self.central_bank_capacity + self.cb_improvement_rate)
-        self.anti_corruption_effectiveness = min(0.95, self.anti_corruption_effectiveness + self.ac_improvement_rate)
-        self.accountability_score = min(0.95, self.accountability_score + self.accountability_improvement_rate)
-
-        print(f"Year {year}: Updated Governance Areas - PFM: {self.pfm_reform_level:.3f}, NBR: {self.nbr_capacity_level:.3f}, AC: {self.anti_corruption_effectiveness:.3f}, Acc: {self.accountability_score:.3f}")
-
-    def _calculate_governance_index(self, year):
-        """Calculate the overall governance index based on component levels."""
-        # Weighted average of the components
-        index = (self.pfm_reform_level * self.weights['pfm'] +
-                 self.nbr_capacity_level * self.weights['nbr'] +
-                 self.central_bank_capacity * self.weights['cb'] +
-                 self.anti_corruption_effectiveness * self.weights['ac'] +
-                 self.accountability_score * self.weights['accountability'])
-        
-        # Scale to 0-100 for easier interpretation (optional)
-        self.governance_index = index * 100
-        print(f"Year {year}: Calculated Overall Governance Index: {self.governance_index:.2f}")
-        return self.governance_index
+    def _build_schedule(self, n_years):
+        """Levels before and after each of the next `n_years` updates, shape (n_years + 1, 5),
+        and the index after each update, shape (n_years,).
 
+        Levels follow a capped linear ramp, so the running sum of the rates capped at the
+        ceiling reproduces the yearly updates exactly (given non-negative rates; otherwise
+        no schedule is built and each year is stepped). The parameters it is built from
+        are made read-only, so the schedule cannot silently go out of date.
+        """
+        if np.any(self.improvement_rates < 0):
+            return None, None
+        steps = np.empty((n_years + 1, len(self.levels)))
+        steps[0] = self.levels
+        steps[1:] = self.improvement_rates
+        levels = np.add.accumulate(steps, axis=0)
+        np.minimum(levels[1:], self._caps, out=levels[1:])
+        # Weighted sum accumulated area by area, in the same order as _governance_step
+        index = np.zeros(n_years)
+        for i in range(len(self._weights)):
+            index += levels[1:, i] * self._weights[i]
+        for param in (self.improvement_rates, self._caps, self._weights):
+            param.setflags(write=False)
+        return levels, index * 100
+
+    @property
+    def pfm_reform_level(self):
+        """PFM reform level."""
+        return float(self.levels[PFM])
+
+    @property
+    def nbr_capacity_level(self):
+        """NBR (tax administration) capacity level."""
+        return float(self.levels[NBR])
+
+    @property
+    def central_bank_capacity(self):
+        """Central bank capacity level."""
+        return float(self.levels[CB])
+
+    @property
+    def anti_corruption_effectiveness(self):
+        """Anti-corruption effectiveness level."""
+        return float(self.levels[AC])
+
+    @property
+    def accountability_score(self):
+        """Accountability score."""
+        return float(self.levels[ACC])
 
     def simulate_governance_evolution(self, year, state):
-        """Project governance improvements and constraints for a given year."""
-        print(f"--- Simulating Governance Evolution for Year {year} ---")
+        """Project governance improvements and constraints for a given year.
 
-        # 1. Update the levels of individual governance areas
-        self._update_governance_areas(year, state)
+        The returned dict is owned by the model and overwritten on the next call.
+        """
+        # TODO: Model impact of specific reforms, political economy factors, external support
+        logger.debug("--- Simulating Governance Evolution for Year %d ---", year)
 
-        # 2. Calculate the overall governance index
-        index = self._calculate_governance_index(year)
+        # 1. Update the levels of individual governance areas (simple linear improvement, capped at max_level)
+        # 2. Calculate the overall governance index (weighted average of the areas, 0-100 scale)
+        if self._start_year is None and self._n_years:
+            self._start_year = year
+            self._level_schedule, self._index_schedule = self._build_schedule(self._n_years)
+        schedule = self._level_schedule
+        t = year - self._start_year if schedule is not None else -1
+        # The schedule only applies while the levels are where it expects them for this year
+        if 0 <= t < len(self._index_schedule) and np.array_equal(self.levels, schedule[t]):
+            self.levels[:] = schedule[t + 1]
+            self.governance_index = float(self._index_schedule[t])
+        else:
+            self.governance_index = _governance_step(self.levels, self.improvement_rates, self._caps, self._weights)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Year %d: Updated Governance Areas - PFM: %.3f, NBR: %.3f, AC: %.3f, Acc: %.3f", year,
+                         *self.levels[[PFM, NBR, AC, ACC]])
+        logger.debug("Year %d: Calculated Overall Governance Index: %.2f", year, self.governance_index)
 
-        print(f"--- Year {year} Governance Simulation Complete ---")
+        logger.debug("--- Year %d Governance Simulation Complete ---", year)
 
         # Return the overall index and potentially the individual components if needed by other models
-        governance_state_outputs = {
-            'governance_index': index,
-            'pfm_reform_level': self.pfm_reform_level,
-            'nbr_modernization_level': self.nbr_capacity_level, # Use consistent name
-            'central_bank_capacity': self.central_bank_capacity,
-            'anti_corruption_effectiveness': self.anti_corruption_effectiveness,
-            'accountability_score': self.accountability_score
-        }
+        governance_state_outputs = self._out
+        governance_state_outputs['governance_index'] = self.governance_index
+        governance_state_outputs['pfm_reform_level'] = self.pfm_reform_level
+        governance_state_outputs['nbr_modernization_level'] = self.nbr_capacity_level # Use consistent name
+        governance_state_outputs['central_bank_capacity'] = self.central_bank_capacity
+        governance_state_outputs['anti_corruption_effectiveness'] = self.anti_corruption_effectiveness
+        governance_state_outputs['accountability_score'] = self.accountability_score
         return governance_state_outputs
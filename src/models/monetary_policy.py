@@ -1,5 +1,13 @@
+import logging
+import numpy as np
+from ._steps import _monetary_step
+
+logger = logging.getLogger(__name__)
+
 class MonetaryPolicyModel:
     """Model monetary policy implementation and effectiveness"""
+    __slots__ = ('config', 'target_inflation', 'policy_rate', 'inflation_gap_weight',
+                 'policy_transmission_lag', 'neutral_rate', '_target_mid')
     def __init__(self, config):
         """Initialize monetary policy parameters based on config."""
         self.config = config
@@ -7,57 +15,60 @@ class MonetaryPolicyModel:
         self.policy_rate = config.get('initial_policy_rate', 0.06) # Proxy policy rate
         self.inflation_gap_weight = config.get('inflation_gap_weight', 1.5) # Taylor rule like weight
         self.policy_transmission_lag = config.get('policy_transmission_lag', 0.1) # How much policy rate affects inflation next period
+        self.neutral_rate = config.get('neutral_rate', 0.06) # Rate at which policy neither eases nor tightens inflation
+        self._target_mid = 0.5 * sum(self.target_inflation) # Midpoint of the target band
 
-        print(f"MonetaryPolicyModel Initialized (Target: {self.target_inflation}, Initial Rate: {self.policy_rate:.2%})")
+        logger.info("MonetaryPolicyModel Initialized (Target: %s, Initial Rate: %.2f%%)", self.target_inflation, self.policy_rate * 100)
 
-    def _adjust_policy_rate(self, year, state):
-        """Adjust the policy rate based on inflation deviation from target."""
+    def simulate_monetary_conditions(self, year, state):
+        """Calculate monetary policy impacts and effectiveness for a given year."""
         # TODO: Model policy instruments (repo, reserve req), transmission channels, FX intervention
-        current_inflation = state.get('inflation', 0.07)
-        inflation_target_midpoint = (self.target_inflation[0] + self.target_inflation[1]) / 2
-        inflation_gap = current_inflation - inflation_target_midpoint
-
-        # Simple Taylor-like rule for policy rate adjustment
-        # Increase rate if inflation is above target, decrease if below
-        rate_adjustment = self.inflation_gap_weight * inflation_gap
-        self.policy_rate += rate_adjustment
-
-        # Apply bounds to the policy rate (e.g., 1% to 15%)
-        self.policy_rate = max(0.01, min(0.15, self.policy_rate))
-
-        print(f"Year {year}: Current Inflation: {current_inflation:.2%}, Target Mid: {inflation_target_midpoint:.2%}, Adjusted Policy Rate: {self.policy_rate:.2%})")
-
-    def _simulate_inflation_impact(self, year, state):
-        """Simulate the lagged impact of policy rate changes on inflation."""
         # TODO: Model inflation expectations, supply shocks, exchange rate pass-through
-        # Very simple model: higher policy rate reduces next period's inflation slightly
-        # Assumes the 'inflation' in the state is the *current* year's inflation before this model runs
-        # We calculate the *projected* inflation for the *end* of this year / start of next year
-        
-        current_inflation = state.get('inflation', 0.07)
-        projected_inflation = current_inflation - (self.policy_transmission_lag * (self.policy_rate - 0.06)) # Effect relative to baseline rate (e.g., 6%)
-        
-        # Add some basic inertia/persistence
-        projected_inflation = 0.8 * projected_inflation + 0.2 * current_inflation
+        logger.debug("--- Simulating Monetary Conditions for Year %d ---", year)
 
-        # Apply bounds (e.g., 0% to 20%)
-        projected_inflation = max(0.00, min(0.20, projected_inflation))
+        # 1. Adjust Policy Rate based on current inflation vs target (Taylor-like rule)
+        # 2. Simulate the lagged impact on next period's inflation. Assumes the inflation in
+        #    the state is the *current* year's inflation before this model runs.
+        current_inflation = state.inflation
+        self.policy_rate, projected_inflation = _monetary_step(
+            self.policy_rate, current_inflation, self._target_mid,
+            self.inflation_gap_weight, self.policy_transmission_lag, self.neutral_rate)
 
-        print(f"Year {year}: Projected Inflation for next period: {projected_inflation:.2%}")
-        return projected_inflation
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Year %d: Current Inflation: %.2f%%, Target Mid: %.2f%%, Adjusted Policy Rate: %.2f%%", year,
+                         current_inflation * 100, self._target_mid * 100, self.policy_rate * 100)
+            logger.debug("Year %d: Projected Inflation for next period: %.2f%%", year, projected_inflation * 100)
+        logger.debug("--- Year %d Monetary Conditions Simulation Complete ---", year)
 
+        # Return the adjusted policy rate and the projected inflation for the *next* period
+        return self.policy_rate, projected_inflation
 
-    def simulate_monetary_conditions(self, year, state):
-        """Calculate monetary policy impacts and effectiveness for a given year."""
-        print(f"--- Simulating Monetary Conditions for Year {year} ---")
+    def simulate_monetary_conditions_batch(self, inflation, dtype=np.float64):
+        """Project the policy rate and next-period inflation over a whole horizon in one pass.
 
-        # 1. Adjust Policy Rate based on current inflation vs target
-        self._adjust_policy_rate(year, state)
+        Applies the same rules as `simulate_monetary_conditions` year after year, starting
+        from the current policy rate, without advancing the model's own state. Several
+        scenarios can be projected at once by passing 2-D input.
 
-        # 2. Simulate the impact on next period's inflation
-        projected_inflation = self._simulate_inflation_impact(year, state)
+        Args:
+            inflation: Current inflation in each year, shape (N,) or (n_scenarios, N).
+            dtype: Floating-point type of the computation and the results.
 
-        print(f"--- Year {year} Monetary Conditions Simulation Complete ---")
+        Returns:
+            Tuple (policy_rate, projected_inflation) of arrays shaped like `inflation`.
+        """
+        inflation = np.asarray(inflation, dtype=dtype)
+        policy_rate = np.empty_like(inflation)
+        rate = np.full(inflation.shape[:-1], self.policy_rate, dtype=dtype)
+        # The rate rule feeds on last year's rate, so it stays serial over years
+        for t in range(inflation.shape[-1]):
+            rate += self.inflation_gap_weight * (inflation[..., t] - self._target_mid)
+            np.clip(rate, 0.01, 0.15, out=rate)
+            policy_rate[..., t] = rate
 
-        # Return the adjusted policy rate and the projected inflation for the *next* period
-        return self.policy_rate, projected_inflation
+        # Projected inflation only depends on the same year's rate, so it is computed for all years at once
+        projected = inflation - (self.policy_transmission_lag * (policy_rate - self.neutral_rate))
+        projected *= 0.8
+        projected += 0.2 * inflation
+        np.clip(projected, 0.0, 0.20, out=projected)
+        return policy_rate, projected
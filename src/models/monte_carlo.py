@@ -0,0 +1,89 @@
+"""Monte Carlo runs of the sector models over independent shock draws.
+
+Given macro paths (GDP, growth, governance, supervision, deficit) the external sector,
+financial sector, development finance and debt models are independent of each other
+within a trajectory, so many trajectories can be run in parallel by compiled kernels.
+"""
+import numpy as np
+from ._kernels import MonteCarloParams, run_monte_carlo, MC_OUTPUTS, N_MC_OUTPUTS, N_PATHS
+from .debt import DOM, EXT
+from ..utils.shocks import ShockSchedule
+
+# Keys of the macro_paths dict, in the column order expected by the kernels (PATH_*)
+PATH_KEYS = ('gdp', 'gdp_growth', 'governance_index', 'pfm_reform_level',
+             'supervision_effectiveness', 'deficit')
+assert len(PATH_KEYS) == N_PATHS
+
+_IMPORTS = MC_OUTPUTS.index('imports')
+_RESERVES = MC_OUTPUTS.index('fx_reserves')
+_RESERVE_MONTHS = MC_OUTPUTS.index('reserves_months_imports')
+
+
+def build_params(external_model, financial_model, dev_finance_model, debt_model):
+    """Collect the kernel constants from configured model instances.
+
+    Financial sector and debt start from the models' current state; external sector and
+    development finance are initialized from first-year GDP as in their _initialize_state.
+    """
+    return MonteCarloParams(
+        initial_export_gdp=external_model.initial_export_gdp,
+        initial_import_gdp=external_model.initial_import_gdp,
+        initial_remittance_gdp=external_model.initial_remittance_gdp,
+        initial_fdi_gdp=external_model.initial_fdi_gdp,
+        initial_reserves_months_import=external_model.initial_reserves_months_import,
+        export_sens=external_model.export_global_growth_sensitivity,
+        import_sens=external_model.import_domestic_growth_sensitivity,
+        remittance_sens=external_model.remittance_global_growth_sensitivity,
+        fdi_sens=external_model.fdi_governance_sensitivity,
+        npl0=financial_model.npl_ratio,
+        car0=financial_model.capital_adequacy_ratio,
+        npl_gdp_sens=financial_model.npl_gdp_sensitivity,
+        npl_sup_sens=financial_model.npl_supervision_sensitivity,
+        required_car=financial_model.required_car,
+        initial_grant_aid_gdp=dev_finance_model.initial_grant_aid_gdp,
+        initial_dfi_net_lending_gdp=dev_finance_model.initial_dfi_net_lending_gdp,
+        grant_global_sens=dev_finance_model.grant_global_factor_sensitivity,
+        dfi_governance_sens=dev_finance_model.dfi_lending_governance_sensitivity,
+        absorption_sens=dev_finance_model.absorption_capacity_sensitivity,
+        debt_dom0=float(debt_model._stock[DOM]),
+        debt_ext0=float(debt_model._stock[EXT]),
+        r_dom=float(debt_model._rates[DOM]),
+        r_ext=float(debt_model._rates[EXT]),
+        rep_dom=float(debt_model._repay[DOM]),
+        rep_ext=float(debt_model._repay[EXT]),
+    )
+
+
+def simulate_monte_carlo(external_model, financial_model, dev_finance_model, debt_model,
+                         macro_paths, n_sims, seed=None, shocks=None):
+    """Run `n_sims` independent sector trajectories along the given macro paths.
+
+    Args:
+        external_model, financial_model, dev_finance_model, debt_model: Configured models.
+        macro_paths: Dict with the PATH_KEYS entries, each of shape (n_years,) when shared by
+            all runs or (n_sims, n_years) when each run has its own path.
+        n_sims: Number of trajectories.
+        seed: Seed for the shock draws.
+        shocks: Optional pre-drawn (n_sims, n_years, n_shocks) shocks, overriding `seed`.
+
+    Returns:
+        Array of shape (n_sims, n_years, len(MC_OUTPUTS)); column k holds MC_OUTPUTS[k].
+    """
+    n_years = np.shape(macro_paths['gdp'])[-1]
+    paths = np.empty((n_sims, n_years, N_PATHS))
+    for k, key in enumerate(PATH_KEYS):
+        paths[:, :, k] = macro_paths[key]
+    if shocks is None:
+        shocks = ShockSchedule.draw_batch(n_sims, n_years, seed)
+
+    out = np.empty((n_sims, n_years, N_MC_OUTPUTS))
+    params = build_params(external_model, financial_model, dev_finance_model, debt_model)
+    run_monte_carlo(n_sims, n_years, shocks, paths, params, out)
+
+    # Reserves in months of imports for every run and year in one vectorized pass
+    # (zero when there are no imports)
+    imports = out[:, :, _IMPORTS]
+    months = out[:, :, _RESERVE_MONTHS]
+    months[...] = 0.0
+    np.divide(out[:, :, _RESERVES], imports / 12.0, out=months, where=imports > 0)
+    return out
@@ -0,0 +1,121 @@
+"""Compiled annual pipeline of the governance, monetary, revenue, fiscal federalism and
+policy coordination models.
+
+Given macro paths (GDP, growth, inflation, deficit) these five models only depend on
+each other, so a whole horizon runs in one compiled loop instead of five Python method
+calls per year, and independent trajectories run in parallel. The model instances only
+supply the configuration and starting state; they are not advanced.
+"""
+import numpy as np
+from ._kernels import (PolicyParams, run_policy_path, run_policy_monte_carlo, N_POLICY_OUTPUTS,
+                       N_POLICY_PATHS, N_POL_STATE, POL_PFM, POL_ACC, POL_RATE, POL_COORD,
+                       POL_CAPACITY, POL_OWN_REV, POL_SN_DEBT, POL_ADMIN, POL_COMPLIANCE)
+
+# Keys of the macro_paths dict, in the column order expected by the kernels (PPATH_*)
+PATH_KEYS = ('gdp', 'gdp_growth', 'inflation', 'deficit')
+assert len(PATH_KEYS) == N_POLICY_PATHS
+
+
+def build_policy_params(governance_model, monetary_model, revenue_model, fiscal_federalism_model,
+                        coordination_model):
+    """Collect the pipeline constants from configured model instances."""
+    return PolicyParams(
+        gov_rates=governance_model.improvement_rates.copy(),
+        gov_caps=governance_model._caps.copy(),
+        gov_weights=governance_model._weights.copy(),
+        target_mid=float(monetary_model._target_mid),
+        gap_weight=float(monetary_model.inflation_gap_weight),
+        transmission_lag=float(monetary_model.policy_transmission_lag),
+        neutral_rate=float(monetary_model.neutral_rate),
+        per_gdp_coef=revenue_model._per_gdp_coef,
+        trade_tax_rate=float(revenue_model._trade_tax_rate),
+        formal_sector_share=float(revenue_model.formal_sector_share),
+        transfer_ratio=float(fiscal_federalism_model.transfer_ratio_central_revenue),
+        capacity_growth=float(fiscal_federalism_model.subnational_revenue_capacity_growth),
+        spending_efficiency=float(fiscal_federalism_model.subnational_spending_efficiency),
+        debt_limit_gdp=float(fiscal_federalism_model.subnational_debt_limit_gdp),
+        threshold_inflation=float(coordination_model.conflict_threshold_inflation),
+        threshold_deficit=float(coordination_model.conflict_threshold_deficit),
+        conflict_impact=float(coordination_model.conflict_impact),
+        institutional_impact=float(coordination_model.institutional_impact),
+    )
+
+
+def initial_policy_state(governance_model, monetary_model, revenue_model, fiscal_federalism_model,
+                         coordination_model, initial_gdp):
+    """Build the POL_* state vector from the models' current state.
+
+    Fiscal federalism is initialized from `initial_gdp` as in its _initialize_state if the
+    model has not been initialized yet.
+    """
+    state = np.empty(N_POL_STATE)
+    state[POL_PFM:POL_ACC + 1] = governance_model.levels
+    state[POL_RATE] = monetary_model.policy_rate
+    state[POL_COORD] = coordination_model.current_coordination_score
+    state[POL_ADMIN] = revenue_model.current_admin_efficiency
+    state[POL_COMPLIANCE] = revenue_model.current_compliance_rate
+    ff = fiscal_federalism_model
+    state[POL_CAPACITY] = ff.subnational_revenue_capacity_index
+    if ff.initialized:
+        state[POL_OWN_REV] = ff.total_subnational_own_revenue
+        state[POL_SN_DEBT] = ff.aggregate_subnational_debt
+    else:
+        state[POL_OWN_REV] = ff.initial_subnational_revenue_gdp * initial_gdp
+        state[POL_SN_DEBT] = (ff.subnational_debt_limit_gdp * initial_gdp) * 0.5
+    return state
+
+
+def simulate_policy_path(governance_model, monetary_model, revenue_model, fiscal_federalism_model,
+                         coordination_model, macro_paths):
+    """Run the five policy models along one macro path.
+
+    Args:
+        governance_model, monetary_model, revenue_model, fiscal_federalism_model,
+            coordination_model: Configured models supplying parameters and starting state.
+        macro_paths: Dict with the PATH_KEYS entries, each of shape (n_years,).
+
+    Returns:
+        Array of shape (n_years, len(POLICY_OUTPUTS)); column k holds POLICY_OUTPUTS[k].
+    """
+    models = (governance_model, monetary_model, revenue_model, fiscal_federalism_model,
+              coordination_model)
+    n_years = np.shape(macro_paths['gdp'])[-1]
+    paths = np.empty((n_years, N_POLICY_PATHS))
+    for k, key in enumerate(PATH_KEYS):
+        paths[:, k] = macro_paths[key]
+
+    out = np.empty((n_years, N_POLICY_OUTPUTS))
+    state = initial_policy_state(*models, paths[0, 0])
+    run_policy_path(n_years, paths, state, build_policy_params(*models), out)
+    return out
+
+
+def simulate_policy_monte_carlo(governance_model, monetary_model, revenue_model,
+                                fiscal_federalism_model, coordination_model, macro_paths, n_sims):
+    """Run `n_sims` independent policy trajectories along the given macro paths.
+
+    Args:
+        governance_model, monetary_model, revenue_model, fiscal_federalism_model,
+            coordination_model: Configured models supplying parameters and starting state.
+        macro_paths: Dict with the PATH_KEYS entries, each of shape (n_years,) when shared by
+            all runs or (n_sims, n_years) when each run has its own path.
+        n_sims: Number of trajectories.
+
+    Returns:
+        Array of shape (n_sims, n_years, len(POLICY_OUTPUTS)); column k holds POLICY_OUTPUTS[k].
+    """
+    models = (governance_model, monetary_model, revenue_model, fiscal_federalism_model,
+              coordination_model)
+    n_years = np.shape(macro_paths['gdp'])[-1]
+    paths = np.empty((n_sims, n_years, N_POLICY_PATHS))
+    for k, key in enumerate(PATH_KEYS):
+        paths[:, :, k] = macro_paths[key]
+
+    # Every run starts from the same model state; only the GDP-based initialization differs
+    states = np.empty((n_sims, N_POL_STATE))
+    for s in range(n_sims):
+        states[s] = initial_policy_state(*models, paths[s, 0, 0])
+
+    out = np.empty((n_sims, n_years, N_POLICY_OUTPUTS))
+    run_policy_monte_carlo(n_sims, n_years, paths, states, build_policy_params(*models), out)
+    return out
@@ -1,8 +1,16 @@
 # src/models/revenue.py
-import pandas as pd # Assuming we might use pandas for structured data later
+import logging
+import numpy as np
+from ._steps import _revenue_step
+
+logger = logging.getLogger(__name__)
 
 class RevenueModel:
     """Model revenue collection mechanisms and potential"""
+    __slots__ = ('config', 'tax_structure', 'admin_capacity', 'compliance_params',
+                 'economic_structure', 'informality_metrics', 'enforcement_caps', '_tax_shares',
+                 '_tax_rates', '_per_gdp_coef', '_trade_tax_rate', 'current_compliance_rate',
+                 'current_admin_efficiency', 'formal_sector_share', '_out')
     def __init__(self, config):
         """Initialize revenue system parameters based on config."""
         self.config = config
@@ -12,90 +20,112 @@ class RevenueModel:
         self.economic_structure = config.get('economic_structure', {})
         self.informality_metrics = config.get('informality_metrics', {})
         self.enforcement_caps = config.get('enforcement_caps', {})
+        # Simplified domestic tax bases as shares of GDP (VAT, income, corporate) and their rates;
+        # their dot product is the tax potential per unit of GDP, fixed for the whole run
+        self._tax_shares = np.array([0.4, 0.3, 0.2])
+        self._tax_rates = np.array([self.tax_structure.get('vat_rate', 0.15),
+                                    self.tax_structure.get('avg_income_tax_rate', 0.10),
+                                    self.tax_structure.get('avg_corp_tax_rate', 0.25)])
+        self._per_gdp_coef = float(self._tax_shares @ self._tax_rates)
+        self._trade_tax_rate = self.tax_structure.get('avg_trade_tax', 0.05)
 
         # Potential state variables internal to the model, updated annually
         self.current_compliance_rate = self.compliance_params.get('initial_compliance', 0.6)
         self.current_admin_efficiency = self.admin_capacity.get('initial_efficiency', 0.7)
         self.formal_sector_share = 1.0 - self.informality_metrics.get('initial_share', 0.3)
+        # Output dict built once and updated in place each year
+        self._out = {'final_revenue': 0.0}
 
-        print("RevenueModel Initialized")
-
-    def _calculate_tax_potential(self, year, economic_state):
-        """Estimate potential revenue based purely on economic activity and tax structure."""
-        # TODO: Implement detailed calculations based on tax types (VAT, Income, Corp, Trade etc.)
-        # Example: Use GDP, consumption, imports/exports from economic_state
-        gdp = economic_state.get('gdp', 0)
-        potential_vat = gdp * 0.4 * self.tax_structure.get('vat_rate', 0.15) # Simplified: 40% of GDP is VAT base
-        potential_income_tax = gdp * 0.3 * self.tax_structure.get('avg_income_tax_rate', 0.10) # Simplified
-        potential_corp_tax = gdp * 0.2 * self.tax_structure.get('avg_corp_tax_rate', 0.25) # Simplified
-        potential_trade_tax = economic_state.get('imports', gdp*0.2) * self.tax_structure.get('avg_trade_tax', 0.05) # Simplified
-        # Add other taxes (property, excise etc.)
-        potential_revenue = potential_vat + potential_income_tax + potential_corp_tax + potential_trade_tax
-        print(f"Year {year}: Potential Revenue (Est.): {potential_revenue:.2f}")
-        return potential_revenue
-
-    def _apply_structural_constraints(self, year, potential_revenue, economic_state):
-        """Adjust potential revenue for structural factors like informality."""
-        # TODO: Implement impact of informality, sector composition, etc.
-        # Example: Reduce potential based on informal sector size
-        constrained_revenue = potential_revenue * self.formal_sector_share
-        # TODO: Add effects of digital economy, agriculture taxation policy, etc.
-        print(f"Year {year}: Revenue after Structural Constraints: {constrained_revenue:.2f}")
-        return constrained_revenue
-
-    def _apply_administrative_capacity(self, year, constrained_revenue):
-        """Adjust revenue based on the capacity of the tax administration."""
-        # TODO: Model NBR modernization, audit capacity, IT systems etc.
-        # Example: Use an efficiency factor derived from admin_capacity config/state
-        admin_factor = self.current_admin_efficiency # Use internal state
-        collected_revenue = constrained_revenue * admin_factor
-        print(f"Year {year}: Revenue after Admin Capacity Adjustment: {collected_revenue:.2f}")
-        return collected_revenue
-
-    def _apply_compliance_dynamics(self, year, collected_revenue):
-        """Adjust revenue based on taxpayer compliance levels."""
-        # TODO: Model voluntary compliance, e-filing, enforcement impact etc.
-        # Example: Use a compliance factor derived from compliance_params config/state
-        compliance_factor = self.current_compliance_rate # Use internal state
-        final_revenue = collected_revenue * compliance_factor
-        print(f"Year {year}: Final Revenue after Compliance Adjustment: {final_revenue:.2f}")
-        return final_revenue
-
-    def _update_internal_state(self, year, economic_state, governance_state):
-        """Update internal state variables like compliance and admin efficiency for the next year."""
-        # TODO: Implement logic for how compliance/efficiency evolves over time
-        # This could depend on reforms (governance_state), investments, economic conditions etc.
-        # Example: Slight improvement based on governance index
-        if governance_state.get('nbr_modernization_level', 0) > self.current_admin_efficiency:
-             self.current_admin_efficiency = min(1.0, self.current_admin_efficiency * 1.01) # Improve by 1% capped at 1.0
-
-        # Example: Compliance improves slightly with GDP growth? (Needs better logic)
-        if economic_state.get('gdp_growth', 0) > 0.05:
-            self.current_compliance_rate = min(0.95, self.current_compliance_rate * 1.005) # Improve by 0.5% capped at 0.95
-
-        print(f"Year {year} End: Updated Admin Efficiency: {self.current_admin_efficiency:.3f}, Compliance Rate: {self.current_compliance_rate:.3f}")
-
-
-    def project_revenue(self, year, economic_state, governance_state):
-        """Projects total revenue for a given year based on inputs."""
-        # Note: Governance state influences admin capacity and compliance.
-        print(f"--- Projecting Revenue for Year {year} ---")
-
-        # 1. Calculate Tax Potential (Base)
-        potential = self._calculate_tax_potential(year, economic_state)
+        logger.info("RevenueModel Initialized")
 
-        # 2. Adjust for structural constraints (e.g., informal economy)
-        structurally_adjusted = self._apply_structural_constraints(year, potential, economic_state)
+    def project_revenue(self, year, state):
+        """Projects total revenue for a given year from the current SimState.
 
-        # 3. Adjust for administrative capacity (how much can be realistically collected)
-        admin_adjusted = self._apply_administrative_capacity(year, structurally_adjusted)
-
-        # 4. Adjust for taxpayer compliance behavior
-        final_revenue = self._apply_compliance_dynamics(year, admin_adjusted)
-
-        # 5. Update Internal State (Admin Capacity, Compliance)
-        self._update_internal_state(year, economic_state, governance_state)
-
-        print(f"--- Year {year} Final Projected Revenue: {final_revenue:.2f} ---")
+        The returned dict is owned by the model and overwritten on the next call.
+        """
+        # Note: Governance state influences admin capacity and compliance.
+        # TODO: Implement detailed calculations based on tax types (VAT, Income, Corp, Trade etc.)
+        # TODO: Implement impact of informality, sector composition, digital economy, agriculture taxation policy
+        # TODO: Model NBR modernization, audit capacity, IT systems, voluntary compliance, e-filing, enforcement
+        logger.debug("--- Projecting Revenue for Year %d ---", year)
+
+        # 1. Calculate Tax Potential (Base) from simplified tax bases
+        # 2-4. Adjust in one product for structural constraints (e.g., informal economy),
+        #      administrative capacity and taxpayer compliance behavior
+        # 5. Update Internal State: admin efficiency improves with NBR modernization, compliance with growth
+        gdp = state.gdp
+        imports = gdp * 0.2 # Trade tax base proxy, not yet linked to the external sector
+        admin_efficiency, compliance_rate = self.current_admin_efficiency, self.current_compliance_rate
+        (potential, final_revenue,
+         self.current_admin_efficiency, self.current_compliance_rate) = _revenue_step(
+            gdp, imports, state.gdp_growth, state.nbr_modernization_level,
+            self._per_gdp_coef, self._trade_tax_rate,
+            self.formal_sector_share, admin_efficiency, compliance_rate)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            # Intermediate stages are only reconstructed for the diagnostics
+            structurally_adjusted = potential * self.formal_sector_share
+            logger.debug("Year %d: Potential Revenue (Est.): %.2f", year, potential)
+            logger.debug("Year %d: Revenue after Structural Constraints: %.2f", year, structurally_adjusted)
+            logger.debug("Year %d: Revenue after Admin Capacity Adjustment: %.2f", year,
+                         structurally_adjusted * admin_efficiency)
+            logger.debug("Year %d: Final Revenue after Compliance Adjustment: %.2f", year, final_revenue)
+            logger.debug("Year %d End: Updated Admin Efficiency: %.3f, Compliance Rate: %.3f", year,
+                         self.current_admin_efficiency, self.current_compliance_rate)
+
+        logger.debug("--- Year %d Final Projected Revenue: %.2f ---", year, final_revenue)
         # Return the final projected revenue in a dictionary
-        return {'final_revenue': final_revenue}
+        self._out['final_revenue'] = final_revenue
+        return self._out
+
+    def project_revenue_batch(self, gdp, imports, gdp_growth, nbr_level, dtype=np.float64):
+        """Project revenue for many scenarios over a whole horizon, one vectorized step per year.
+
+        Applies the same rules as `project_revenue`, with admin efficiency and compliance
+        carried as one value per scenario, all starting from the model's current state;
+        the model's own state is not advanced. A single path can be passed as 1-D input.
+
+        Args:
+            gdp: Nominal GDP, shape (n_years,) or (n_scenarios, n_years).
+            imports: Imports, same shape as `gdp`.
+            gdp_growth: GDP growth, same shape as `gdp`.
+            nbr_level: NBR modernization level, same shape as `gdp`.
+            dtype: Floating-point type of the computation and the results. np.float32
+                halves memory traffic for large sweeps at about 1e-6 relative precision.
+
+        Returns:
+            Dict of arrays shaped like `gdp`: 'final_revenue', 'admin_efficiency' and
+            'compliance_rate' (the latter two as updated at the end of each year).
+        """
+        gdp = np.asarray(gdp, dtype=dtype)
+        gdp_growth = np.asarray(gdp_growth, dtype=dtype)
+        nbr_level = np.asarray(nbr_level, dtype=dtype)
+
+        # Collection rates before the end-of-year updates, filled in year by year
+        admin = np.full(gdp.shape[:-1], self.current_admin_efficiency, dtype=dtype)
+        compliance = np.full(gdp.shape[:-1], self.current_compliance_rate, dtype=dtype)
+        admin_hist = np.empty_like(gdp)
+        compliance_hist = np.empty_like(gdp)
+        final_revenue = self._calculate_tax_potential(gdp, np.asarray(imports, dtype=dtype))
+        final_revenue *= self.formal_sector_share
+        for t in range(gdp.shape[-1]):
+            final_revenue[..., t] *= admin
+            final_revenue[..., t] *= compliance
+            improving = nbr_level[..., t] > admin
+            np.multiply(admin, 1.01, out=admin, where=improving)
+            np.minimum(admin, 1.0, out=admin, where=improving)
+            growing = gdp_growth[..., t] > 0.05
+            np.multiply(compliance, 1.005, out=compliance, where=growing)
+            np.minimum(compliance, 0.95, out=compliance, where=growing)
+            admin_hist[..., t] = admin
+            compliance_hist[..., t] = compliance
+
+        return {
+            'final_revenue': final_revenue,
+            'admin_efficiency': admin_hist,
+            'compliance_rate': compliance_hist
+        }
+
+    def _calculate_tax_potential(self, gdp, imports):
+        """Tax potential for scalar or array `gdp` and `imports` (arrays broadcast elementwise)."""
+        return gdp * self._per_gdp_coef + imports * self._trade_tax_rate
@@ -1,5 +1,17 @@
+import logging
+import numpy as np
+from ._steps import _soe_step
+from ._kernels import run_soe_batch
+from ._cache import disk_memoize
+
+logger = logging.getLogger(__name__)
+
 class SOEModel:
     """Model State-Owned Enterprise performance and fiscal impact"""
+    __slots__ = ('config', 'initial_performance_index', 'initial_soe_debt_gdp',
+                 'gdp_growth_sensitivity', 'governance_sensitivity', 'debt_drag_factor',
+                 'dividend_payout_ratio', 'transfer_need_threshold', 'transfer_scale_factor',
+                 '_step_params', 'performance_index', 'soe_debt_stock', 'initialized')
     def __init__(self, config):
         """Initialize SOE parameters based on config."""
         self.config = config
@@ -11,92 +23,109 @@ class SOEModel:
         self.dividend_payout_ratio = config.get('soe_dividend_payout', 0.2) # Payout ratio if profitable
         self.transfer_need_threshold = config.get('soe_transfer_threshold', 0.3) # Performance below which transfers are likely
         self.transfer_scale_factor = config.get('soe_transfer_scale', 0.01) # Transfers needed scale with poor performance (as % of SOE Debt)
+        # Constant trailing arguments of _soe_step, packed once instead of read attribute by attribute every year
+        self._step_params = (self.initial_soe_debt_gdp, self.gdp_growth_sensitivity,
+                             self.governance_sensitivity, self.debt_drag_factor,
+                             self.dividend_payout_ratio, self.transfer_need_threshold,
+                             self.transfer_scale_factor)
 
         # Internal State
         self.performance_index = self.initial_performance_index
         self.soe_debt_stock = 0 # Will be initialized based on first year GDP
         self.initialized = False
 
-        print(f"SOEModel Initialized (Initial Perf: {self.performance_index:.2f}, Debt/GDP: {self.initial_soe_debt_gdp:.2%})")
+        logger.info("SOEModel Initialized (Initial Perf: %.2f, Debt/GDP: %.2f%%)",
+                    self.performance_index, self.initial_soe_debt_gdp * 100)
 
     def _initialize_debt(self, initial_gdp):
         """Set initial SOE debt based on initial GDP."""
         self.soe_debt_stock = self.initial_soe_debt_gdp * initial_gdp
         self.initialized = True
-        print(f"SOE Debt Initialized: {self.soe_debt_stock:.2f}")
+        logger.info("SOE Debt Initialized: %.2f", self.soe_debt_stock)
 
-    def _update_financial_performance(self, year, state):
-        """Simulate changes in SOE financial performance."""
+    def simulate_soe_sector(self, year, state):
+        """Project SOE financial health and fiscal impact for a given year from the current SimState."""
         # TODO: Model SOE reforms, pricing policies, sector-specific issues
-        gdp_growth = state.get('economic_state', {}).get('gdp_growth', 0.05)
-        # Use overall governance index as a proxy for oversight quality
-        governance_score = state.get('governance_state', {}).get('governance_index', 50) / 100 # Normalize 0-1
-        
-        # Performance changes based on growth, governance, and debt burden
-        performance_change = (self.gdp_growth_sensitivity * gdp_growth) + \
-                             (self.governance_sensitivity * (governance_score - 0.5)) # Relative to baseline governance
-        
-        # Debt drag - higher debt may reduce performance/increase costs
-        current_debt_gdp = self.soe_debt_stock / state.get('economic_state', {}).get('gdp', 1) if state.get('economic_state', {}).get('gdp', 0) > 0 else 0
-        performance_change += self.debt_drag_factor * (current_debt_gdp - self.initial_soe_debt_gdp) # Drag if debt ratio grows
-        
-        self.performance_index += performance_change
-        # Apply bounds (0.1 to 0.9)
-        self.performance_index = max(0.1, min(0.9, self.performance_index))
-        print(f"Year {year}: GDP Growth: {gdp_growth:.2%}, Gov Score: {governance_score:.2f}, SOE Perf Index: {self.performance_index:.3f}")
-
-    def _update_soe_debt(self, year, state, transfers_received, dividends_paid):
-        """Update SOE debt stock based on performance and fiscal flows."""
         # TODO: Model interest payments on SOE debt explicitly
-        # Simple: Assume poor performance leads to borrowing needs offset by transfers,
-        # and good performance allows some debt reduction after dividends.
-        implied_profit_loss = (self.performance_index - 0.5) * self.soe_debt_stock * 0.1 # Very crude proxy for profit/loss scale
-        
-        # Change in debt = -Profit/Loss + Transfers Received - Dividends Paid (assuming profit used for dividends/repayment)
-        debt_change = -implied_profit_loss + transfers_received - dividends_paid
-        self.soe_debt_stock += debt_change
-        self.soe_debt_stock = max(0, self.soe_debt_stock) # Cannot be negative
-        print(f"Year {year}: Implied P/L: {implied_profit_loss:.2f}, Transfers: {transfers_received:.2f}, Dividends: {dividends_paid:.2f}, SOE Debt: {self.soe_debt_stock:.2f}")
-
-    def _calculate_fiscal_impact(self, year, state):
-        """Calculate dividends paid to government or transfers needed from government."""
-        dividends = 0
-        transfers = 0
-        if self.performance_index > 0.55: # If reasonably profitable
-            # Calculate potential profit (again, crude proxy)
-            potential_profit = (self.performance_index - 0.5) * self.soe_debt_stock * 0.1
-            dividends = potential_profit * self.dividend_payout_ratio
-        elif self.performance_index < self.transfer_need_threshold: # If performing poorly
-            # Calculate required transfers based on how far below threshold
-            performance_gap = self.transfer_need_threshold - self.performance_index
-            transfers = performance_gap * self.transfer_scale_factor * self.soe_debt_stock
-            
-        print(f"Year {year}: Calculated SOE Dividends: {dividends:.2f}, Transfers Needed: {transfers:.2f}")
-        return dividends, transfers
-
-
-    def simulate_soe_sector(self, year, state):
-        """Project SOE financial health and fiscal impact for a given year."""
-        print(f"--- Simulating SOE Sector for Year {year} ---")
+        logger.debug("--- Simulating SOE Sector for Year %d ---", year)
+        gdp, gdp_growth, governance_index = state.gdp, state.gdp_growth, state.governance_index
 
         if not self.initialized:
-            initial_gdp = state.get('economic_state', {}).get('gdp', 0)
-            if initial_gdp > 0:
-                self._initialize_debt(initial_gdp)
+            if gdp > 0:
+                self._initialize_debt(gdp)
             else:
-                print("Warning: Cannot initialize SOE debt, GDP not available in state.")
+                logger.warning("Cannot initialize SOE debt, GDP not available in state.")
                 return 0, 0, 0 # Return zero impact if not initialized
 
-        # 1. Update financial performance
-        self._update_financial_performance(year, state)
-
-        # 2. Calculate potential fiscal impact (dividends/transfers)
-        dividends, transfers = self._calculate_fiscal_impact(year, state)
+        # 1. Update financial performance from growth, governance (overall index as a proxy for
+        #    oversight quality) and the debt burden, bounded to 0.1-0.9
+        # 2. Calculate fiscal impact: dividends if reasonably profitable, transfers if performing poorly
+        # 3. Update SOE debt stock: -Profit/Loss + Transfers Received - Dividends Paid, floored at 0
+        previous_debt = self.soe_debt_stock
+        self.performance_index, self.soe_debt_stock, dividends, transfers = _soe_step(
+            self.performance_index, previous_debt, gdp, gdp_growth, governance_index, *self._step_params)
 
-        # 3. Update SOE debt stock based on performance and fiscal flows
-        self._update_soe_debt(year, state, transfers, dividends)
+        if logger.isEnabledFor(logging.DEBUG):
+            implied_profit_loss = (self.performance_index - 0.5) * previous_debt * 0.1 # Very crude proxy for profit/loss scale
+            logger.debug("Year %d: GDP Growth: %.2f%%, Gov Score: %.2f, SOE Perf Index: %.3f", year,
+                         gdp_growth * 100, governance_index / 100, self.performance_index)
+            logger.debug("Year %d: Calculated SOE Dividends: %.2f, Transfers Needed: %.2f", year, dividends, transfers)
+            logger.debug("Year %d: Implied P/L: %.2f, Transfers: %.2f, Dividends: %.2f, SOE Debt: %.2f", year,
+                         implied_profit_loss, transfers, dividends, self.soe_debt_stock)
 
-        print(f"--- Year {year} SOE Simulation Complete ---")
+        logger.debug("--- Year %d SOE Simulation Complete ---", year)
 
         # Return fiscal impact and SOE debt level
         return dividends, transfers, self.soe_debt_stock
+
+    def _cache_key(self):
+        """Parameters and state the batch projection depends on (see _cache.disk_memoize)."""
+        return (self.initial_performance_index, self._step_params, self.performance_index,
+                self.soe_debt_stock, self.initialized)
+
+    @disk_memoize('soe')
+    def simulate_soe_sector_batch(self, gdp_growth, governance_index, gdp, dtype=np.float64):
+        """Project SOE performance, fiscal flows and debt over a whole horizon in one pass.
+
+        Applies the same rules as `simulate_soe_sector` year after year, starting from the
+        model's current state (debt initialized from the first year's GDP if needed),
+        without advancing the model's own state. Several scenarios can be projected at once
+        by passing 2-D inputs; the scenarios then run in parallel in one compiled kernel.
+        Results are reused across runs when SIM_CACHE_DIR is set (see _cache).
+
+        Args:
+            gdp_growth: GDP growth in each year, shape (N,) or (n_scenarios, N).
+            governance_index: Governance index (0-100 scale), same shape as `gdp_growth`.
+            gdp: Nominal GDP, same shape as `gdp_growth`.
+            dtype: Floating-point type of the computation and the results.
+
+        Returns:
+            Dict of arrays shaped like `gdp_growth`: 'performance_index', 'dividends',
+            'transfers' and 'soe_debt_stock'.
+        """
+        gdp = np.asarray(gdp, dtype=dtype)
+        shape = gdp.shape
+        # The kernel works on (n_scenarios, n_years); a single path is one scenario
+        gdp = gdp.reshape(-1, shape[-1])
+        gdp_growth = np.asarray(gdp_growth, dtype=dtype).reshape(gdp.shape)
+        governance_index = np.asarray(governance_index, dtype=dtype).reshape(gdp.shape)
+        if self.initialized:
+            debt = np.full(gdp.shape[0], self.soe_debt_stock, dtype=dtype)
+        else:
+            debt = self.initial_soe_debt_gdp * gdp[:, 0]
+        perf = np.full(gdp.shape[0], self.performance_index, dtype=dtype)
+
+        perf_hist = np.empty_like(gdp)
+        dividends = np.empty_like(gdp)
+        transfers = np.empty_like(gdp)
+        debt_hist = np.empty_like(gdp)
+        # Serial over years (the debt drag feeds on last year's debt), parallel over scenarios
+        run_soe_batch(perf, debt, gdp_growth, governance_index, gdp, *self._step_params,
+                      perf_hist, debt_hist, dividends, transfers)
+
+        return {
+            'performance_index': perf_hist.reshape(shape),
+            'dividends': dividends.reshape(shape),
+            'transfers': transfers.reshape(shape),
+            'soe_debt_stock': debt_hist.reshape(shape)
+        }
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class SimState:
+    """Flat, typed view of the per-year quantities the sector models read, plus the
+    aggregates the simulation driver computes itself.
+
+    The simulation driver owns a single instance and updates its fields in place as
+    each year's values become available, so models read plain attributes instead of
+    dict lookups, and nothing is copied between years.
+    """
+    gdp: float = 0.0 # Nominal GDP for the current year
+    gdp_growth: float = 0.05 # Nominal GDP growth rate
+    inflation: float = 0.07 # Inflation rate for the current year
+    nominal_gdp_growth: float = 0.1235 # (1 + gdp_growth) * (1 + inflation) - 1, derived once per year by the driver
+    governance_index: float = 50.0 # Overall governance index (0-100 scale)
+    pfm_reform_level: float = 0.4 # PFM reform level (0-1), proxy for absorption capacity
+    central_bank_capacity: float = 0.6 # Central bank capacity (0-1)
+    nbr_modernization_level: float = 0.0 # NBR (tax administration) capacity level (0-1)
+    supervision_effectiveness: float = 0.7 # Financial supervision effectiveness (0-1)
+    npl_ratio: float = 0.11 # Latest banking sector NPL ratio
+    final_revenue: float = 0.0 # Central government revenue before transfers
+    total_revenue: float = 0.0 # Total government revenue for the current year
+    deficit: float = 0.0 # Overall fiscal deficit for the current year
+    # Driver aggregates, not read by the sector models
+    real_gdp_growth: float = 0.0 # Real GDP growth for the current year
+    projected_inflation: float | None = None # Monetary policy's inflation projection for the next year
+    policy_rate: float = 0.0 # Policy rate set for the current year
+    revenue_for_central_gov: float = 0.0 # Central revenue net of transfers to subnational governments
+    central_expenditure: float = 0.0 # Realized central government spending
+    total_expenditure: float = 0.0 # Central spending plus transfers to SOEs
+    soe_performance_index: float = 0.0 # SOE financial performance index (0-1)
+    soe_dividends: float = 0.0 # SOE dividends paid to the government
+    soe_transfers_needed: float = 0.0 # Government transfers to loss-making SOEs
+    soe_debt_stock: float = 0.0 # Aggregate SOE debt stock
+    primary_deficit: float = 0.0 # Deficit excluding interest payments
+    debt_stock_total: float = 0.0 # Public debt stock at year end
+    debt_stock_domestic: float = 0.0 # Domestic part of debt_stock_total
+    debt_stock_external: float = 0.0 # External part of debt_stock_total
+    coordination_score: float = 0.0 # Fiscal-monetary policy coordination score
@@ -1,5 +1,13 @@
+import logging
+import numpy as np
+from ._steps import _supervision_step
+
+logger = logging.getLogger(__name__)
+
 class SupervisionModel:
     """Model financial sector regulatory framework and implementation"""
+    __slots__ = ('config', 'base_effectiveness', 'cb_capacity_weight', 'financial_stability_weight',
+                 'regulatory_reform_impact', '_step_params', 'current_effectiveness')
     def __init__(self, config):
         """Initialize supervision parameters based on config."""
         self.config = config
@@ -7,49 +15,71 @@ class SupervisionModel:
         self.cb_capacity_weight = config.get('cb_capacity_weight', 0.5) # How much CB capacity matters
         self.financial_stability_weight = config.get('financial_stability_weight', 0.3) # How much sector stability matters
         self.regulatory_reform_impact = config.get('regulatory_reform_impact', 0.01) # Small annual boost for ongoing reforms (placeholder)
+        # Constant trailing arguments of _supervision_step, packed once
+        self._step_params = (self.cb_capacity_weight, self.financial_stability_weight,
+                             self.regulatory_reform_impact)
 
         # Internal State
         self.current_effectiveness = self.base_effectiveness
-        print(f"SupervisionModel Initialized (Effectiveness: {self.current_effectiveness:.2f})")
+        logger.info("SupervisionModel Initialized (Effectiveness: %.2f)", self.current_effectiveness)
 
-    def _update_effectiveness(self, year, state):
-        """Simulate changes in supervision effectiveness."""
+    def simulate_supervision_effectiveness(self, year, state):
+        """Project supervision outcomes and financial system health for a given year from the current SimState."""
         # TODO: Model specific supervisory tools, Basel implementation, AML/CFT, Fintech regulation
-        
-        # Factor 1: Central Bank Capacity (from Governance Model)
-        cb_capacity = state.get('governance_state', {}).get('central_bank_capacity', 0.6)
-        
-        # Factor 2: Financial Sector Stability (using NPL as inverse proxy - lower NPL implies higher stability score)
-        # High NPL might strain supervisory resources or indicate past failures
-        npl_ratio = state.get('npl_ratio', 0.11) 
-        stability_proxy = max(0, 1 - (npl_ratio / 0.25)) # Score 1 if NPL=0, 0 if NPL=25%+
+        logger.debug("--- Simulating Supervision Effectiveness for Year %d ---", year)
 
-        # Calculate target effectiveness based on weighted factors
-        target_effectiveness = (self.cb_capacity_weight * cb_capacity) + \
-                               (self.financial_stability_weight * stability_proxy)
-        # Adjust the weightings if they don't sum close to 1, or normalize if needed
-        # For simplicity, assume weights reflect relative importance
-        
-        # Add a small base improvement for ongoing reforms
-        target_effectiveness += self.regulatory_reform_impact
+        # 1. Update the effectiveness score: move gradually (smoothing/inertia) towards a target
+        #    weighing central bank capacity (from Governance Model), financial sector stability
+        #    (NPL ratio as inverse proxy) and a small base improvement for ongoing reforms,
+        #    bounded to 0.2-0.95
+        cb_capacity = state.central_bank_capacity
+        self.current_effectiveness, stability_proxy = _supervision_step(
+            self.current_effectiveness, cb_capacity, state.npl_ratio, *self._step_params)
+        logger.debug("Year %d: CB Capacity: %.2f, Stability Proxy: %.2f, Updated Supervision Effectiveness: %.3f", year,
+                     cb_capacity, stability_proxy, self.current_effectiveness)
 
-        # Gradually move current effectiveness towards target
-        self.current_effectiveness = self.current_effectiveness * 0.9 + target_effectiveness * 0.1 # Smoothing/inertia
+        logger.debug("--- Year %d Supervision Simulation Complete ---", year)
 
-        # Apply bounds (0.2 to 0.95)
-        self.current_effectiveness = max(0.2, min(0.95, self.current_effectiveness))
+        # Return the calculated effectiveness score for use in other models (e.g., FinancialSector)
+        return self.current_effectiveness
 
-        print(f"Year {year}: CB Capacity: {cb_capacity:.2f}, Stability Proxy: {stability_proxy:.2f}, Updated Supervision Effectiveness: {self.current_effectiveness:.3f}")
+    def simulate_supervision_effectiveness_batch(self, central_bank_capacity, npl_ratio, dtype=np.float64):
+        """Project supervision effectiveness over a whole horizon in one pass.
 
+        Applies the same rules as `simulate_supervision_effectiveness` year after year,
+        starting from the current effectiveness, without advancing the model's own state.
+        Independent scenarios can be projected at once by passing 2-D inputs; each year is
+        then one set of elementwise updates across all scenarios.
 
-    def simulate_supervision_effectiveness(self, year, state):
-        """Project supervision outcomes and financial system health for a given year."""
-        print(f"--- Simulating Supervision Effectiveness for Year {year} ---")
+        Args:
+            central_bank_capacity: Central bank capacity (0-1) in each year, shape (N,) or
+                (n_scenarios, N).
+            npl_ratio: Banking sector NPL ratio, same shape as `central_bank_capacity`.
+            dtype: Floating-point type of the computation and the results.
 
-        # 1. Update the effectiveness score based on relevant state variables
-        self._update_effectiveness(year, state)
+        Returns:
+            Dict of arrays shaped like `central_bank_capacity`: 'supervision_effectiveness'
+            and 'stability_proxy'.
+        """
+        cb_capacity = np.asarray(central_bank_capacity, dtype=dtype)
+        npl_ratio = np.asarray(npl_ratio, dtype=dtype)
 
-        print(f"--- Year {year} Supervision Simulation Complete ---")
+        # Neither the stability proxy nor the target depends on the state, so both are computed for all years at once
+        stability = np.maximum(0.0, 1 - (npl_ratio / 0.25))
+        target = ((self.cb_capacity_weight * cb_capacity) + (self.financial_stability_weight * stability)
+                  + self.regulatory_reform_impact)
+        target *= 0.1
 
-        # Return the calculated effectiveness score for use in other models (e.g., FinancialSector)
-        return self.current_effectiveness
+        effectiveness = np.empty_like(target)
+        eff = np.full(target.shape[:-1], self.current_effectiveness, dtype=dtype)
+        # The smoothing feeds on last year's effectiveness, so it stays serial over years
+        for t in range(target.shape[-1]):
+            eff *= 0.9
+            eff += target[..., t]
+            np.clip(eff, 0.2, 0.95, out=eff)
+            effectiveness[..., t] = eff
+
+        return {
+            'supervision_effectiveness': effectiveness,
+            'stability_proxy': stability
+        }
@@ -2,6 +2,10 @@ import pandas as pd
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
 import datetime
+import functools
+import hashlib
+import importlib.util
+import os
 import numpy as np
 import logging
 
@@ -9,17 +13,58 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 # Custom filter for Jinja2 to format numbers nicely
 def format_number(value):
-    if isinstance(value, (int, float)):
-        if np.isnan(value):
-            return 'N/A'
-        if abs(value) < 0.01 and abs(value) > 0: # Small numbers in sci notation
-            return f"{value:.2e}"
-        if abs(value) >= 1e6: # Large numbers in sci notation
-             return f"{value:.2e}"
-        if isinstance(value, float):
-            return f"{value:,.3f}" # Floats with 3 decimal places
-        return f"{value:,}" # Integers with commas
-    return value # Return as is if not a number
+    if not isinstance(value, (int, float)):
+        return value # Return as is if not a number
+    if value != value: # NaN, without a numpy call per value
+        return 'N/A'
+    magnitude = abs(value)
+    if 0 < magnitude < 0.01 or magnitude >= 1e6: # Small and large numbers in sci notation
+        return f"{value:.2e}"
+    if isinstance(value, float):
+        return f"{value:,.3f}" # Floats with 3 decimal places
+    return f"{value:,}" # Integers with commas
+
+def _format_summary(row: pd.Series) -> dict:
+    """Format a row of results for display, applying format_number's rules to all values at once.
+
+    Missing values become 'N/A' and non-numeric values are passed through unchanged.
+    """
+    raw = row.to_numpy()
+    values = pd.to_numeric(raw, errors='coerce').astype(float, copy=False)
+    missing = np.isnan(values)
+    magnitude = np.abs(values)
+    scientific = ~missing & (((magnitude < 0.01) & (magnitude > 0)) | (magnitude >= 1e6))
+    formatted = raw.astype(object)
+    formatted[missing & pd.isna(raw)] = 'N/A'
+    formatted[scientific] = np.char.mod('%.2e', values[scientific])
+    plain = ~missing & ~scientific
+    formatted[plain] = [f"{value:,.3f}" for value in values[plain].tolist()]
+    return dict(zip(row.index.tolist(), formatted.tolist()))
+
+@functools.lru_cache(maxsize=8)
+def _get_template(template_dir: str, template_name: str):
+    """Load and compile a report template once per (directory, name).
+
+    Returns (template, source_digest), the digest being that of the source actually
+    compiled. The file is not re-read automatically when it changes on disk; callers
+    check `template.is_up_to_date` and call _get_template.cache_clear() to pick up edits.
+    """
+    env = Environment(loader=FileSystemLoader(template_dir), auto_reload=False, cache_size=64)
+    env.filters['format_number'] = format_number # Add custom filter
+    # Compile from the same source that is hashed, so the digest always matches the template
+    source, filename, uptodate = env.loader.get_source(env, template_name)
+    code = env.compile(source, template_name, filename)
+    template = env.template_class.from_code(env, code, env.make_globals(None), uptodate)
+    return template, hashlib.blake2b(source.encode(), digest_size=20).hexdigest()
+
+def _report_key(results_df: pd.DataFrame, plot_files: dict, plot_titles: dict, template_digest: str) -> str:
+    """Digest of everything the rendered report depends on, except the generation date."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(repr(results_df.columns.tolist()).encode())
+    h.update(pd.util.hash_pandas_object(results_df, index=True).to_numpy().tobytes())
+    h.update(repr((sorted(plot_files.items()), sorted(plot_titles.items()))).encode())
+    h.update(template_digest.encode())
+    return h.hexdigest()
 
 def generate_html_report(results_df: pd.DataFrame,
                          plot_files: dict,
@@ -37,18 +82,26 @@ def generate_html_report(results_df: pd.DataFrame,
         template_name: Filename of the Jinja2 template.
         output_path: Path object for the output HTML report file.
     """
-    logging.info(f"Generating HTML report at: {output_path}")
+    logging.info("Generating HTML report at: %s", output_path)
 
-    env = Environment(loader=FileSystemLoader(template_dir))
-    env.filters['format_number'] = format_number # Add custom filter
-    template = env.get_template(template_name)
+    template, template_digest = _get_template(str(template_dir), template_name)
+    if not template.is_up_to_date: # Edited on disk since it was compiled
+        _get_template.cache_clear()
+        template, template_digest = _get_template(str(template_dir), template_name)
+
+    # Re-running on identical results, plots and template would only rewrite the same page
+    report_key = _report_key(results_df, plot_files, plot_titles, template_digest)
+    key_path = output_path.with_name(output_path.name + '.hash')
+    if output_path.exists() and key_path.exists() and key_path.read_text() == report_key:
+        logging.info("Report inputs unchanged, keeping the existing report.")
+        return
 
     # Prepare data for the template
     start_year = results_df.index.min()
     end_year = results_df.index.max()
 
-    # Get summary for the final year, handling potential NaNs
-    final_year_summary = results_df.loc[end_year].fillna('N/A').to_dict()
+    # Get summary for the final year, formatted for display ('N/A' for missing values)
+    final_year_summary = _format_summary(results_df.loc[end_year])
 
     context = {
         'start_year': start_year,
@@ -59,37 +112,49 @@ def generate_html_report(results_df: pd.DataFrame,
         'generation_date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
 
-    # Render the template
+    # Render the template straight into the file, chunk by chunk, instead of building the
+    # whole page in memory first. A partial page goes to a temporary file, so a failed
+    # render never replaces an existing report.
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
     try:
-        html_content = template.render(context)
-
-        # Save the rendered HTML
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            template.stream(context).dump(f)
+        os.replace(tmp_path, output_path)
+        key_path.write_text(report_key)
         logging.info("HTML report generated successfully.")
 
     except Exception as e:
-        logging.error(f"Failed to generate HTML report: {e}")
+        logging.error("Failed to generate HTML report: %s", e)
+        tmp_path.unlink(missing_ok=True)
 
 # Example usage (if run directly, assuming results exist)
 if __name__ == '__main__':
     # This is placeholder logic for testing the reporting script directly
     # In practice, this will be called by the main simulation script
     project_root = Path(__file__).parent.parent
-    results_file = project_root / 'results' / 'simulation_output.csv'
+    # The simulation writes Parquet when pyarrow is installed and CSV otherwise
+    results_file = project_root / 'results' / 'simulation_output.parquet'
+    if not results_file.exists():
+        results_file = results_file.with_suffix('.csv')
     template_dir = project_root / 'templates'
     output_html = project_root / 'results' / 'simulation_report.html'
     plots_dir = project_root / 'results' / 'plots'
 
     if results_file.exists():
-        logging.info(f"Loading results from {results_file} for standalone report generation.")
-        df = pd.read_csv(results_file, index_col=0)
+        logging.info("Loading results from %s for standalone report generation.", results_file)
+        if results_file.suffix == '.parquet':
+            df = pd.read_parquet(results_file)
+        else:
+            # Prefer pyarrow's multithreaded parser when it is installed
+            csv_engine = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+            df = pd.read_csv(results_file, index_col=0, engine=csv_engine)
 
         # Assume plots exist (or call visualization script first in a real scenario)
         # For this example, we just list potential plot files
         from visualization import KEY_VARIABLES # Import for titles
-        example_plot_files = {var: f"plots/{var}.png" for var in KEY_VARIABLES if (plots_dir / f"{var}.png").exists()}
+        existing_plots = {entry.name for entry in os.scandir(plots_dir) if entry.is_file()} if plots_dir.is_dir() else set()
+        example_plot_files = {var: f"plots/{var}.png" for var in KEY_VARIABLES if f"{var}.png" in existing_plots}
 
         generate_html_report(
             results_df=df,
@@ -100,4 +165,4 @@ if __name__ == '__main__':
             output_path=output_html
         )
     else:
-        logging.warning(f"Results file {results_file} not found. Cannot generate standalone report.")
+        logging.warning("Results file %s not found. Cannot generate standalone report.", results_file)
@@ -3,12 +3,18 @@
 import yaml
 import pandas as pd
 import numpy as np
+import hashlib
+import importlib.util
+import itertools
+from operator import itemgetter
 import os
+import pickle
 from pathlib import Path
 from .visualization import generate_plots, KEY_VARIABLES
 from .reporting import generate_html_report
 import logging
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Import all model classes
 from .models.revenue import RevenueModel
@@ -23,27 +29,93 @@ from .models.soe import SOEModel
 from .models.external_sector import ExternalSectorModel
 from .models.fiscal_federalism import FiscalFederalismModel
 from .models.development_finance import DevelopmentFinanceModel
+from .models.state import SimState
+from .models._cache import disk_memoize
+from .models._steps import _economic_step
+from .utils.shocks import ShockSchedule
+
+logger = logging.getLogger(__name__)
+
+# Results are saved as Parquet when pyarrow is installed, as CSV otherwise
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def load_config(config_path):
+    """Load the YAML configuration, reusing a pickled copy while the YAML is unchanged.
+
+    The parsed config is cached next to the file as <config>.pkl together with a digest of
+    the YAML it was parsed from, and reused only while the YAML's content still has that
+    digest (file timestamps are not trusted: copies and extracts can carry older ones).
+    Failing to write the cache (e.g. a read-only config directory) is not an error.
+    """
+    config_path = Path(config_path)
+    cache_path = config_path.with_name(config_path.name + '.pkl')
+    yaml_bytes = config_path.read_bytes() # Raises FileNotFoundError for a missing config
+    digest = hashlib.blake2b(yaml_bytes, digest_size=20).hexdigest()
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == digest:
+            return cached[1]
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass # No usable cache, parse the YAML
+
+    config = yaml.load(yaml_bytes, Loader=_YAML_LOADER)
+    try:
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((digest, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path) # Atomic, so concurrent runs never read a partial file
+    except OSError as e:
+        logger.warning("Could not cache parsed configuration at %s: %s", cache_path, e)
+    return config
+
+# Columns of the results table, one row per simulated year (see _store_results)
+RESULT_COLUMNS = (
+    'GDP', 'GDP_Growth', 'Inflation', 'Total_Revenue', 'Central_Revenue', 'Revenue_GDP',
+    'Total_Expenditure', 'Central_Expenditure', 'Expenditure_GDP', 'Overall_Deficit',
+    'Primary_Deficit', 'Overall_Deficit_GDP', 'Primary_Deficit_GDP', 'Debt_Stock_Total',
+    'Debt_Stock_Domestic', 'Debt_Stock_External', 'Debt_Stock_GDP', 'Debt_Service',
+    'Interest_Payments', 'DSA_Debt_GDP_Ratio', 'DSA_Service_Revenue_Ratio', 'Exports', 'Imports',
+    'Remittances', 'FDI', 'CAB_GDP', 'FX_Reserves_Months', 'Governance_Index', 'PFM_Score',
+    'NBR_Score', 'AC_Score', 'Accountability_Score', 'Financial_Stability_Index', 'NPL_Ratio',
+    'CAR_Ratio', 'Policy_Rate', 'Supervision_Effectiveness', 'SOE_Performance', 'SOE_Debt_GDP',
+    'Subnational_Own_Revenue', 'Subnational_Debt', 'Grant_Receipts', 'DFI_Lending',
+    'Expenditure_Efficiency', 'Policy_Coordination_Score',
+)
+
+_NAN = np.nan # Default of the state lookups in _store_results
+# NPL ratio, CAR and stability index from the financial sector model's outputs, in one call
+_financial_fields = itemgetter('npl_ratio', 'capital_adequacy_ratio', 'stability_index')
+
+# Result columns expressed as a share of GDP (see _finalize_results)
+GDP_RATIO_COLUMNS = ('Revenue_GDP', 'Expenditure_GDP', 'Overall_Deficit_GDP', 'Primary_Deficit_GDP',
+                     'Debt_Stock_GDP', 'CAB_GDP', 'SOE_Debt_GDP')
+_GDP_COLUMN = RESULT_COLUMNS.index('GDP')
+_GDP_RATIO_INDEX = [RESULT_COLUMNS.index(col) for col in GDP_RATIO_COLUMNS]
 
 class BangladeshPublicFinanceSimulation:
     def __init__(self, config_path):
         """Initializes the simulation environment.
 
         Args:
-            config_path (str or Path): Path to the configuration YAML file.
+            config_path (str, Path or dict): Path to the configuration YAML file, or an
+                already loaded configuration.
         """
-        print("Initializing Simulation...")
+        logger.info("Initializing Simulation...")
         try:
-            with open(config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
-            print("Configuration loaded.")
+            self.config = config_path if isinstance(config_path, dict) else load_config(config_path)
+            logger.info("Configuration loaded.")
         except FileNotFoundError:
-            logging.error(f"Configuration file not found at: {config_path}")
+            logger.error("Configuration file not found at: %s", config_path)
             sys.exit(1)
         except yaml.YAMLError as e:
-            logging.error(f"Error parsing configuration file: {e}")
+            logger.error("Error parsing configuration file: %s", e)
             sys.exit(1)
         except Exception as e:
-            logging.error(f"An unexpected error occurred loading configuration: {e}")
+            logger.error("An unexpected error occurred loading configuration: %s", e)
             sys.exit(1)
 
         # Extract simulation parameters
@@ -51,286 +123,389 @@ class BangladeshPublicFinanceSimulation:
         self.end_year = self.config['simulation']['end_year']
         self.years = range(self.start_year, self.end_year + 1)
 
+        # Constants of the yearly macro update, read once
+        self._base_real_gdp_growth = self.config['simulation']['base_real_gdp_growth']
+        self._inflation_persistence = self.config['simulation']['inflation_persistence']
+        self._initial_inflation = self.config['simulation']['initial_inflation']
+
+        # Draw all random shocks for the run up front
+        self.shocks = ShockSchedule(self.start_year, self.end_year, seed=self.config['simulation'].get('seed'))
+
         # Initialize Models
-        print("Initializing models...")
+        logger.info("Initializing models...")
         self.revenue_model = RevenueModel(self.config['revenue_model'])
         self.expenditure_model = ExpenditureModel(self.config['expenditure_model'])
         self.debt_model = DebtManagementModel(self.config['debt_model'])
         self.financial_sector_model = FinancialSectorModel(self.config['financial_sector'])
         self.monetary_policy_model = MonetaryPolicyModel(self.config['monetary_policy'])
         self.policy_coord_model = PolicyCoordinationModel(self.config['policy_coordination'])
-        self.governance_model = GovernanceModel(self.config['governance_model'])
+        self.governance_model = GovernanceModel(self.config['governance_model'], n_years=len(self.years))
         self.supervision_model = SupervisionModel(self.config['supervision_model'])
         self.soe_model = SOEModel(self.config['soe_model'])
-        self.external_sector_model = ExternalSectorModel(self.config['external_sector'])
+        self.external_sector_model = ExternalSectorModel(self.config['external_sector'], shocks=self.shocks)
         self.fiscal_federalism_model = FiscalFederalismModel(self.config['fiscal_federalism'])
-        self.dev_finance_model = DevelopmentFinanceModel(self.config['development_finance'])
-        print("All models initialized.")
+        self.dev_finance_model = DevelopmentFinanceModel(self.config['development_finance'], shocks=self.shocks)
+        logger.info("All models initialized.")
 
         # Initialize Simulation State
         self.state = self._initialize_state()
+        # The sector models' output dicts, merged under their own keys
+        self.outputs = {}
         
-        # Results Storage
-        self.results = {}
-        print("Simulation initialized successfully.")
+        # Results Storage: one preallocated row per year, columns as RESULT_COLUMNS
+        self.results = np.full((len(self.years), len(RESULT_COLUMNS)), np.nan)
+        logger.info("Simulation initialized successfully.")
 
     def _initialize_state(self):
-        """Initialize the state dictionary for the first year."""
-        print("Initializing simulation state...")
-        state = {
-            'economic_state': {
-                'gdp': self.config['simulation']['initial_gdp'],
-                'gdp_growth': self.config['simulation']['initial_gdp_growth'],
-                'real_gdp_growth': self.config['simulation']['base_real_gdp_growth'], # Start with base
-            },
-            'inflation': self.config['simulation']['initial_inflation'],
+        """Initialize the simulation state for the first year.
+
+        The state is a single SimState updated in place each year; the sector models read
+        their inputs from it as plain attributes.
+        """
+        logger.info("Initializing simulation state...")
+        sim_config = self.config['simulation']
+        state = SimState(
+            gdp=sim_config['initial_gdp'],
+            gdp_growth=sim_config['initial_gdp_growth'],
+            real_gdp_growth=sim_config['base_real_gdp_growth'], # Start with base
+            inflation=sim_config['initial_inflation'],
             # Add initial states from models where necessary (though many initialize internally)
-            'debt_stock': self.config['debt_model']['initial_debt_gdp_ratio'] * self.config['simulation']['initial_gdp'],
-            'npl_ratio': self.config['financial_sector']['initial_npl_ratio'],
-            'fx_reserves': 0, # Will be set by external sector model init
-            'soe_debt_stock': 0, # Will be set by SOE model init
-            # Placeholder for model outputs from the previous year
-            'governance_state': {},
-            'revenue_state': {},
-            'expenditure_state': {},
-            'debt_state': {},
-            'financial_sector_state': {},
-            'monetary_policy_state': {},
-            'policy_coordination_state': {},
-            'supervision_state': {},
-            'soe_state': {},
-            'external_sector_state': {},
-            'fiscal_federalism_state': {},
-            'dev_finance_state': {},
-            # Fiscal aggregates needed across models
-            'deficit': 0,
-            'primary_deficit': 0, 
-        }
-        print(f"Initial State: GDP={state['economic_state']['gdp']}, Inflation={state['inflation']}, Debt={state['debt_stock']}")
+            debt_stock_total=self.config['debt_model']['initial_debt_gdp_ratio'] * sim_config['initial_gdp'],
+            npl_ratio=self.config['financial_sector']['initial_npl_ratio'],
+            # SOE debt and the fiscal aggregates start at zero until the models set them
+        )
+        logger.info("Initial State: GDP=%s, Inflation=%s, Debt=%s", state.gdp, state.inflation,
+                    state.debt_stock_total)
         return state
 
     def _update_economic_state(self, year):
         """Update basic macroeconomic variables like GDP and inflation."""
         # TODO: Make this more sophisticated - link growth to investment, external demand etc.
-        # Simple GDP projection: Base real growth + adjustment based on previous year dynamics (if any)
-        prev_real_growth = self.state['economic_state'].get('real_gdp_growth', self.config['simulation']['base_real_gdp_growth'])
-        # Add some volatility or link to other factors later
-        current_real_growth = self.config['simulation']['base_real_gdp_growth'] * (1 + np.random.normal(0, 0.05)) # Add noise
-        
+        # Simple GDP projection: base real growth with some volatility (link to other factors later)
+        state = self.state
+        growth_noise = self.shocks.get('gdp_growth_noise', year)
+
         # Simple inflation projection: Persistence + impact from monetary policy
-        prev_inflation = self.state['inflation']
-        monetary_policy_effect = self.state['monetary_policy_state'].get('projected_inflation_impact', 0) # How much MP affects this year's inflation
         # Projected inflation from monetary policy is for the *next* period, so we use previous state's projection if available
-        if 'projected_inflation' in self.state['monetary_policy_state']:
-             base_inflation = self.state['monetary_policy_state']['projected_inflation']
+        if state.projected_inflation is not None:
+            base_inflation = state.projected_inflation
         else:
-             base_inflation = prev_inflation * self.config['simulation']['inflation_persistence'] + \
-                              (1 - self.config['simulation']['inflation_persistence']) * self.config['simulation']['initial_inflation'] # Revert to mean initially
-        
-        current_inflation = base_inflation # Incorporate MP effects here or directly in projection logic
-        current_inflation = max(0.01, min(0.15, current_inflation)) # Bounds
-        
-        # Update GDP (Nominal)
-        prev_gdp = self.state['economic_state']['gdp']
-        current_gdp = prev_gdp * (1 + current_real_growth) * (1 + current_inflation)
-        gdp_growth = (current_gdp / prev_gdp - 1) if prev_gdp > 0 else 0
+            base_inflation = state.inflation * self._inflation_persistence + \
+                             (1 - self._inflation_persistence) * self._initial_inflation # Revert to mean initially
+
+        # Nominal GDP from real growth and bounded inflation
+        current_gdp, gdp_growth, current_real_growth, current_inflation = _economic_step(
+            state.gdp, base_inflation, self._base_real_gdp_growth, growth_noise)
+
+        state.gdp = current_gdp
+        state.gdp_growth = gdp_growth
+        state.real_gdp_growth = current_real_growth
+        state.inflation = current_inflation
+        # Derived once here so every model scaling with it uses the same definition
+        state.nominal_gdp_growth = (1 + gdp_growth) * (1 + current_inflation) - 1
         
-        self.state['economic_state']['gdp'] = current_gdp
-        self.state['economic_state']['gdp_growth'] = gdp_growth
-        self.state['economic_state']['real_gdp_growth'] = current_real_growth
-        self.state['inflation'] = current_inflation
-        self.state['economic_state']['inflation_rate'] = current_inflation
-        
-        print(f"Year {year} Economic Update: Real Growth={current_real_growth:.2%}, Inflation={current_inflation:.2%}, GDP={current_gdp:.1f}")
+        logger.debug("Year %d Economic Update: Real Growth=%.2f%%, Inflation=%.2f%%, GDP=%.1f", year,
+                     current_real_growth * 100, current_inflation * 100, current_gdp)
+
+    def _publish(self, outputs, sim_fields=()):
+        """Merge a model's outputs into self.outputs and copy `sim_fields` of them onto the state.
+
+        Most models overwrite their output dict on the next call, so the values are copied rather
+        than the dict kept.
+        """
+        self.outputs.update(outputs)
+        for field in sim_fields:
+            setattr(self.state, field, outputs[field])
 
     def run_single_year(self, year):
         """Run all models for a single year."""
-        print(f"\n===== Running Simulation for Year {year} =====")
+        logger.debug("===== Running Simulation for Year %d =====", year)
+        state = self.state
         
         # 0. Update basic economic state (GDP, Inflation)
         self._update_economic_state(year)
         
         # --- Run Models (Order Matters!) ---
         # 1. Governance (Influences many others)
-        gov_outputs = self.governance_model.simulate_governance_evolution(year, self.state)
-        self.state['governance_state'] = gov_outputs
-        self.state.update(gov_outputs) # Make keys directly accessible if needed
+        gov_outputs = self.governance_model.simulate_governance_evolution(year, state)
+        self._publish(gov_outputs, ('governance_index', 'pfm_reform_level', 'central_bank_capacity',
+                                    'nbr_modernization_level'))
 
         # 2. Supervision (Influences Financial Sector)
-        sup_eff = self.supervision_model.simulate_supervision_effectiveness(year, self.state)
-        self.state['supervision_state'] = {'supervision_effectiveness': sup_eff}
-        self.state.update(self.state['supervision_state']) # Make key directly accessible
+        sup_eff = self.supervision_model.simulate_supervision_effectiveness(year, state)
+        state.supervision_effectiveness = sup_eff
         
         # 3. Financial Sector (Influences Monetary Policy, Economy)
-        fin_outputs = self.financial_sector_model.simulate_financial_system(year, self.state)
-        self.state['financial_sector_state'] = fin_outputs
-        self.state.update(fin_outputs) # Make NPL, CAR etc. directly accessible
+        fin_outputs = self.financial_sector_model.simulate_financial_system(year, state)
+        self._publish(fin_outputs, ('npl_ratio',)) # NPL, CAR and stability index
 
         # 4. Monetary Policy (Influences Inflation, Coordination)
-        mp_rate, proj_inf = self.monetary_policy_model.simulate_monetary_conditions(year, self.state)
-        self.state['monetary_policy_state'] = {'policy_rate': mp_rate, 'projected_inflation': proj_inf}
-        self.state.update(self.state['monetary_policy_state'])
+        mp_rate, proj_inf = self.monetary_policy_model.simulate_monetary_conditions(year, state)
+        state.policy_rate = mp_rate
+        state.projected_inflation = proj_inf
         
         # 5. External Sector (Influences Reserves, Deficit Financing)
-        ext_outputs = self.external_sector_model.simulate_external_sector(year, self.state)
-        self.state['external_sector_state'] = ext_outputs
-        self.state.update(ext_outputs) # Make reserves, BoP etc. directly accessible
+        ext_outputs = self.external_sector_model.simulate_external_sector(year, state)
+        self._publish(ext_outputs) # Trade flows, reserves, BoP
         
         # 6. Development Finance (Influences Fiscal Space / Financing)
-        dev_fin_outputs = self.dev_finance_model.simulate_development_finance(year, self.state)
-        self.state['dev_finance_state'] = dev_fin_outputs
-        self.state.update(dev_fin_outputs) # Make grants, DFI lending directly accessible
+        dev_fin_outputs = self.dev_finance_model.simulate_development_finance(year, state)
+        self._publish(dev_fin_outputs) # Grants, DFI lending
 
         # 7. Revenue Mobilization
-        rev_outputs = self.revenue_model.project_revenue(year, self.state['economic_state'], self.state['governance_state'])
-        self.state['revenue_state'] = rev_outputs
-        self.state.update(rev_outputs) # Make final_revenue directly accessible
+        rev_outputs = self.revenue_model.project_revenue(year, state)
+        self._publish(rev_outputs, ('final_revenue',))
         final_revenue = rev_outputs['final_revenue']
 
         # 8. Fiscal Federalism (Transfers depend on Central Revenue)
-        ff_outputs = self.fiscal_federalism_model.simulate_fiscal_federalism(year, self.state)
-        self.state['fiscal_federalism_state'] = ff_outputs
-        self.state.update(ff_outputs) # Make transfers etc. accessible
+        ff_outputs = self.fiscal_federalism_model.simulate_fiscal_federalism(year, state)
+        self._publish(ff_outputs) # Transfers, subnational revenue, spending and debt
         transfers_to_subnational = ff_outputs['total_transfers']
         # Note: Central revenue available for central spending is reduced by transfers
         revenue_for_central_gov = final_revenue - transfers_to_subnational
-        self.state['revenue_state']['revenue_for_central_gov'] = revenue_for_central_gov
+        state.revenue_for_central_gov = revenue_for_central_gov
 
         # 9. Expenditure Management (Central Gov Spending)
         # TODO: Refine budget_allocation logic - using revenue as proxy for now
         # TODO: Confirm state keys for capacity, accountability, political economy
         exp_outputs = self.expenditure_model.simulate_expenditure(
             year,
-            budget_allocation=self.state.get('final_revenue', 0), # Proxy
-            implementation_capacity=self.state['governance_state'].get('pfm_effectiveness', 0.5),
-            accountability_mechanisms=self.state['governance_state'].get('accountability_index', 0.5),
-            political_economy=self.state['governance_state'].get('governance_index', 0.5) # Proxy
+            budget_allocation=final_revenue, # Proxy
+            implementation_capacity=gov_outputs.get('pfm_effectiveness', 0.5),
+            accountability_mechanisms=gov_outputs.get('accountability_index', 0.5),
+            political_economy=gov_outputs['governance_index'] # Proxy
         )
-        self.state['expenditure_state'] = exp_outputs # Store the full output dict
-        self.state.update(exp_outputs) # Make keys accessible, e.g., expenditure_efficiency
+        self._publish(exp_outputs) # actual_spending, expenditure_efficiency
         # Calculate total realized spending from the details
         realized_central_spending = sum(exp_outputs.get('actual_spending', {}).values())
 
         # 10. SOE Sector (Fiscal impact depends on performance)
-        soe_dividends, soe_transfers, soe_debt = self.soe_model.simulate_soe_sector(year, self.state)
-        self.state['soe_state'] = {'dividends': soe_dividends, 'transfers_needed': soe_transfers, 'debt': soe_debt}
-        self.state['soe_debt_stock'] = soe_debt # Update main state variable
+        soe_dividends, soe_transfers, soe_debt = self.soe_model.simulate_soe_sector(year, state)
+        state.soe_dividends = soe_dividends
+        state.soe_transfers_needed = soe_transfers
+        state.soe_debt_stock = soe_debt
+        state.soe_performance_index = self.soe_model.performance_index
 
         # --- Calculate Fiscal Aggregates ---
         # Total Revenue = Central Revenue (net of transfers) + SOE Dividends
         total_revenue_inc_soe = revenue_for_central_gov + soe_dividends
         # Total Expenditure = Realized Central Spending + Transfers to SOEs
         total_expenditure_inc_soe = realized_central_spending + soe_transfers
+        state.central_expenditure = realized_central_spending
+        state.total_expenditure = total_expenditure_inc_soe
         
         # Overall Fiscal Deficit (Central Gov Perspective)
         deficit = total_expenditure_inc_soe - total_revenue_inc_soe
-        self.state['deficit'] = deficit
-        deficit_gdp = deficit / self.state['economic_state']['gdp'] if self.state['economic_state']['gdp'] > 0 else 0
-        print(f"Year {year} Fiscal Aggregates: Rev={total_revenue_inc_soe:.1f}, Exp={total_expenditure_inc_soe:.1f}, Deficit={deficit:.1f} ({deficit_gdp:.2%})")
+        state.deficit = deficit
+        if logger.isEnabledFor(logging.DEBUG):
+            deficit_gdp = deficit / state.gdp if state.gdp > 0 else 0
+            logger.debug("Year %d Fiscal Aggregates: Rev=%.1f, Exp=%.1f, Deficit=%.1f (%.2f%%)", year,
+                         total_revenue_inc_soe, total_expenditure_inc_soe, deficit, deficit_gdp * 100)
 
         # 11. Debt Management (Deficit needs financing)
-        updated_debt_stock, dsa_results, debt_service_calculated = self.debt_model.simulate_debt_dynamics(year, self.state, deficit)
-        self.state['debt_stock'] = updated_debt_stock  # Update state with the returned stock
-        self.state['dsa_results'] = dsa_results
-        self.state['debt_service_calculated'] = debt_service_calculated # Store calculated service
+        state.total_revenue = total_revenue_inc_soe
+        updated_debt_stock, dsa_results, debt_service_calculated = self.debt_model.simulate_debt_dynamics(year, state, deficit)
+        state.debt_stock_total = updated_debt_stock['total']
+        state.debt_stock_domestic = updated_debt_stock['domestic']
+        state.debt_stock_external = updated_debt_stock['external']
+        self._publish(dsa_results) # debt_to_gdp, debt_service_to_revenue, breached_threshold
+        self._publish(debt_service_calculated) # Interest, principal and total service
 
         # --- Calculate Primary Deficit ---
-        interest_payments = debt_service_calculated.get('total_interest_paid', 0)
+        interest_payments = debt_service_calculated['total_interest']
         primary_deficit = deficit - interest_payments
-        self.state['primary_deficit'] = primary_deficit
-        primary_deficit_gdp = primary_deficit / self.state['economic_state']['gdp'] if self.state['economic_state']['gdp'] > 0 else 0
-        print(f"Year {year}: Interest={interest_payments:.1f}, Primary Deficit={primary_deficit:.1f} ({primary_deficit_gdp:.2%})")
+        state.primary_deficit = primary_deficit
+        if logger.isEnabledFor(logging.DEBUG):
+            primary_deficit_gdp = primary_deficit / state.gdp if state.gdp > 0 else 0
+            logger.debug("Year %d: Interest=%.1f, Primary Deficit=%.1f (%.2f%%)", year,
+                         interest_payments, primary_deficit, primary_deficit_gdp * 100)
 
         # 12. Policy Coordination (Assess based on outcomes)
-        coord_score = self.policy_coord_model.simulate_coordination(year, self.state)
-        self.state['policy_coordination_state'] = {'coordination_score': coord_score}
+        coord_score = self.policy_coord_model.simulate_coordination(year, state)
+        state.coordination_score = coord_score
 
         # --- Store Results --- 
         self._store_results(year)
-        print(f"===== Year {year} Simulation Complete =====")
+        logger.debug("===== Year %d Simulation Complete =====", year)
 
     def _store_results(self, year):
-        """Store key simulation results for the given year."""
-        # Deep copy relevant parts of the state to avoid overwriting
-        results_for_year = {
+        """Store key simulation results for the given year in its row of self.results.
+
+        The GDP_RATIO_COLUMNS hold the levels here and are divided by GDP for all years at
+        once in _finalize_results.
+        """
+        state = self.state
+        get = self.outputs.get # Bound once; called for nearly every column
+        try:
+            npl_ratio, car_ratio, stability_index = _financial_fields(self.outputs)
+        except KeyError: # Financial sector model has not run
+            npl_ratio = car_ratio = stability_index = _NAN
+        # Values in RESULT_COLUMNS order
+        self.results[year - self.start_year] = (
             # Economic
-            'GDP': self.state['economic_state']['gdp'],
-            'GDP_Growth': self.state['economic_state'].get('gdp_growth', np.nan),
-            'Inflation': self.state['economic_state']['inflation_rate'],
+            state.gdp, # GDP
+            state.gdp_growth, # GDP_Growth
+            state.inflation, # Inflation
             # Fiscal
-            'Total_Revenue': self.state.get('total_revenue', np.nan),
-            'Central_Revenue': self.state.get('central_revenue', np.nan),
-            'Revenue_GDP': self.state.get('total_revenue', np.nan) / self.state['economic_state']['gdp'] if self.state['economic_state']['gdp'] else np.nan,
-            'Total_Expenditure': self.state.get('total_expenditure', np.nan),
-            'Central_Expenditure': self.state.get('central_expenditure', np.nan),
-            'Expenditure_GDP': self.state.get('total_expenditure', np.nan) / self.state['economic_state']['gdp'] if self.state['economic_state']['gdp'] else np.nan,
-            'Overall_Deficit': self.state['deficit'],
-            'Primary_Deficit': self.state.get('primary_deficit', np.nan),
-            'Overall_Deficit_GDP': self.state['deficit'] / self.state['economic_state']['gdp'] if self.state['economic_state']['gdp'] else np.nan,
-            'Primary_Deficit_GDP': self.state['primary_deficit'] / self.state['economic_state']['gdp'] if self.state['economic_state']['gdp'] else np.nan,
+            state.total_revenue, # Total_Revenue
+            state.final_revenue, # Central_Revenue
+            state.total_revenue, # Revenue_GDP
+            state.total_expenditure, # Total_Expenditure
+            state.central_expenditure, # Central_Expenditure
+            state.total_expenditure, # Expenditure_GDP
+            state.deficit, # Overall_Deficit
+            state.primary_deficit, # Primary_Deficit
+            state.deficit, # Overall_Deficit_GDP
+            state.primary_deficit, # Primary_Deficit_GDP
             # Debt
-            'Debt_Stock_Total': self.state.get('debt_stock', {}).get('total', np.nan),
-            'Debt_Stock_Domestic': self.state.get('debt_stock', {}).get('domestic', np.nan),
-            'Debt_Stock_External': self.state.get('debt_stock', {}).get('external', np.nan),
-            'Debt_Stock_GDP': self.state.get('debt_stock', {}).get('total', np.nan) / self.state['economic_state']['gdp'] if self.state['economic_state']['gdp'] else np.nan,
-            'Debt_Service': self.state.get('debt_service_calculated', {}).get('total_service', np.nan),
-            'Interest_Payments': self.state.get('debt_service_calculated', {}).get('total_interest_paid', np.nan),
-            'DSA_Debt_GDP_Ratio': self.state.get('dsa_results', {}).get('debt_to_gdp', np.nan),
-            'DSA_Service_Revenue_Ratio': self.state.get('dsa_results', {}).get('service_to_revenue', np.nan),
+            state.debt_stock_total, # Debt_Stock_Total
+            state.debt_stock_domestic, # Debt_Stock_Domestic
+            state.debt_stock_external, # Debt_Stock_External
+            state.debt_stock_total, # Debt_Stock_GDP
+            get('total_service', _NAN), # Debt_Service
+            get('total_interest', _NAN), # Interest_Payments
+            get('debt_to_gdp', _NAN), # DSA_Debt_GDP_Ratio
+            get('debt_service_to_revenue', _NAN), # DSA_Service_Revenue_Ratio
             # External
-            'Exports': self.state['external_sector_state'].get('exports', np.nan),
-            'Imports': self.state['external_sector_state'].get('imports', np.nan),
-            'Remittances': self.state['external_sector_state'].get('remittances', np.nan),
-            'FDI': self.state['external_sector_state'].get('fdi', np.nan),
-            'CAB_GDP': self.state['external_sector_state'].get('cab_gdp', np.nan),
-            'FX_Reserves_Months': self.state['external_sector_state'].get('reserves_months_imp', np.nan),
+            get('exports', _NAN), # Exports
+            get('imports', _NAN), # Imports
+            get('remittances', _NAN), # Remittances
+            get('fdi', _NAN), # FDI
+            get('current_account_balance', _NAN), # CAB_GDP
+            get('reserves_months_imports', _NAN), # FX_Reserves_Months
             # Governance & Other Indicators
-            'Governance_Index': self.state['governance_index'],
-            'PFM_Score': self.state['governance_state'].get('pfm_level', np.nan),
-            'NBR_Score': self.state['governance_state'].get('nbr_capacity', np.nan),
-            'AC_Score': self.state['governance_state'].get('anti_corruption_effectiveness', np.nan),
-            'Accountability_Score': self.state['governance_state'].get('accountability_level', np.nan),
-            'Financial_Stability_Index': self.state['financial_sector_state'].get('financial_stability_index', np.nan),
-            'NPL_Ratio': self.state['financial_sector_state'].get('npl_ratio', np.nan),
-            'CAR_Ratio': self.state['financial_sector_state'].get('capital_adequacy_ratio', np.nan),
-            'Policy_Rate': self.state.get('policy_rate', np.nan),
-            'Supervision_Effectiveness': self.state.get('supervision_effectiveness', np.nan),
-            'SOE_Performance': self.state.get('soe_state', {}).get('performance_index', np.nan),
-            'SOE_Debt_GDP': self.state.get('soe_state', {}).get('debt', np.nan) / self.state['economic_state']['gdp'] if self.state['economic_state']['gdp'] else np.nan,
-            'Subnational_Own_Revenue': self.state.get('fiscal_federalism_state', {}).get('own_revenue', np.nan),
-            'Subnational_Debt': self.state.get('fiscal_federalism_state', {}).get('aggregate_debt', np.nan),
-            'Grant_Receipts': self.state.get('development_finance_state', {}).get('grants', np.nan),
-            'DFI_Lending': self.state.get('development_finance_state', {}).get('dfi_net_lending', np.nan),
-            'Expenditure_Efficiency': self.state.get('expenditure_outputs', {}).get('expenditure_efficiency', np.nan),
-            'Policy_Coordination_Score': self.state.get('policy_coordination_score', np.nan),
-        }
-        self.results[year] = results_for_year
+            state.governance_index, # Governance_Index
+            get('pfm_reform_level', _NAN), # PFM_Score
+            get('nbr_modernization_level', _NAN), # NBR_Score
+            get('anti_corruption_effectiveness', _NAN), # AC_Score
+            get('accountability_score', _NAN), # Accountability_Score
+            stability_index, # Financial_Stability_Index
+            npl_ratio, # NPL_Ratio
+            car_ratio, # CAR_Ratio
+            state.policy_rate, # Policy_Rate
+            state.supervision_effectiveness, # Supervision_Effectiveness
+            state.soe_performance_index, # SOE_Performance
+            state.soe_debt_stock, # SOE_Debt_GDP
+            get('total_subnational_own_revenue', _NAN), # Subnational_Own_Revenue
+            get('aggregate_subnational_debt', _NAN), # Subnational_Debt
+            get('grant_aid', _NAN), # Grant_Receipts
+            get('dfi_net_lending', _NAN), # DFI_Lending
+            get('expenditure_efficiency', _NAN), # Expenditure_Efficiency
+            state.coordination_score, # Policy_Coordination_Score
+        )
 
-    def run_simulation(self):
-        """Run the simulation over the entire period."""
-        print(f"\nStarting Simulation from {self.start_year} to {self.end_year}...")
+    def _finalize_results(self):
+        """Turn the levels stored in the GDP_RATIO_COLUMNS into shares of GDP, for all years in one pass.
+
+        Years with zero GDP get NaN.
+        """
+        gdp = self.results[:, _GDP_COLUMN:_GDP_COLUMN + 1]
+        levels = self.results[:, _GDP_RATIO_INDEX]
+        ratios = np.divide(levels, gdp, out=np.full_like(levels, np.nan), where=gdp != 0)
+        self.results[:, _GDP_RATIO_INDEX] = ratios
+
+    def _cache_key(self):
+        """Inputs a whole run depends on (see models._cache), None if it is not reproducible."""
+        if self.config['simulation'].get('seed') is None:
+            return None # Unseeded runs draw different shocks every time
+        return self.config
+
+    @disk_memoize('simulation')
+    def _run_years(self):
+        """Run every year and return the filled results table.
+
+        With SIM_CACHE_DIR set, a seeded run whose configuration was already simulated by
+        the same model code returns the stored table without running the models, which are
+        then left in their initial state.
+        """
         for year in self.years:
             self.run_single_year(year)
-        print("\nSimulation Run Complete.")
-        # Convert results to DataFrame
-        df = pd.DataFrame.from_dict(self.results, orient='index')
+        self._finalize_results()
+        return {'results': self.results}
+
+    def run_simulation(self):
+        """Run the simulation over the entire period."""
+        logger.info("Starting Simulation from %d to %d...", self.start_year, self.end_year)
+        self.results = self._run_years()['results']
+        logger.info("Simulation Run Complete.")
+        df = self.results_frame()
         # Optionally reorder columns
         # desired_order = [...] 
         # df = df[desired_order]
-        print("Simulation Results:")
-        print(df.head().to_string()) # Print head to avoid excessive output
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Simulation Results:\n%s", df.head().to_string()) # Head only, to avoid excessive output
         return df
 
-    def save_results(self, output_path='../results/simulation_results.csv'):
-        """Save the results DataFrame to a CSV file."""
-        # Create results directory if it doesn't exist
-        output_dir = os.path.dirname(output_path)
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-            print(f"Created results directory: {output_dir}")
-            
-        self.results.to_csv(output_path)
-        print(f"Results saved to {output_path}")
+    def results_frame(self):
+        """Return the results table as a DataFrame indexed by year, sharing self.results' memory."""
+        return pd.DataFrame(self.results, index=pd.Index(self.years), columns=RESULT_COLUMNS, copy=False)
+
+    def run_monte_carlo(self, n_reps, seed=None, max_workers=None):
+        """Run `n_reps` independent replications of the whole simulation in parallel processes.
+
+        Each replication uses this simulation's configuration with its own seed, spawned
+        from `seed`, so the set of replications is reproducible when `seed` is given. This
+        simulation object itself is not run.
+
+        Args:
+            n_reps: Number of replications.
+            seed: Seed from which the replication seeds are derived.
+            max_workers: Number of worker processes (defaults to the number of CPUs).
+
+        Returns:
+            Array of shape (n_reps, n_years, len(RESULT_COLUMNS)).
+        """
+        rep_seeds = np.random.SeedSequence(seed).generate_state(n_reps).tolist()
+        logger.info("Running %d Monte Carlo replications...", n_reps)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            runs = list(pool.map(_simulate_replication, itertools.repeat(self.config), rep_seeds))
+        return np.stack(runs)
+
+    def save_results(self, output_path='../results/simulation_results', csv=False):
+        """Save the results table as Parquet or CSV.
+
+        The format follows an explicit .parquet or .csv suffix of `output_path`. Without a
+        suffix it is Parquet when pyarrow is installed and CSV otherwise (or CSV when `csv`
+        is set), and the matching suffix is appended.
+
+        Args:
+            output_path: Target file. Missing directories are created.
+            csv: Write CSV when `output_path` has no suffix, even if Parquet is available.
+
+        Returns:
+            Path of the written file.
+
+        Raises:
+            ValueError: The suffix is neither .parquet nor .csv, or it is .parquet with `csv` set.
+            ImportError: Parquet was requested but pyarrow is not installed.
+        """
+        output_path = Path(output_path)
+        suffix = output_path.suffix.lower()
+        if not suffix:
+            suffix = '.parquet' if HAS_PYARROW and not csv else '.csv'
+            output_path = output_path.with_name(output_path.name + suffix)
+        elif suffix not in ('.parquet', '.csv'):
+            raise ValueError(f"Cannot save results as {suffix!r}; use .parquet or .csv")
+        elif suffix == '.parquet' and csv:
+            raise ValueError(f"csv=True conflicts with the .parquet output path {output_path}")
+        if suffix == '.parquet' and not HAS_PYARROW:
+            raise ImportError("Saving results as Parquet requires pyarrow")
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        df = self.results_frame()
+        if suffix == '.parquet':
+            df.to_parquet(output_path, engine='pyarrow', compression='snappy')
+        else:
+            df.to_csv(output_path)
+        logger.info("Results saved to %s", output_path)
+        return output_path
+
+def _simulate_replication(config, seed):
+    """Run one full simulation of `config` with the given seed and return its results array."""
+    config = {**config, 'simulation': {**config['simulation'], 'seed': seed}}
+    simulation = BangladeshPublicFinanceSimulation(config)
+    simulation.run_simulation()
+    return simulation.results
 
 def main():
     config_path = os.path.join('config', 'config.yaml')
@@ -339,32 +514,34 @@ def main():
     plots_dir = results_dir / 'plots'
     template_dir = project_root / 'templates'
     report_output_path = results_dir / 'simulation_report.html'
-    results_output_path = results_dir / 'simulation_output.csv'
+    results_output_path = results_dir / 'simulation_output' # .parquet, or .csv without pyarrow
 
     # Ensure results directory exists
     results_dir.mkdir(parents=True, exist_ok=True)
 
+    # Per-year simulation and model diagnostics are logged at DEBUG level; set SIM_VERBOSE=1 to show them
+    package_logger = logging.getLogger(__package__)
+    package_logger.setLevel(logging.DEBUG if os.environ.get('SIM_VERBOSE') else logging.INFO)
+
     simulation = BangladeshPublicFinanceSimulation(config_path)
     results_df = simulation.run_simulation()
 
     if results_df is not None and not results_df.empty:
         # Save raw results
-        results_df.to_csv(results_output_path)
-        print(f"\nSimulation results saved to: {results_output_path}")
+        simulation.save_results(results_output_path)
 
         # Print summary of the final year
-        print("\nSimulation Results Summary (Final Year):")
-        print(results_df.iloc[-1].to_string())
+        logger.info("Simulation Results Summary (Final Year):\n%s", results_df.iloc[-1].to_string())
 
         # Generate Visualizations
-        print("\nGenerating visualizations...")
+        logger.info("Generating visualizations...")
         try:
             plot_files = generate_plots(results_df, plots_dir)
             plot_titles = {var: details['title'] for var, details in KEY_VARIABLES.items()}
-            print(f"Visualizations saved in: {plots_dir}")
+            logger.info("Visualizations saved in: %s", plots_dir)
 
             # Generate HTML Report
-            print("\nGenerating HTML report...")
+            logger.info("Generating HTML report...")
             generate_html_report(
                 results_df=results_df,
                 plot_files=plot_files,
@@ -373,13 +550,13 @@ def main():
                 template_name='report_template.html',
                 output_path=report_output_path
             )
-            print(f"HTML report saved to: {report_output_path}")
+            logger.info("HTML report saved to: %s", report_output_path)
 
         except Exception as e:
-            logging.error(f"Failed during post-processing (visualization/reporting): {e}")
+            logger.error("Failed during post-processing (visualization/reporting): %s", e)
 
     else:
-        print("Simulation did not produce results. Skipping post-processing.")
+        logger.warning("Simulation did not produce results. Skipping post-processing.")
 
 if __name__ == "__main__":
     # Add src to path to allow running as a module
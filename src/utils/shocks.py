@@ -0,0 +1,43 @@
+import numpy as np
+
+class ShockSchedule:
+    """Random shocks for every simulated year, drawn once at the start of a run.
+
+    Models look their shock up by year instead of calling the RNG each year, and a
+    single seed makes a whole run reproducible.
+    """
+    # Shock name -> (low, high) bounds of its uniform draw
+    UNIFORM_SHOCKS = {
+        'global_factor': (0.98, 1.05), # External sector: fluctuating global conditions
+        'global_aid_factor': (0.90, 1.10), # Development finance: fluctuating donor budgets
+    }
+    # Shock name -> (mean, standard deviation) of its normal draw
+    NORMAL_SHOCKS = {
+        'gdp_growth_noise': (0.0, 0.05), # Driver: relative noise on base real GDP growth
+    }
+
+    def __init__(self, start_year, end_year, seed=None):
+        """Draw all shocks for the years start_year..end_year (inclusive)."""
+        self.start_year = start_year
+        self.n_years = end_year - start_year + 1
+        rng = np.random.default_rng(seed)
+        self.shocks = {name: rng.uniform(low, high, self.n_years)
+                       for name, (low, high) in self.UNIFORM_SHOCKS.items()}
+        self.shocks.update({name: rng.normal(mean, std, self.n_years)
+                            for name, (mean, std) in self.NORMAL_SHOCKS.items()})
+
+    @classmethod
+    def draw_batch(cls, n_sims, n_years, seed=None):
+        """Draw the sector shocks (UNIFORM_SHOCKS) for a batch of independent runs.
+
+        Returns:
+            Array of shape (n_sims, n_years, n_shocks); the last axis follows the
+            order of UNIFORM_SHOCKS.
+        """
+        rng = np.random.default_rng(seed)
+        bounds = np.array(list(cls.UNIFORM_SHOCKS.values()))
+        return rng.uniform(bounds[:, 0], bounds[:, 1], size=(n_sims, n_years, len(bounds)))
+
+    def get(self, name, year):
+        """Return the pre-drawn value of shock `name` for `year`."""
+        return self.shocks[name][year - self.start_year]
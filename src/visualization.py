@@ -1,7 +1,12 @@
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg') # Plots are only written to files; no GUI backend needed
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import os
 import numpy as np
 import logging
 
@@ -25,105 +30,145 @@ KEY_VARIABLES = {
     'FX_Reserves_Months': {'title': 'FX Reserves', 'ylabel': 'Months of Imports'},
 }
 
-def generate_plots(results_df: pd.DataFrame, output_dir: Path):
+FLAT_SERIES_TOLERANCE = 1e-12 # Single-variable series spanning less than this are not plotted
+
+def _plottable(results_df: pd.DataFrame, var: str) -> bool:
+    """Whether results column `var` has numeric data and is not all NaN."""
+    return pd.api.types.is_numeric_dtype(results_df[var]) and not results_df[var].isnull().all()
+
+def _is_flat(values: np.ndarray) -> bool:
+    """Whether a series is constant (ignoring NaN), so its chart would be a bare horizontal line."""
+    return np.nanmax(values) - np.nanmin(values) < FLAT_SERIES_TOLERANCE
+
+@functools.lru_cache(maxsize=None)
+def _shared_axes():
+    """One figure per worker process, reused for every plot drawn there."""
+    return plt.subplots(figsize=(10, 6))
+
+def _render_plot(spec: dict, years: np.ndarray, output_dir: Path):
+    """Worker entry point: draw the plot described by `spec` on the worker's shared figure."""
+    _draw_plot(*_shared_axes(), spec, years, output_dir)
+
+def _draw_plot(fig, ax, spec: dict, years: np.ndarray, output_dir: Path):
+    """Draw one plot described by `spec` (see generate_plots) on `ax` and save it under `output_dir`."""
+    ax.clear()
+    for values, label in spec['lines']:
+        ax.plot(years, values, label=label)
+
+    ax.set_title(spec['title'])
+    ax.set_xlabel("Year")
+    ax.set_ylabel(spec['ylabel'])
+
+    # Format Y-axis
+    if spec['percent']:
+        ax.yaxis.set_major_formatter(mticker.PercentFormatter())
+    else:
+        # Use ScalarFormatter with simplified scientific notation if numbers are large
+        ax.yaxis.set_major_formatter(mticker.ScalarFormatter(useMathText=True))
+        ax.ticklabel_format(style='sci', axis='y', scilimits=(0,0))
+    if spec['legend']:
+        ax.legend()
+
+    ax.grid(True, linestyle='--', alpha=0.6)
+    fig.tight_layout()
+    fig.savefig(output_dir / spec['filename'])
+
+def generate_plots(results_df: pd.DataFrame, output_dir: Path, max_workers=None):
     """Generates and saves plots for key simulation variables.
 
+    The plots are independent, so they are rendered in parallel worker processes; each
+    worker reuses one figure for all the plots it draws.
+
     Args:
         results_df: DataFrame containing the simulation results, indexed by year.
         output_dir: Path object for the directory to save plots.
+        max_workers: Number of worker processes (defaults to the number of CPUs);
+            1 renders all plots in the calling process.
 
     Returns:
         A dictionary mapping variable names to their relative plot file paths.
     """
-    plot_files = {}
     output_dir.mkdir(parents=True, exist_ok=True)
-    logging.info(f"Saving plots to: {output_dir}")
+    logging.info("Saving plots to: %s", output_dir)
 
+    # Decide what to draw up front; only the plain arrays are sent to the workers
+    specs = []
     combined_plots_done = set()
-
     for var, details in KEY_VARIABLES.items():
         if var not in results_df.columns:
-            logging.warning(f"Variable '{var}' not found in results. Skipping plot.")
+            logging.warning("Variable '%s' not found in results. Skipping plot.", var)
+            continue
+        if not _plottable(results_df, var):
+            logging.warning("Skipping plot for '%s' due to non-numeric data or all NaN values.", var)
             continue
 
-        # Check if column has numeric data and is not all NaN
-        if pd.api.types.is_numeric_dtype(results_df[var]) and not results_df[var].isnull().all():
-            # Handle combined plots
-            combined_plot_id = details.get('combined_plot')
-            if combined_plot_id and combined_plot_id in combined_plots_done:
+        # Handle combined plots
+        combined_plot_id = details.get('combined_plot')
+        if combined_plot_id:
+            if combined_plot_id in combined_plots_done:
                 continue # Already plotted as part of a combined chart
-            if combined_plot_id and combined_plot_id not in combined_plots_done:
-                plt.figure(figsize=(10, 6))
-                ax = plt.gca()
-                plot_filename = f"{combined_plot_id}.png"
-                plot_title = f"Debt Stock Comparison"
-                ylabel = ''
-
-                vars_in_combo = [v for v, d in KEY_VARIABLES.items() if d.get('combined_plot') == combined_plot_id]
-                for combo_var in vars_in_combo:
-                    if combo_var in results_df.columns and pd.api.types.is_numeric_dtype(results_df[combo_var]) and not results_df[combo_var].isnull().all():
-                        data_to_plot = results_df[combo_var]
-                        multiplier = KEY_VARIABLES[combo_var].get('multiplier', 1)
-                        label = KEY_VARIABLES[combo_var].get('title', combo_var)
-                        plt.plot(results_df.index, data_to_plot * multiplier, label=label)
-                        # Use the ylabel from the first variable in the combo
-                        if not ylabel:
-                            ylabel = KEY_VARIABLES[combo_var].get('ylabel', 'Value')
-                plt.title(plot_title)
-                plt.xlabel("Year")
-                plt.ylabel(ylabel)
-                ax.yaxis.set_major_formatter(mticker.ScalarFormatter(useMathText=True))
-                ax.ticklabel_format(style='sci', axis='y', scilimits=(0,0))
-                plt.legend()
-                plt.grid(True, linestyle='--', alpha=0.6)
-                plt.tight_layout()
-
-                plot_path = output_dir / plot_filename
-                plt.savefig(plot_path)
-                plt.close()
-
-                plot_files[combined_plot_id] = f"plots/{plot_filename}"
-                logging.info(f"Generated combined plot: {plot_filename}")
-                combined_plots_done.add(combined_plot_id)
-                continue # Move to next variable after handling combined plot
-
-            # --- Regular plotting logic for non-combined variables ---
-            try:
-                plt.figure(figsize=(10, 6))
-                data_to_plot = results_df[var]
-                multiplier = details.get('multiplier', 1)
-
-                plt.plot(results_df.index, data_to_plot * multiplier)
-
-                plt.title(details['title'])
-                plt.xlabel("Year")
-                plt.ylabel(details['ylabel'])
-
-                # Format Y-axis
-                ax = plt.gca()
-                if details.get('format') == '%':
-                    ax.yaxis.set_major_formatter(mticker.PercentFormatter())
-                else:
-                    # Use ScalarFormatter with simplified scientific notation if numbers are large
-                    ax.yaxis.set_major_formatter(mticker.ScalarFormatter(useMathText=True))
-                    ax.ticklabel_format(style='sci', axis='y', scilimits=(0,0))
-
-                plt.grid(True, linestyle='--', alpha=0.6)
-                plt.tight_layout()
-
-                # Use Path object for saving
-                plot_filename = f"{var}.png"
-                plot_path = output_dir / plot_filename
-                plt.savefig(plot_path)
-                plt.close() # Close the figure to free memory
-
-                # Store relative path for HTML report
-                plot_files[var] = f"plots/{plot_filename}" # Relative path from where HTML will be
-                logging.info(f"Generated plot: {plot_filename}")
-
-            except Exception as e:
-                logging.error(f"Failed to generate plot for '{var}': {e}")
+            combined_plots_done.add(combined_plot_id)
+            combo_vars = [v for v, d in KEY_VARIABLES.items()
+                          if d.get('combined_plot') == combined_plot_id
+                          and v in results_df.columns and _plottable(results_df, v)]
+            specs.append({
+                'plot_id': combined_plot_id,
+                'filename': f"{combined_plot_id}.png",
+                'title': "Debt Stock Comparison",
+                # Use the ylabel from the first variable in the combo
+                'ylabel': KEY_VARIABLES[combo_vars[0]].get('ylabel', 'Value'),
+                'lines': [(results_df[v].to_numpy() * KEY_VARIABLES[v].get('multiplier', 1),
+                           KEY_VARIABLES[v].get('title', v)) for v in combo_vars],
+                'percent': False,
+                'legend': True,
+                'combined': True,
+            })
         else:
-            logging.warning(f"Skipping plot for '{var}' due to non-numeric data or all NaN values.")
+            values = results_df[var].to_numpy()
+            if _is_flat(values):
+                logging.info("Skipping plot for '%s': the series is constant.", var)
+                # Drop a chart left by an earlier run so the report does not pick it up
+                (output_dir / f"{var}.png").unlink(missing_ok=True)
+                continue
+            specs.append({
+                'plot_id': var,
+                'filename': f"{var}.png",
+                'title': details['title'],
+                'ylabel': details['ylabel'],
+                'lines': [(values * details.get('multiplier', 1), None)],
+                'percent': details.get('format') == '%',
+                'legend': False,
+                'combined': False,
+            })
+
+    years = results_df.index.to_numpy()
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1 or len(specs) <= 1:
+        # In the calling process: one figure for all the plots, closed again afterwards
+        outcomes = []
+        fig, ax = plt.subplots(figsize=(10, 6))
+        try:
+            for spec in specs:
+                try:
+                    _draw_plot(fig, ax, spec, years, output_dir)
+                    outcomes.append(None)
+                except Exception as e:
+                    outcomes.append(e)
+        finally:
+            plt.close(fig)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_render_plot, spec, years, output_dir) for spec in specs]
+            outcomes = [future.exception() for future in futures]
+
+    plot_files = {}
+    for spec, error in zip(specs, outcomes):
+        if error is not None:
+            logging.error("Failed to generate plot for '%s': %s", spec['plot_id'], error)
+            continue
+        # Store relative path for HTML report
+        plot_files[spec['plot_id']] = f"plots/{spec['filename']}" # Relative path from where HTML will be
+        logging.info("Generated %splot: %s", 'combined ' if spec['combined'] else '', spec['filename'])
 
     return plot_files
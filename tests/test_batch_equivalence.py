@@ -0,0 +1,251 @@
+"""Checks that the vectorised batch paths reproduce the per-year model loops."""
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from src.models._kernels import MC_OUTPUTS
+from src.models.debt import DebtManagementModel
+from src.models.development_finance import DevelopmentFinanceModel
+from src.models.external_sector import ExternalSectorModel
+from src.models.financial_sector import FinancialSectorModel
+from src.models.fiscal_federalism import FiscalFederalismModel
+from src.models.governance import GovernanceModel
+from src.models.monetary_policy import MonetaryPolicyModel
+from src.models.monte_carlo import simulate_monte_carlo
+from src.models.policy_coordination import PolicyCoordinationModel
+from src.models.policy_pipeline import simulate_policy_path
+from src.models.revenue import RevenueModel
+from src.models.soe import SOEModel
+from src.models.state import SimState
+from src.models.supervision import SupervisionModel
+from src.utils.shocks import ShockSchedule
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config' / 'config.yaml'
+DEBT_CONFIG = {'initial_debt_stock': {'domestic': 100.0, 'external': 50.0}}
+N_YEARS = 12
+
+
+def _nominal_growth(gdp_growth, inflation):
+    return (1 + gdp_growth) * (1 + inflation) - 1
+
+
+class BatchEquivalenceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(CONFIG_PATH) as f:
+            cls.config = yaml.safe_load(f)
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.gdp_growth = rng.uniform(0.02, 0.10, N_YEARS)
+        self.inflation = rng.uniform(0.03, 0.10, N_YEARS)
+        self.gdp = 4e7 * np.cumprod(1 + self.gdp_growth)
+        self.nbr_level = rng.uniform(0.3, 0.9, N_YEARS)
+        self.deficit = self.gdp * rng.uniform(0.02, 0.08, N_YEARS)
+        self.rng = rng
+
+    def test_project_revenue_batch(self):
+        cfg = self.config['revenue_model']
+        imports = self.gdp * 0.2
+        batch = RevenueModel(cfg).project_revenue_batch(
+            self.gdp, imports, self.gdp_growth, self.nbr_level)
+        model = RevenueModel(cfg)
+        for t in range(N_YEARS):
+            state = SimState(gdp=self.gdp[t], gdp_growth=self.gdp_growth[t],
+                             nbr_modernization_level=self.nbr_level[t])
+            revenue = model.project_revenue(t, state)
+            self.assertEqual(batch['final_revenue'][t], revenue['final_revenue'])
+            self.assertEqual(batch['admin_efficiency'][t], model.current_admin_efficiency)
+            self.assertEqual(batch['compliance_rate'][t], model.current_compliance_rate)
+
+    def test_simulate_fiscal_federalism_batch(self):
+        cfg = self.config['fiscal_federalism']
+        central_revenue = self.gdp * 0.09
+        batch = FiscalFederalismModel(cfg).simulate_fiscal_federalism_batch(
+            self.gdp, self.gdp_growth, self.inflation, central_revenue)
+        model = FiscalFederalismModel(cfg)
+        for t in range(N_YEARS):
+            state = SimState(
+                gdp=self.gdp[t], gdp_growth=self.gdp_growth[t], inflation=self.inflation[t],
+                nominal_gdp_growth=_nominal_growth(self.gdp_growth[t], self.inflation[t]),
+                final_revenue=central_revenue[t])
+            outputs = model.simulate_fiscal_federalism(t, state)
+            for key, value in outputs.items():
+                self.assertEqual(batch[key][t], value, key)
+            self.assertEqual(batch['subnational_revenue_capacity_index'][t],
+                             model.subnational_revenue_capacity_index)
+
+    def test_simulate_monetary_conditions_batch(self):
+        cfg = self.config['monetary_policy']
+        policy_rate, projected = MonetaryPolicyModel(cfg).simulate_monetary_conditions_batch(
+            self.inflation)
+        model = MonetaryPolicyModel(cfg)
+        for t in range(N_YEARS):
+            rate, proj = model.simulate_monetary_conditions(t, SimState(inflation=self.inflation[t]))
+            self.assertEqual(policy_rate[t], rate)
+            self.assertEqual(projected[t], proj)
+
+    def test_simulate_soe_sector_batch(self):
+        cfg = self.config['soe_model']
+        governance = self.rng.uniform(20, 90, N_YEARS)
+        batch = SOEModel(cfg).simulate_soe_sector_batch(self.gdp_growth, governance, self.gdp)
+        model = SOEModel(cfg)
+        for t in range(N_YEARS):
+            state = SimState(gdp=self.gdp[t], gdp_growth=self.gdp_growth[t],
+                             governance_index=governance[t])
+            dividends, transfers, debt = model.simulate_soe_sector(t, state)
+            expected = (model.performance_index, dividends, transfers, debt)
+            actual = (batch['performance_index'][t], batch['dividends'][t],
+                      batch['transfers'][t], batch['soe_debt_stock'][t])
+            np.testing.assert_allclose(actual, expected, rtol=1e-13, atol=0)
+
+    def test_simulate_supervision_effectiveness_batch(self):
+        cfg = self.config['supervision_model']
+        capacity = self.rng.uniform(0.3, 0.9, N_YEARS)
+        npl = self.rng.uniform(0.02, 0.3, N_YEARS)
+        batch = SupervisionModel(cfg).simulate_supervision_effectiveness_batch(capacity, npl)
+        model = SupervisionModel(cfg)
+        expected = [
+            model.simulate_supervision_effectiveness(
+                t, SimState(central_bank_capacity=capacity[t], npl_ratio=npl[t]))
+            for t in range(N_YEARS)
+        ]
+        np.testing.assert_array_equal(batch['supervision_effectiveness'], expected)
+
+    def test_simulate_debt_dynamics_batch(self):
+        revenue = self.gdp * 0.09
+        batch = DebtManagementModel(DEBT_CONFIG).simulate_debt_dynamics_batch(
+            self.deficit, self.gdp, revenue)
+        model = DebtManagementModel(DEBT_CONFIG)
+        for t in range(N_YEARS):
+            state = SimState(gdp=self.gdp[t], total_revenue=revenue[t])
+            stock, dsa, service = model.simulate_debt_dynamics(t, state, self.deficit[t])
+            np.testing.assert_allclose(batch['stock'][t + 1],
+                                       [stock['domestic'], stock['external']], rtol=1e-12)
+            np.testing.assert_allclose(batch['total_service'][t], service['total_service'],
+                                       rtol=1e-12)
+            np.testing.assert_allclose(batch['debt_to_gdp'][t], dsa['debt_to_gdp'], rtol=1e-12)
+            np.testing.assert_allclose(batch['debt_service_to_revenue'][t],
+                                       dsa['debt_service_to_revenue'], rtol=1e-12)
+            self.assertEqual(batch['breached_threshold'][t], dsa['breached_threshold'])
+
+    def test_two_dimensional_batches_match_single_scenarios(self):
+        cfg = self.config['revenue_model']
+        scale = self.rng.uniform(0.9, 1.1, (4, 1))
+        gdp = self.gdp * scale
+        growth = np.tile(self.gdp_growth, (4, 1))
+        nbr = np.tile(self.nbr_level, (4, 1))
+        batch = RevenueModel(cfg).project_revenue_batch(gdp, gdp * 0.2, growth, nbr)
+        for s in range(4):
+            single = RevenueModel(cfg).project_revenue_batch(
+                gdp[s], gdp[s] * 0.2, growth[s], nbr[s])
+            for key, values in single.items():
+                np.testing.assert_array_equal(batch[key][s], values, key)
+
+    def test_float32_batches_track_float64(self):
+        gdp = np.tile(self.gdp, (50, 1)) * self.rng.uniform(0.9, 1.1, (50, 1))
+        growth = np.tile(self.gdp_growth, (50, 1))
+        inflation = np.tile(self.inflation, (50, 1))
+        nbr = np.tile(self.nbr_level, (50, 1))
+
+        revenue = RevenueModel(self.config['revenue_model'])
+        rev64 = revenue.project_revenue_batch(gdp, gdp * 0.2, growth, nbr)
+        rev32 = revenue.project_revenue_batch(gdp, gdp * 0.2, growth, nbr, dtype=np.float32)
+        for key in rev64:
+            self.assertEqual(rev32[key].dtype, np.float32, key)
+            np.testing.assert_allclose(rev32[key], rev64[key], rtol=1e-5, err_msg=key)
+
+        ff = FiscalFederalismModel(self.config['fiscal_federalism'])
+        central_revenue = rev64['final_revenue']
+        ff64 = ff.simulate_fiscal_federalism_batch(gdp, growth, inflation, central_revenue)
+        ff32 = ff.simulate_fiscal_federalism_batch(gdp, growth, inflation, central_revenue,
+                                                   dtype=np.float32)
+        for key in ff64:
+            self.assertEqual(ff32[key].dtype, np.float32, key)
+            np.testing.assert_allclose(ff32[key], ff64[key], rtol=1e-5, atol=1e-5,
+                                       err_msg=key)
+
+    def test_simulate_policy_path(self):
+        def build():
+            return (GovernanceModel(self.config['governance_model']),
+                    MonetaryPolicyModel(self.config['monetary_policy']),
+                    RevenueModel(self.config['revenue_model']),
+                    FiscalFederalismModel(self.config['fiscal_federalism']),
+                    PolicyCoordinationModel(self.config['policy_coordination']))
+
+        paths = {'gdp': self.gdp, 'gdp_growth': self.gdp_growth,
+                 'inflation': self.inflation, 'deficit': self.deficit}
+        out = simulate_policy_path(*build(), paths)
+
+        governance, monetary, revenue, federalism, coordination = build()
+        for t in range(N_YEARS):
+            state = SimState(
+                gdp=self.gdp[t], gdp_growth=self.gdp_growth[t], inflation=self.inflation[t],
+                nominal_gdp_growth=_nominal_growth(self.gdp_growth[t], self.inflation[t]),
+                deficit=self.deficit[t])
+            gov = governance.simulate_governance_evolution(t, state)
+            state.governance_index = gov['governance_index']
+            state.nbr_modernization_level = gov['nbr_modernization_level']
+            rate, projected = monetary.simulate_monetary_conditions(t, state)
+            state.final_revenue = revenue.project_revenue(t, state)['final_revenue']
+            ff = federalism.simulate_fiscal_federalism(t, state)
+            coord = coordination.simulate_coordination(t, state)
+            expected = [gov['governance_index'], rate, projected, state.final_revenue,
+                        ff['total_transfers'], ff['total_subnational_own_revenue'],
+                        ff['total_subnational_spending'], ff['aggregate_subnational_debt'],
+                        coord]
+            np.testing.assert_array_equal(out[t], expected)
+
+    def test_simulate_monte_carlo(self):
+        def build(shocks=None):
+            return (ExternalSectorModel(self.config['external_sector'], shocks=shocks),
+                    FinancialSectorModel(self.config['financial_sector']),
+                    DevelopmentFinanceModel(self.config['development_finance'], shocks=shocks),
+                    DebtManagementModel(DEBT_CONFIG))
+
+        rng = self.rng
+        paths = {
+            'gdp': 1000 * np.cumprod(1 + rng.uniform(0.05, 0.1, N_YEARS)),
+            'gdp_growth': rng.uniform(0.0, 0.12, N_YEARS),
+            'governance_index': rng.uniform(40, 70, N_YEARS),
+            'pfm_reform_level': rng.uniform(0.3, 0.7, N_YEARS),
+            'supervision_effectiveness': rng.uniform(0.4, 0.8, N_YEARS),
+            'deficit': rng.uniform(-5, 30, N_YEARS),
+        }
+        draws = ShockSchedule.draw_batch(3, N_YEARS, 5)
+        out = simulate_monte_carlo(*build(), paths, 3, shocks=draws)
+
+        run = 1
+        schedule = ShockSchedule(0, N_YEARS - 1)
+        schedule.shocks = {'global_factor': draws[run, :, 0],
+                           'global_aid_factor': draws[run, :, 1]}
+        external, financial, dev_finance, debt = build(schedule)
+        for t in range(N_YEARS):
+            state = SimState(
+                gdp=paths['gdp'][t], gdp_growth=paths['gdp_growth'][t],
+                governance_index=paths['governance_index'][t],
+                pfm_reform_level=paths['pfm_reform_level'][t],
+                supervision_effectiveness=paths['supervision_effectiveness'][t],
+                total_revenue=100.0)
+            expected = {
+                **external.simulate_external_sector(t, state),
+                **financial.simulate_financial_system(t, state),
+                **dev_finance.simulate_development_finance(t, state),
+            }
+            stock, _, service = debt.simulate_debt_dynamics(t, state, paths['deficit'][t])
+            expected.update({
+                'debt_domestic': stock['domestic'],
+                'debt_external': stock['external'],
+                'debt_total_service': service['total_service'],
+            })
+            for k, name in enumerate(MC_OUTPUTS):
+                np.testing.assert_allclose(out[run, t, k], expected[name], rtol=1e-9,
+                                           err_msg=name)
+
+
+if __name__ == '__main__':
+    unittest.main()